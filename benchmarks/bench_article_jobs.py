@@ -0,0 +1,101 @@
+"""
+下载任务构造基准测试
+
+对比逐行 iterrows 构造任务与 article_job_frame 按列构造任务的耗时。
+
+用法:
+    python benchmarks/bench_article_jobs.py            # 10 万行
+    python benchmarks/bench_article_jobs.py 1000000    # 指定行数
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from wxmp.tools.article_downloader import ArticleMetadata
+from wxmp.tools.article_pipeline import ArticleJob, article_job_frame, iter_article_jobs
+from wxmp.tools.file import sanitize_filename
+
+EXCLUDE_TITLES = ["广告", "[推广]", "招聘", "抽奖"]
+
+
+def synthetic_articles(rows: int) -> pd.DataFrame:
+    """生成 rows 篇文章，分布在 200 个公众号中，约 4% 的标题命中排除词"""
+    rng = np.random.default_rng(0)
+    idx = np.arange(rows)
+    titles = pd.Series(idx).map(lambda i: f"第{i}期：行业观察/深度解读 | 2026?")
+    titles[idx % 25 == 0] = "[推广] 限时活动"
+    return pd.DataFrame(
+        {
+            "title": titles,
+            "link": [f"https://mp.weixin.qq.com/s/{i:08x}" for i in idx],
+            "nickname": [f"公众号{n}" for n in rng.integers(0, 200, rows)],
+            "create_time": pd.to_datetime(
+                1_700_000_000 + rng.integers(0, 10**8, rows), unit="s"
+            ),
+            "digest": "文章摘要",
+        }
+    )
+
+
+def iterrows_jobs(df: pd.DataFrame, save_dir: Path) -> list[ArticleJob]:
+    """逐行构造任务（原实现）"""
+    jobs = []
+    for _, row in df.iterrows():
+        safe_nickname = sanitize_filename(row["nickname"])
+        if any(title in row["title"] for title in EXCLUDE_TITLES):
+            continue
+        safe_title = sanitize_filename(row["title"])
+        metadata = ArticleMetadata(
+            title=row["title"],
+            date_str=row.get("create_time", ""),
+            link=row["link"],
+            account_name=row.get("nickname", ""),
+            digest=row.get("digest", ""),
+        )
+        jobs.append(
+            ArticleJob(
+                url=row["link"],
+                save_path=save_dir / safe_nickname / f"{safe_title}.md",
+                metadata=metadata,
+            )
+        )
+    return jobs
+
+
+def bench(func, rounds: int = 3) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    df = synthetic_articles(rows)
+    save_dir = Path("temp/article_content")
+
+    frame_time = bench(lambda: article_job_frame(df, save_dir, "md", EXCLUDE_TITLES))
+    frame = article_job_frame(df, save_dir, "md", EXCLUDE_TITLES)
+    total_time = bench(
+        lambda: list(
+            iter_article_jobs(article_job_frame(df, save_dir, "md", EXCLUDE_TITLES))
+        )
+    )
+    old_time = bench(lambda: iterrows_jobs(df, save_dir), rounds=1)
+
+    print(f"行数: {rows}, 任务数: {len(frame)}")
+    print(f"{'iterrows':<36}{old_time:>8.3f} s")
+    print(f"{'article_job_frame':<36}{frame_time:>8.3f} s  ({old_time / frame_time:.1f}x)")
+    print(f"{'article_job_frame + 生成全部任务':<30}{total_time:>8.3f} s  ({old_time / total_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+appmsgpublish 响应解析基准测试
+
+对比完整解析（ListExPublishResponse(**data)）与精简解析（ListExPublishResponse.parse_lean）
+每页的耗时，两者都访问一次 app_msg_list。
+
+用法:
+    python benchmarks/bench_list_ex.py          # 每页 20 条发布记录，解析 500 次
+    python benchmarks/bench_list_ex.py 5 2000   # 指定每页发布记录数和次数
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from wxmp.api import fast_json
+from wxmp.api.list_ex import ListExPublishResponse
+
+
+def appmsgex(msgid: int, idx: int) -> dict:
+    """接近真实响应的 appmsgex 项（包含全部字段）"""
+    return {
+        "aid": f"{msgid}_{idx}",
+        "title": f"第{msgid}期：行业观察与深度解读（{idx}）",
+        "cover": f"https://mmbiz.qpic.cn/mmbiz_jpg/{msgid:08x}{idx}/0?wx_fmt=jpeg",
+        "link": f"https://mp.weixin.qq.com/s?__biz=MzA5&mid={msgid}&idx={idx}&sn=abcdef",
+        "digest": "这是一段文章摘要，用于在列表中展示文章的主要内容。" * 2,
+        "update_time": 1_700_000_000 + msgid,
+        "appmsgid": msgid,
+        "itemidx": idx,
+        "item_show_type": 0,
+        "author_name": "作者",
+        "tagid": ["1001", "1002"],
+        "create_time": 1_700_000_000 + msgid,
+        "is_pay_subscribe": 0,
+        "has_red_packet_cover": 0,
+        "album_id": "0",
+        "checking": 0,
+        "media_duration": "0:00",
+        "mediaapi_publish_status": 0,
+        "copyright_type": 1,
+        "appmsg_album_infos": [],
+        "pay_album_info": {"appmsg_album_infos": []},
+        "is_deleted": False,
+        "ban_flag": 0,
+        "pic_cdn_url_235_1": "https://mmbiz.qpic.cn/235_1.jpg",
+        "pic_cdn_url_16_9": "https://mmbiz.qpic.cn/16_9.jpg",
+        "pic_cdn_url_3_4": "https://mmbiz.qpic.cn/3_4.jpg",
+        "pic_cdn_url_1_1": "https://mmbiz.qpic.cn/1_1.jpg",
+        "line_info": {"use_line": 0, "line_count": 0},
+        "copyright_stat": 1,
+        "is_rumor_refutation": 0,
+        "multi_picture_cover": 0,
+        "share_imageinfo": [],
+    }
+
+
+def appmsg_info(msgid: int, idx: int) -> dict:
+    return {
+        "appmsgid": msgid,
+        "itemidx": idx,
+        "is_from_transfer": 0,
+        "open_fansmsg": 0,
+        "share_type": 0,
+        "smart_product": 0,
+        "appmsg_like_type": 2,
+        "is_pay_subscribe": 0,
+        "content_url": f"https://mp.weixin.qq.com/s?mid={msgid}&idx={idx}",
+        "modify_detail_wording": [],
+    }
+
+
+def synthetic_response(publish_items: int, articles_per_item: int = 3) -> dict:
+    """一页 appmsgpublish 响应：publish_page 和 publish_info 都是 JSON 字符串"""
+    publish_list = []
+    for i in range(publish_items):
+        msgid = 2_247_480_000 + i
+        info = {
+            "type": 9,
+            "msgid": msgid,
+            "sent_info": {
+                "time": 1_700_000_000,
+                "func_flag": 0,
+                "is_send_all": True,
+                "is_published": 1,
+            },
+            "appmsg_info": [
+                appmsg_info(msgid, idx) for idx in range(1, articles_per_item + 1)
+            ],
+            "appmsgex": [appmsgex(msgid, idx) for idx in range(1, articles_per_item + 1)],
+        }
+        publish_list.append(
+            {"publish_type": 101, "publish_info": json.dumps(info, ensure_ascii=False)}
+        )
+    page = {
+        "total_count": 1000,
+        "publish_count": 100,
+        "masssend_count": 900,
+        "publish_list": publish_list,
+    }
+    return {
+        "base_resp": {"ret": 0, "err_msg": "ok"},
+        "is_admin": True,
+        "publish_page": json.dumps(page, ensure_ascii=False),
+    }
+
+
+def bench(label: str, func, data: dict, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func(data).app_msg_list
+    per_page = (time.perf_counter() - start) / rounds * 1000
+    print(f"{label:<10} {per_page:8.3f} ms/页")
+    return per_page
+
+
+def main() -> None:
+    publish_items = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    data = synthetic_response(publish_items)
+
+    full = ListExPublishResponse(**data)
+    lean = ListExPublishResponse.parse_lean(data)
+    assert full.app_msg_list == lean.app_msg_list
+
+    print(
+        f"每页 {publish_items} 条发布记录，{full.app_msg_cnt} 篇文章，"
+        f"{len(data['publish_page']) / 1024:.1f} KB，JSON 后端: {fast_json.BACKEND}"
+    )
+    full_ms = bench("完整解析", lambda d: ListExPublishResponse(**d), data, rounds)
+    lean_ms = bench("精简解析", ListExPublishResponse.parse_lean, data, rounds)
+    print(f"加速 {full_ms / lean_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
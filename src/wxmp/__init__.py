@@ -1,6 +1,7 @@
-from .api import WxMPAPI
+from .api import AsyncWxMPAPI, WxMPAPI
 from .api.common import WxMPAPIError
 from .api.list_ex import ArticleListItem, ListExError, ListExRequest, ListExResponse
+from .api.rate_limit import FrequencyControlError, RateLimiter
 from .api.search_biz import SearchBizError, SearchBizRequest, SearchBizResponse
 from .api.token import TokenError, TokenResponse
 
@@ -9,6 +10,7 @@ __version__ = "0.1.0"
 __all__ = [
     "__version__",
     "WxMPAPI",
+    "AsyncWxMPAPI",
     "WxMPAPIError",
     "TokenError",
     "TokenResponse",
@@ -19,4 +21,6 @@ __all__ = [
     "ListExRequest",
     "ListExResponse",
     "ArticleListItem",
+    "RateLimiter",
+    "FrequencyControlError",
 ]
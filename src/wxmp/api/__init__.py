@@ -1,5 +1,12 @@
+from .async_index import AsyncWxMPAPI
 from .index import WxMPAPI
-from .list_ex import ArticleListItem, ListExError, ListExRequest, ListExResponse
+from .list_ex import (
+    ArticleListItem,
+    ListExError,
+    ListExRequest,
+    ListExResponse,
+)
+from .rate_limit import FrequencyControlError, RateLimiter
 from .search_biz import SearchBizError, SearchBizRequest, SearchBizResponse
 from .token import TokenError, TokenResponse
 
@@ -10,9 +17,12 @@ __all__ = [
     "SearchBizRequest",
     "ListExRequest",
     "WxMPAPI",
+    "AsyncWxMPAPI",
     "WxMPAPIError",
     "TokenError",
     "SearchBizError",
     "ListExError",
     "ArticleListItem",
+    "RateLimiter",
+    "FrequencyControlError",
 ]
@@ -0,0 +1,265 @@
+import asyncio
+import re
+from typing import AsyncIterator, Iterable
+
+from pydantic import ValidationError
+from tqdm.asyncio import tqdm as tqdm_asyncio
+
+from .index import WxMPAPI
+from .list_ex import (
+    ListExError,
+    ListExPublishRequest,
+    ListExPublishResponse,
+    ListExRequest,
+    ListExResponse,
+)
+from .rate_limit import (
+    FrequencyControlError,
+    RateLimiter,
+    get_default_rate_limiter,
+)
+from .search_biz import SearchBizError, SearchBizRequest, SearchBizResponse
+from .session import random_user_agent
+from .streaming import iter_bounded_fetch
+from .token import SESSION_ERROR_CODES, TokenError
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - 可选依赖
+    httpx = None
+
+
+class AsyncWxMPAPI:
+    """
+    微信公众平台异步 API
+
+    基于 httpx.AsyncClient 的连接池实现，所有请求复用同一组 keep-alive 连接，
+    并通过信号量限制同时在途的请求数量。请求/响应模型与 WxMPAPI 完全一致。
+
+    Example:
+        >>> async with AsyncWxMPAPI(cookies, concurrency=50) as api:
+        ...     await api._fetch_token()
+        ...     biz = await api.fetch_fakeid("公众号名称")
+        ...     articles = await api.fetch_article_list(biz.arr[0].fakeid)
+    """
+
+    def __init__(
+        self,
+        cookies: dict,
+        *,
+        rate_limiter: RateLimiter | None = None,
+        concurrency: int = 20,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 10.0,
+        transport: "httpx.AsyncBaseTransport | None" = None,
+    ) -> None:
+        """
+        初始化异步 API 客户端
+
+        Args:
+            cookies: 登录后的 Cookie
+            rate_limiter: 限流器，默认使用进程内共享的限流器
+            concurrency: 同时在途的最大请求数
+            max_connections: 连接池最大连接数
+            max_keepalive_connections: 连接池保持的最大空闲连接数
+            keepalive_expiry: 空闲连接保持时间（秒）
+            timeout: 默认请求超时时间（秒）
+            transport: 自定义 httpx 传输层（如测试时使用 httpx.MockTransport）
+        """
+        if httpx is None:
+            raise ImportError("AsyncWxMPAPI 需要安装 httpx: pip install 'wxmp[async]'")
+
+        self.cookies = cookies
+        self.rate_limiter = rate_limiter or get_default_rate_limiter()
+        self.domain = "https://mp.weixin.qq.com"
+        self.headers = {
+            "User-Agent": random_user_agent(),
+            "Host": "mp.weixin.qq.com",
+            "Referer": "https://mp.weixin.qq.com/",
+            # Cookie 只随 API 请求发送，文章页面请求不携带登录态
+            "Cookie": "; ".join(f"{k}={v}" for k, v in cookies.items()),
+        }
+        self.token = None
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.client = httpx.AsyncClient(
+            verify=False,
+            follow_redirects=True,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> "AsyncWxMPAPI":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """关闭连接池"""
+        await self.client.aclose()
+
+    async def _get(self, url: str, **kwargs) -> "httpx.Response":
+        """在并发上限内发送 GET 请求"""
+        async with self._semaphore:
+            res = await self.client.get(url, **kwargs)
+        res.raise_for_status()
+        return res
+
+    async def _fetch_token(self):
+        url = self.domain
+        try:
+            res = await self._get(url, headers=self.headers)
+
+            token = re.findall(r".*?token=(\d+)", str(res.url))
+            if token:
+                self.token = token[0]
+                return self.token
+            raise TokenError("从重定向URL中提取token失败")
+        except httpx.HTTPStatusError as e:
+            raise TokenError(f"HTTP请求失败: {e.response.status_code}")
+        except Exception as e:
+            raise TokenError(f"获取token时发生错误: {str(e)}")
+
+    async def _get_json(self, endpoint: str, url: str, params: dict) -> dict:
+        """经限流器发送 API 请求并返回 JSON，频率限制时降速重试，登录失效时抛出 TokenError"""
+        for _ in range(self.rate_limiter.max_throttle_retries + 1):
+            await self.rate_limiter.acquire_async(endpoint)
+            res = await self._get(url, params=params, headers=self.headers)
+            data = res.json()
+            ret = data.get("base_resp", {}).get("ret", 0)
+            if ret in SESSION_ERROR_CODES:
+                raise TokenError(f"登录状态已失效，请更新 Cookie: ret={ret}")
+            if not self.rate_limiter.report(endpoint, ret):
+                return data
+        raise FrequencyControlError(f"接口 {endpoint} 触发频率限制: ret={ret}")
+
+    async def fetch_fakeid(
+        self, query: str, begin: int = 0, count: int = 5
+    ) -> SearchBizResponse:
+        url = self.domain + "/cgi-bin/searchbiz"
+        params = SearchBizRequest(
+            action="search_biz",
+            begin=begin,
+            count=count,
+            query=query,
+            token=self.token,
+        )
+        try:
+            data = await self._get_json("searchbiz", url, params.model_dump())
+            return SearchBizResponse(**data)
+        except (TokenError, FrequencyControlError):
+            raise
+        except httpx.HTTPStatusError as e:
+            raise SearchBizError(f"HTTP请求失败: {e.response.status_code}")
+        except Exception as e:
+            raise SearchBizError(f"搜索公众号时发生错误: {str(e)}")
+
+    async def fetch_article_list(
+        self,
+        fakeid: str,
+        begin: int = 0,
+        count: int = 5,
+        is_publish: bool = False,
+        lean: bool = False,
+    ) -> ListExResponse:
+        """
+        获取文章列表
+
+        Args:
+            fakeid: 公众号fakeid
+            begin: 列表起始位置
+            count: 返回数量
+            is_publish: 是否使用 appmsgpublish 接口获取已发布文章
+            lean: 精简解析 appmsgpublish 响应（见 ListExPublishResponse.parse_lean），
+                只需要 app_msg_list 时使用
+
+        Returns:
+            文章列表响应
+        """
+        endpoint = "appmsgpublish" if is_publish else "appmsg"
+        url = self.domain + f"/cgi-bin/{endpoint}"
+        REQ = ListExPublishRequest if is_publish else ListExRequest
+        RESP = ListExPublishResponse if is_publish else ListExResponse
+        params = REQ(
+            begin=begin,
+            count=count,
+            fakeid=fakeid,
+            token=self.token,
+        )
+        try:
+            data = await self._get_json(endpoint, url, params.model_dump())
+            if is_publish and lean:
+                return ListExPublishResponse.parse_lean(data)
+            return RESP(**data)
+        except (TokenError, FrequencyControlError):
+            raise
+        except httpx.HTTPStatusError as e:
+            raise ListExError(f"HTTP请求失败: {e.response.status_code}")
+        except ValidationError as e:
+            raise ListExError(f"解析JSON响应时发生错误: {str(e)}")
+        except ValueError as e:
+            raise ListExError(f"解析JSON响应时发生错误: {str(e)}")
+        except Exception as e:
+            raise ListExError(f"获取文章列表时发生错误: {str(e)}")
+
+    is_valid_article_link = staticmethod(WxMPAPI.is_valid_article_link)
+
+    async def fetch_article_content(self, link: str, timeout: float = 10) -> str:
+        await self.rate_limiter.acquire_async("article")
+        headers = {"User-Agent": random_user_agent()}
+        async with self._semaphore:
+            response = await self.client.get(link, headers=headers, timeout=timeout)
+        # 状态码上报给限流器，正常响应时 article 令牌桶逐步提速
+        self.rate_limiter.report_status("article", response.status_code)
+        response.raise_for_status()
+        return response.text
+
+    async def fetch_multi_article_content(
+        self, links: list[str], timeout: float = 10
+    ) -> list[str]:
+        """
+        搜索多篇文章内容, 并返回同顺序内容列表
+
+        所有请求共享连接池，同时在途的请求数受 concurrency 限制。
+        """
+        tasks = [self.fetch_article_content(link, timeout) for link in links]
+
+        results = await tqdm_asyncio.gather(*tasks, desc="获取文章内容", unit="篇")
+
+        return results
+
+    async def iter_multi_article_content(
+        self,
+        links: Iterable[str],
+        timeout: float = 10,
+        concurrency: int | None = None,
+        buffer_size: int | None = None,
+        return_exceptions: bool = False,
+    ) -> AsyncIterator[tuple[int, str, str | BaseException]]:
+        """
+        流式获取多篇文章内容, 按完成顺序产出 (索引, 链接, HTML)
+
+        Args:
+            links: 文章链接，可以是惰性迭代器
+            timeout: 请求超时时间（秒）
+            concurrency: 本次调用的最大并发数，默认与客户端并发上限一致
+            buffer_size: 未消费结果的上限（背压），None 表示不限制
+            return_exceptions: 为 True 时将请求异常作为结果产出，否则直接抛出
+        """
+        concurrency = concurrency or self.concurrency
+
+        async def fetch(link: str) -> str:
+            return await self.fetch_article_content(link, timeout)
+
+        async for item in iter_bounded_fetch(
+            links, fetch, concurrency, buffer_size, return_exceptions
+        ):
+            yield item
@@ -0,0 +1,27 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 可选依赖
+    orjson = None
+
+#: 当前使用的 JSON 解析后端（安装 `pip install 'wxmp[fast]'` 后为 orjson）
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def loads(data: str | bytes | bytearray) -> Any:
+    """
+    解析 JSON，安装了 orjson 时使用 orjson，否则使用标准库 json
+
+    两种后端解析失败时抛出的异常都是 json.JSONDecodeError（orjson.JSONDecodeError 是其子类）。
+
+    Args:
+        data: JSON 字符串或 UTF-8 字节串
+
+    Returns:
+        解析结果
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,10 +1,10 @@
 import asyncio
+import codecs
 import re
-import time
 import warnings
+from typing import AsyncIterator, Iterable, Iterator
 
 import requests
-from fake_useragent import UserAgent
 from pydantic import ValidationError
 from tqdm.asyncio import tqdm as tqdm_asyncio
 from urllib3.exceptions import InsecureRequestWarning
@@ -16,22 +16,32 @@ from .list_ex import (
     ListExRequest,
     ListExResponse,
 )
+from .rate_limit import (
+    THROTTLE_STATUSES,
+    FrequencyControlError,
+    RateLimiter,
+    get_default_rate_limiter,
+)
 from .search_biz import SearchBizError, SearchBizRequest, SearchBizResponse
-from .token import TokenError
+from .session import build_session, get_content_session, random_user_agent
+from .streaming import iter_bounded_fetch
+from .token import SESSION_ERROR_CODES, TokenError
 
 warnings.filterwarnings("ignore", category=InsecureRequestWarning)
 
 
 class WxMPAPI:
-    def __init__(self, cookies: dict) -> None:
+    def __init__(self, cookies: dict, rate_limiter: RateLimiter | None = None) -> None:
         self.cookies = cookies
+        # 默认使用进程内共享的限流器，与 fetch_article_content 共用同一组令牌桶
+        self.rate_limiter = rate_limiter or get_default_rate_limiter()
         self.domain = "https://mp.weixin.qq.com"
         self.headers = {
-            "User-Agent": UserAgent().random,
+            "User-Agent": random_user_agent(),
             "Host": "mp.weixin.qq.com",
             "Referer": "https://mp.weixin.qq.com/",
         }
-        self.session = requests.Session()
+        self.session = build_session()
         self.token = None
 
     def _fetch_token(self):
@@ -52,6 +62,42 @@ class WxMPAPI:
         except Exception as e:
             raise TokenError(f"获取token时发生错误: {str(e)}")
 
+    def _get_json(self, endpoint: str, url: str, params: dict) -> dict:
+        """
+        经限流器发送 API 请求并返回 JSON
+
+        返回码为频率限制时，由限流器降速并暂停后重试。
+
+        Args:
+            endpoint: 接口名称，对应限流器中的令牌桶
+            url: 请求地址
+            params: 请求参数
+
+        Returns:
+            响应 JSON
+
+        Raises:
+            FrequencyControlError: 重试后仍被限流
+            TokenError: 登录状态已失效（返回码见 SESSION_ERROR_CODES）
+        """
+        for _ in range(self.rate_limiter.max_throttle_retries + 1):
+            self.rate_limiter.acquire(endpoint)
+            res = self.session.get(
+                url=url,
+                params=params,
+                headers=self.headers,
+                cookies=self.cookies,
+                verify=False,
+            )
+            res.raise_for_status()
+            data = res.json()
+            ret = data.get("base_resp", {}).get("ret", 0)
+            if ret in SESSION_ERROR_CODES:
+                raise TokenError(f"登录状态已失效，请更新 Cookie: ret={ret}")
+            if not self.rate_limiter.report(endpoint, ret):
+                return data
+        raise FrequencyControlError(f"接口 {endpoint} 触发频率限制: ret={ret}")
+
     def fetch_fakeid(
         self, query: str, begin: int = 0, count: int = 5
     ) -> SearchBizResponse:
@@ -64,15 +110,10 @@ class WxMPAPI:
             token=self.token,
         )
         try:
-            res = self.session.get(
-                url=url,
-                params=params.model_dump(),
-                headers=self.headers,
-                cookies=self.cookies,
-                verify=False,
-            )
-            res.raise_for_status()
-            return SearchBizResponse(**res.json())
+            data = self._get_json("searchbiz", url, params.model_dump())
+            return SearchBizResponse(**data)
+        except (TokenError, FrequencyControlError):
+            raise
         except requests.HTTPError as e:
             raise SearchBizError(f"HTTP请求失败: {e.response.status_code}")
         except Exception as e:
@@ -84,8 +125,24 @@ class WxMPAPI:
         begin: int = 0,
         count: int = 5,
         is_publish: bool = False,
+        lean: bool = False,
     ) -> ListExResponse:
-        url = self.domain + f"/cgi-bin/{'appmsgpublish' if is_publish else 'appmsg'}"
+        """
+        获取文章列表
+
+        Args:
+            fakeid: 公众号fakeid
+            begin: 列表起始位置
+            count: 返回数量
+            is_publish: 是否使用 appmsgpublish 接口获取已发布文章
+            lean: 精简解析 appmsgpublish 响应（见 ListExPublishResponse.parse_lean），
+                只需要 app_msg_list 时使用
+
+        Returns:
+            文章列表响应
+        """
+        endpoint = "appmsgpublish" if is_publish else "appmsg"
+        url = self.domain + f"/cgi-bin/{endpoint}"
         REQ = ListExPublishRequest if is_publish else ListExRequest
         RESP = ListExPublishResponse if is_publish else ListExResponse
         params = REQ(
@@ -95,17 +152,12 @@ class WxMPAPI:
             token=self.token,
         )
         try:
-            # 请求前延迟 0.05 秒
-            time.sleep(0.05)
-            res = self.session.get(
-                url=url,
-                params=params.model_dump(),
-                headers=self.headers,
-                cookies=self.cookies,
-                verify=False,
-            )
-            res.raise_for_status()
-            return RESP(**res.json())
+            data = self._get_json(endpoint, url, params.model_dump())
+            if is_publish and lean:
+                return ListExPublishResponse.parse_lean(data)
+            return RESP(**data)
+        except (TokenError, FrequencyControlError):
+            raise
         except requests.HTTPError as e:
             raise ListExError(f"HTTP请求失败: {e.response.status_code}")
         except ValidationError as e:
@@ -128,29 +180,138 @@ class WxMPAPI:
             return False
         return True
 
-    @staticmethod
-    def fetch_article_content(link: str, timeout: int = 10) -> str:
-        headers = {"User-Agent": UserAgent().random}
-        response = requests.get(link, headers=headers, timeout=timeout)
+    def fetch_article_content(self, link: str, timeout: int = 10) -> str:
+        response = self.fetch_article_response(link, timeout)
         response.raise_for_status()
         return response.text
 
+    def fetch_article_response(
+        self,
+        link: str,
+        timeout: int = 10,
+        headers: dict[str, str] | None = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        请求文章页面，返回原始响应（不检查状态码）
+
+        请求经过实例限流器的 article 令牌桶，429/503 时降速并暂停。
+        状态码为 200 的页面也可能是访问频繁验证页，因此正常页面不在这里上报，
+        由 ArticleDownloader 检查页面内容后上报，每次请求只上报一次。
+
+        Args:
+            link: 文章链接
+            timeout: 请求超时时间（秒）
+            headers: 额外的请求头，如 If-None-Match
+            stream: 是否流式读取响应体
+
+        Returns:
+            requests.Response
+        """
+        self.rate_limiter.acquire("article")
+        request_headers = {"User-Agent": random_user_agent(), **(headers or {})}
+        response = get_content_session().get(
+            link, headers=request_headers, timeout=timeout, stream=stream
+        )
+        if response.status_code in THROTTLE_STATUSES:
+            self.rate_limiter.bucket("article").on_throttle()
+        return response
+
     @staticmethod
-    async def fetch_multi_article_content(
-        links: list[str], timeout: int = 10
-    ) -> list[str]:
+    def iter_response_text(
+        response: requests.Response, chunk_size: int = 64 * 1024
+    ) -> Iterator[str]:
         """
-        搜索多篇文章内容, 并返回同顺序内容列表
+        按块读取并增量解码响应体
+
+        Args:
+            response: stream=True 的响应
+            chunk_size: 每次读取的字节数
+
+        Yields:
+            解码后的文本片段
+        """
+        # 响应头未声明 charset 时 requests 默认 ISO-8859-1，微信页面实际为 UTF-8
+        encoding = response.encoding
+        if "charset" not in response.headers.get("Content-Type", "").lower():
+            encoding = "utf-8"
+        decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    def stream_article_content(
+        self, link: str, timeout: int = 10, chunk_size: int = 64 * 1024
+    ) -> Iterator[str]:
         """
+        流式获取文章内容，按块产出解码后的 HTML
+
+        响应体不会整体缓存，多字节字符跨块时由增量解码器处理，
+        内存占用只与 chunk_size 有关。
 
-        async def fetch_single(link: str) -> str:
-            headers = {"User-Agent": UserAgent().random}
-            response = requests.get(link, headers=headers, timeout=timeout)
+        Args:
+            link: 文章链接
+            timeout: 请求超时时间（秒）
+            chunk_size: 每次读取的字节数
+
+        Yields:
+            HTML 片段
+        """
+        with self.fetch_article_response(link, timeout, stream=True) as response:
             response.raise_for_status()
-            return response.text
+            yield from self.iter_response_text(response, chunk_size)
 
-        tasks = [asyncio.to_thread(fetch_single, link) for link in links]
+    async def fetch_multi_article_content(
+        self, links: list[str], timeout: int = 10
+    ) -> list[str]:
+        """
+        搜索多篇文章内容, 并返回同顺序内容列表
+        """
+        tasks = [
+            asyncio.to_thread(self.fetch_article_content, link, timeout)
+            for link in links
+        ]
 
         results = await tqdm_asyncio.gather(*tasks, desc="获取文章内容", unit="篇")
 
         return results
+
+    async def iter_multi_article_content(
+        self,
+        links: Iterable[str],
+        timeout: int = 10,
+        concurrency: int = 10,
+        buffer_size: int | None = None,
+        return_exceptions: bool = False,
+    ) -> AsyncIterator[tuple[int, str, str | BaseException]]:
+        """
+        流式获取多篇文章内容, 按完成顺序产出 (索引, 链接, HTML)
+
+        与 fetch_multi_article_content 不同，同时只占用 concurrency 个线程，
+        结果不在内存中累积，调用方可以边获取边转换、写入。
+
+        Args:
+            links: 文章链接，可以是惰性迭代器
+            timeout: 请求超时时间（秒）
+            concurrency: 同时在途的最大请求数
+            buffer_size: 未消费结果的上限（背压），None 表示不限制
+            return_exceptions: 为 True 时将请求异常作为结果产出，否则直接抛出
+
+        Example:
+            >>> async for index, link, html in api.iter_multi_article_content(
+            ...     links, concurrency=20, buffer_size=40
+            ... ):
+            ...     save_markdown(converter.convert(html), paths[index])
+        """
+
+        async def fetch(link: str) -> str:
+            return await asyncio.to_thread(self.fetch_article_content, link, timeout)
+
+        async for item in iter_bounded_fetch(
+            links, fetch, concurrency, buffer_size, return_exceptions
+        ):
+            yield item
@@ -5,11 +5,14 @@ from typing import Any, List, Optional
 from pydantic import (
     BaseModel,
     Field,
+    PrivateAttr,
+    ValidationError,
     field_serializer,
     field_validator,
     model_validator,
 )
 
+from . import fast_json
 from .common import BaseRequest, BaseResponse, WxMPAPIError
 
 
@@ -176,7 +179,7 @@ class PublishListItem(BaseModel):
         """解析 publish_info JSON 字符串"""
         try:
             self.publish_info_parsed = PublishInfo.model_validate(
-                json.loads(self.publish_info)
+                fast_json.loads(self.publish_info)
             )
         except (json.JSONDecodeError, Exception):
             pass
@@ -194,6 +197,44 @@ class PublishPage(BaseModel):
     )
 
 
+class _LeanAppMsgInfoItem(BaseModel):
+    """精简解析用的 appmsg_info 列表项，只保留 AppMsgInfoItem 的必填字段"""
+
+    appmsgid: int
+    itemidx: int
+
+
+class _LeanPublishInfo(BaseModel):
+    """
+    精简解析用的 publish_info
+
+    appmsgex 只保留 ArticleListItem 需要的字段；PublishInfo 的必填字段同样要求存在，
+    缺少必填字段的发布记录与完整解析一样被跳过。
+    """
+
+    type: int
+    msgid: int
+    sent_info: SentInfo
+    appmsg_info: List[_LeanAppMsgInfoItem] = Field(default_factory=list)
+    appmsgex: List[ArticleListItem] = Field(default_factory=list)
+
+
+class _LeanPublishListItem(BaseModel):
+    """精简解析用的发布列表项，publish_info 保持为字符串"""
+
+    publish_type: int
+    publish_info: str
+
+
+class _LeanPublishPage(BaseModel):
+    """精简解析用的发布页面信息"""
+
+    total_count: int
+    publish_count: int
+    masssend_count: int
+    publish_list: List[_LeanPublishListItem] = Field(default_factory=list)
+
+
 class ListExPublishRequest(BaseRequest):
     """获取文章列表请求参数"""
 
@@ -212,18 +253,83 @@ class ListExPublishResponse(BaseResponse):
     )
     publish_page_parsed: Optional[PublishPage] = Field(default=None, exclude=True)
 
+    # 展平后的文章视图，首次访问时计算一次（响应解析后不再修改）
+    _articles: Optional[List[tuple[PublishListItem, AppMsgExItem]]] = PrivateAttr(
+        default=None
+    )
+    _app_msg_list: Optional[List[ArticleListItem]] = PrivateAttr(default=None)
+    _by_link: Optional[dict[str, ArticleListItem]] = PrivateAttr(default=None)
+    _by_aid: Optional[dict[str, ArticleListItem]] = PrivateAttr(default=None)
+    # 是否由 parse_lean 构造（publish_info 尚未完整解析）
+    _lean: bool = PrivateAttr(default=False)
+
     @model_validator(mode="after")
     def parse_publish_page_validator(self) -> "ListExPublishResponse":
         """解析 publish_page JSON 字符串"""
         if self.publish_page:
             try:
                 self.publish_page_parsed = PublishPage.model_validate(
-                    json.loads(self.publish_page)
+                    fast_json.loads(self.publish_page)
                 )
             except (json.JSONDecodeError, Exception):
                 pass
         return self
 
+    @classmethod
+    def parse_lean(cls, data: dict) -> "ListExPublishResponse":
+        """
+        精简解析 appmsgpublish 响应
+
+        publish_page 和每个 publish_info 都是嵌套的 JSON 字符串。完整解析会把它们
+        解码为字典后逐项校验 AppMsgExItem（约 35 个字段）和 AppMsgInfoItem；
+        精简解析直接用 model_validate_json 把 appmsgex 校验为 ArticleListItem，
+        其他字段在解析 JSON 时跳过，结果预先填入 app_msg_list 的缓存。
+
+        app_msg_list、app_msg_cnt、get_article_links、分页数量与完整解析一致：
+        缺少必填字段（包括 type、msgid、sent_info 等发布信息字段）的发布记录同样被跳过。
+        唯一的区别是精简解析不校验跳过的可选字段，例如 album_id 类型不符时完整解析
+        丢弃整条发布记录，精简解析仍保留其中的文章。
+        get_all_articles 首次调用时才完整解析 publish_info。
+
+        Args:
+            data: 接口返回的 JSON
+
+        Returns:
+            响应对象
+        """
+        publish_page = data.get("publish_page")
+        response = cls.model_validate({**data, "publish_page": None})
+        response.publish_page = publish_page
+        response._lean = True
+        articles: List[ArticleListItem] = []
+        if publish_page:
+            try:
+                page = _LeanPublishPage.model_validate_json(publish_page)
+            except ValidationError:
+                page = None
+            if page is not None:
+                for item in page.publish_list:
+                    try:
+                        info = _LeanPublishInfo.model_validate_json(item.publish_info)
+                    except ValidationError:
+                        continue
+                    articles.extend(info.appmsgex)
+                response.publish_page_parsed = PublishPage.model_construct(
+                    total_count=page.total_count,
+                    publish_count=page.publish_count,
+                    masssend_count=page.masssend_count,
+                    publish_list=[
+                        PublishListItem.model_construct(
+                            publish_type=item.publish_type,
+                            publish_info=item.publish_info,
+                            publish_info_parsed=None,
+                        )
+                        for item in page.publish_list
+                    ],
+                )
+        response._app_msg_list = articles
+        return response
+
     @property
     def app_msg_cnt(self) -> int:
         """获取文章总数"""
@@ -231,31 +337,61 @@ class ListExPublishResponse(BaseResponse):
 
     @property
     def app_msg_list(self) -> List[ArticleListItem]:
-        """获取所有文章列表（转换为 ArticleListItem 格式）"""
-        if not self.publish_page_parsed:
-            return []
-
-        articles = []
-        for publish_item in self.publish_page_parsed.publish_list:
-            if publish_item.publish_info_parsed:
-                for appmsgex in publish_item.publish_info_parsed.appmsgex:
-                    # 将 AppMsgExItem 转换为 ArticleListItem
-                    article = ArticleListItem(
-                        aid=appmsgex.aid,
-                        appmsgid=appmsgex.appmsgid,
-                        cover=appmsgex.cover,
-                        create_time=appmsgex.create_time,
-                        digest=appmsgex.digest,
-                        is_pay_subscribe=appmsgex.is_pay_subscribe,
-                        item_show_type=appmsgex.item_show_type,
-                        itemidx=appmsgex.itemidx,
-                        link=appmsgex.link,
-                        tagid=appmsgex.tagid,
-                        title=appmsgex.title,
-                        update_time=appmsgex.update_time,
-                    )
-                    articles.append(article)
-        return articles
+        """
+        获取所有文章列表（转换为 ArticleListItem 格式）
+
+        结果在首次访问时计算并缓存，多次访问返回同一个列表，请勿修改。
+        """
+        if self._app_msg_list is None:
+            # 字段已经过 AppMsgExItem 校验，直接构造不再重复校验
+            self._app_msg_list = [
+                ArticleListItem.model_construct(
+                    aid=appmsgex.aid,
+                    appmsgid=appmsgex.appmsgid,
+                    cover=appmsgex.cover,
+                    create_time=appmsgex.create_time,
+                    digest=appmsgex.digest,
+                    is_pay_subscribe=appmsgex.is_pay_subscribe,
+                    item_show_type=appmsgex.item_show_type,
+                    itemidx=appmsgex.itemidx,
+                    link=appmsgex.link,
+                    tagid=appmsgex.tagid,
+                    title=appmsgex.title,
+                    update_time=appmsgex.update_time,
+                )
+                for _, appmsgex in self._flatten()
+            ]
+        return self._app_msg_list
+
+    def _flatten(self) -> List[tuple[PublishListItem, AppMsgExItem]]:
+        """展平为 (发布项，文章) 列表，只遍历一次"""
+        if self._articles is None:
+            if self._lean:
+                # 精简解析时跳过了 publish_info 的完整解析，此时补上
+                for publish_item in self.publish_list:
+                    if publish_item.publish_info_parsed is None:
+                        publish_item.parse_publish_info_validator()
+            self._articles = [
+                (publish_item, appmsgex)
+                for publish_item in self.publish_list
+                if publish_item.publish_info_parsed
+                for appmsgex in publish_item.publish_info_parsed.appmsgex
+            ]
+        return self._articles
+
+    def get_article_by_link(self, link: str) -> Optional[ArticleListItem]:
+        """按文章链接查找（首次调用时建立索引）"""
+        if self._by_link is None:
+            self._by_link = {
+                article.link: article for article in self.app_msg_list if article.link
+            }
+        return self._by_link.get(link)
+
+    def get_article_by_aid(self, aid: str) -> Optional[ArticleListItem]:
+        """按文章 ID 查找（首次调用时建立索引）"""
+        if self._by_aid is None:
+            self._by_aid = {article.aid: article for article in self.app_msg_list}
+        return self._by_aid.get(aid)
 
     @property
     def total_count(self) -> int:
@@ -285,19 +421,8 @@ class ListExPublishResponse(BaseResponse):
 
     def get_all_articles(self) -> List[tuple[PublishListItem, AppMsgExItem]]:
         """获取所有文章（展平为 (发布项，文章) 元组列表）"""
-        articles = []
-        for publish_item in self.publish_list:
-            if publish_item.publish_info_parsed:
-                for appmsgex in publish_item.publish_info_parsed.appmsgex:
-                    articles.append((publish_item, appmsgex))
-        return articles
+        return list(self._flatten())
 
     def get_article_links(self) -> List[str]:
         """获取所有文章链接"""
-        links = []
-        for publish_item in self.publish_list:
-            if publish_item.publish_info_parsed:
-                for appmsgex in publish_item.publish_info_parsed.appmsgex:
-                    if appmsgex.link:
-                        links.append(appmsgex.link)
-        return links
+        return [article.link for article in self.app_msg_list if article.link]
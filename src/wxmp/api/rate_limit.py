@@ -0,0 +1,212 @@
+import asyncio
+import threading
+import time
+
+from .common import WxMPAPIError
+
+# base_resp.ret 中表示频率限制的返回码
+# 200013: freq control；45009/45011: 接口调用超过限制
+FREQ_CONTROL_CODES = frozenset({200013, 45009, 45011})
+
+# 表示频率限制的 HTTP 状态码
+THROTTLE_STATUSES = frozenset({429, 503})
+
+# 各接口的 (初始速率, 最大速率)，单位：次/秒
+DEFAULT_RATES: dict[str, tuple[float, float]] = {
+    "searchbiz": (1.0, 4.0),
+    "appmsg": (4.0, 20.0),
+    "appmsgpublish": (4.0, 20.0),
+    "article": (10.0, 50.0),
+    "asset": (20.0, 100.0),
+}
+
+
+class FrequencyControlError(WxMPAPIError):
+    """触发微信频率限制且重试后仍未恢复"""
+
+    pass
+
+
+class TokenBucket:
+    """
+    自适应令牌桶（线程安全）
+
+    正常响应时速率线性增加到 max_rate，触发频率限制时速率减半并暂停一段时间，
+    暂停时间随连续限流次数指数增长（AIMD）。
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        max_rate: float | None = None,
+        min_rate: float = 0.1,
+        capacity: float = 1.0,
+        backoff: float = 5.0,
+        max_backoff: float = 300.0,
+    ):
+        """
+        初始化令牌桶
+
+        Args:
+            rate: 初始速率（次/秒）
+            max_rate: 最大速率，默认等于初始速率
+            min_rate: 最小速率
+            capacity: 桶容量，即允许的突发请求数
+            backoff: 首次限流后的暂停时间（秒）
+            max_backoff: 最长暂停时间（秒）
+        """
+        self.rate = rate
+        self.max_rate = max_rate or rate
+        self.min_rate = min_rate
+        self.capacity = capacity
+        self.base_backoff = backoff
+        self.max_backoff = max_backoff
+        self._backoff = backoff
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        预定一个令牌
+
+        Returns:
+            调用方需要等待的秒数
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(delay, self._paused_until - now)
+
+    def on_success(self) -> None:
+        """请求成功，速率线性增加"""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+            self._backoff = self.base_backoff
+
+    def on_throttle(self) -> float:
+        """
+        触发频率限制，速率减半并暂停
+
+        Returns:
+            本次暂停的秒数
+        """
+        with self._lock:
+            backoff = self._backoff
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._paused_until = time.monotonic() + backoff
+            self._backoff = min(self.max_backoff, self._backoff * 2)
+            return backoff
+
+
+class RateLimiter:
+    """
+    按接口划分的限流器
+
+    每个接口（searchbiz、appmsg、appmsgpublish、article、asset）使用独立的令牌桶，
+    同一个 RateLimiter 可以在多个线程、多个 API 实例间共享。
+
+    Example:
+        >>> limiter = RateLimiter({"appmsg": (2.0, 10.0)})
+        >>> api = WxMPAPI(cookies, rate_limiter=limiter)
+    """
+
+    def __init__(
+        self,
+        rates: dict[str, tuple[float, float]] | None = None,
+        max_throttle_retries: int = 3,
+    ):
+        """
+        初始化限流器
+
+        Args:
+            rates: 各接口的 (初始速率, 最大速率)，未指定的接口使用 DEFAULT_RATES
+            max_throttle_retries: 触发频率限制后的最大重试次数
+        """
+        self.rates = {**DEFAULT_RATES, **(rates or {})}
+        self.max_throttle_retries = max_throttle_retries
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        """获取接口对应的令牌桶"""
+        with self._lock:
+            if endpoint not in self._buckets:
+                rate, max_rate = self.rates.get(endpoint, DEFAULT_RATES["article"])
+                self._buckets[endpoint] = TokenBucket(rate, max_rate)
+            return self._buckets[endpoint]
+
+    def acquire(self, endpoint: str) -> None:
+        """阻塞直到可以请求该接口"""
+        delay = self.bucket(endpoint).reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, endpoint: str) -> None:
+        """acquire 的异步版本"""
+        delay = self.bucket(endpoint).reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def is_throttled(ret: int) -> bool:
+        """判断返回码是否为频率限制"""
+        return ret in FREQ_CONTROL_CODES
+
+    def report(self, endpoint: str, ret: int) -> bool:
+        """
+        上报接口返回码，用于自适应调整速率
+
+        Args:
+            endpoint: 接口名称
+            ret: base_resp.ret 返回码
+
+        Returns:
+            是否触发了频率限制
+        """
+        bucket = self.bucket(endpoint)
+        if self.is_throttled(ret):
+            bucket.on_throttle()
+            return True
+        bucket.on_success()
+        return False
+
+    def report_status(self, endpoint: str, status_code: int) -> bool:
+        """
+        上报 HTTP 状态码，用于没有 base_resp 的请求（如文章页面）
+
+        429/503 视为频率限制；其他错误状态码与限流无关，不调整速率。
+
+        Args:
+            endpoint: 接口名称
+            status_code: 响应状态码
+
+        Returns:
+            是否触发了频率限制
+        """
+        bucket = self.bucket(endpoint)
+        if status_code in THROTTLE_STATUSES:
+            bucket.on_throttle()
+            return True
+        if status_code < 400:
+            bucket.on_success()
+        return False
+
+
+_default_rate_limiter: RateLimiter | None = None
+_default_lock = threading.Lock()
+
+
+def get_default_rate_limiter() -> RateLimiter:
+    """获取进程内共享的默认限流器"""
+    global _default_rate_limiter
+    with _default_lock:
+        if _default_rate_limiter is None:
+            _default_rate_limiter = RateLimiter()
+        return _default_rate_limiter
@@ -0,0 +1,88 @@
+import random
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from fake_useragent import UserAgent
+from requests.adapters import HTTPAdapter
+
+USER_AGENT_POOL_SIZE = 20
+
+_user_agents: list[str] = []
+_user_agents_lock = threading.Lock()
+
+_content_session: requests.Session | None = None
+_content_pool_size = 0
+_content_session_lock = threading.Lock()
+
+
+def random_user_agent() -> str:
+    """
+    从预生成的 User-Agent 池中随机取一个
+
+    fake_useragent 每次实例化都要加载数据，池只在第一次调用时生成一次。
+
+    Returns:
+        User-Agent 字符串
+    """
+    if not _user_agents:
+        with _user_agents_lock:
+            if not _user_agents:
+                ua = UserAgent()
+                _user_agents.extend({ua.random for _ in range(USER_AGENT_POOL_SIZE)})
+    return random.choice(_user_agents)
+
+
+def build_session(pool_maxsize: int = 10) -> requests.Session:
+    """
+    创建带连接池的 Session
+
+    Args:
+        pool_maxsize: 每个 host 保持的最大连接数，应不小于并发线程数
+
+    Returns:
+        requests.Session 实例
+    """
+    session = requests.Session()
+    mount_pool(session, pool_maxsize)
+    return session
+
+
+def mount_pool(session: requests.Session, pool_maxsize: int) -> None:
+    """
+    为 Session 挂载指定大小的连接池
+
+    Args:
+        session: requests.Session 实例
+        pool_maxsize: 每个 host 保持的最大连接数
+    """
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+
+def get_content_session(pool_maxsize: int | None = None) -> requests.Session:
+    """
+    获取文章内容请求共享的 Session
+
+    所有下载线程复用同一个连接池，避免每篇文章重新建立 TCP+TLS 连接。
+    该 Session 不保存 Cookie，因此可以安全地在多线程间共享。
+
+    Args:
+        pool_maxsize: 连接池大小，大于当前值时会重建连接池
+
+    Returns:
+        共享的 requests.Session 实例
+    """
+    global _content_session, _content_pool_size
+
+    with _content_session_lock:
+        if _content_session is None or (
+            pool_maxsize is not None and pool_maxsize > _content_pool_size
+        ):
+            # 旧 Session 可能仍被其他线程使用，不主动关闭，交由 GC 回收
+            _content_pool_size = max(pool_maxsize or 10, _content_pool_size)
+            session = build_session(_content_pool_size)
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            _content_session = session
+        return _content_session
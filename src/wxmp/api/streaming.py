@@ -0,0 +1,61 @@
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Iterable
+
+_WORKER_DONE = object()
+
+
+async def iter_bounded_fetch(
+    links: Iterable[str],
+    fetch: Callable[[str], Awaitable[str]],
+    concurrency: int = 10,
+    buffer_size: int | None = None,
+    return_exceptions: bool = False,
+) -> AsyncIterator[tuple[int, str, str | BaseException]]:
+    """
+    以固定并发数获取链接内容，按完成顺序逐个产出结果
+
+    只启动 concurrency 个 worker，worker 依次从 links 中取下一个链接，
+    因此 links 可以是惰性的迭代器，内存中只保留在途请求和未消费的结果。
+
+    Args:
+        links: 文章链接
+        fetch: 获取单个链接内容的协程函数
+        concurrency: 同时在途的最大请求数
+        buffer_size: 已完成但未被消费的结果上限，达到上限时 worker 暂停（背压），
+            None 表示不限制
+        return_exceptions: 为 True 时将异常作为结果产出，否则直接抛出
+
+    Yields:
+        (索引, 链接, HTML 内容或异常)
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size or 0)
+    pending = enumerate(links)
+
+    async def worker() -> None:
+        # 事件循环单线程执行，多个 worker 共享同一个迭代器是安全的
+        for index, link in pending:
+            try:
+                result = await fetch(link)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                result = e
+            await queue.put((index, link, result))
+        await queue.put(_WORKER_DONE)
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+    finished = 0
+    try:
+        while finished < len(workers):
+            item = await queue.get()
+            if item is _WORKER_DONE:
+                finished += 1
+                continue
+            index, link, result = item
+            if isinstance(result, Exception) and not return_exceptions:
+                raise result
+            yield index, link, result
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
@@ -2,6 +2,10 @@ from pydantic import Field
 
 from .common import BaseResponse, WxMPAPIError
 
+# base_resp.ret 中表示登录状态失效的返回码
+# 200003: invalid session；200040: invalid csrf token
+SESSION_ERROR_CODES = frozenset({200003, 200040})
+
 
 class TokenError(WxMPAPIError):
     """Token获取失败异常"""
@@ -1,3 +1,10 @@
+from .fakeid_resolver import FakeidResolver, normalize_name
 from .time_range_spider import TimeRangeSpider
 
-__all__ = ["TimeRangeSpider"]
+__all__ = [
+    # fakeid_resolver.py
+    "FakeidResolver",
+    "normalize_name",
+    # time_range_spider.py
+    "TimeRangeSpider",
+]
@@ -0,0 +1,195 @@
+import json
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterable
+
+from loguru import logger
+
+from wxmp.api import SearchBizError, WxMPAPI
+from wxmp.api.search_biz import AccountInfo
+from wxmp.api.session import mount_pool
+from wxmp.tools.file import atomic_write, load_json
+
+
+def normalize_name(name: str) -> str:
+    """
+    归一化公众号名称用于匹配
+
+    NFKC 统一全角/半角字符，casefold 忽略大小写，并去掉所有空白。
+    """
+    return "".join(unicodedata.normalize("NFKC", name).casefold().split())
+
+
+class FakeidResolver:
+    """
+    公众号名称到 fakeid 的解析器
+
+    - 缓存文件（默认 temp/fakeids.json）保持 {公众号名称: fakeid} 格式，每得到一个结果
+      就原子地重写一次，中途退出不会丢失已解析的结果
+    - 旁路索引 {缓存文件名}.index.json 记录名称变体（归一化后的查询词、名称和微信号）
+      到公众号名称的映射，以及搜索结果为空的名称和时间；为空的名称在 negative_ttl 内不再搜索
+    - 未命中的名称并发搜索，请求速率由 WxMPAPI 的 searchbiz 限流器控制
+
+    Example:
+        >>> resolver = FakeidResolver(spider, Path("temp/fakeids.json"), max_workers=4)
+        >>> bizs = resolver.resolve(["Python编程", "ＰＹＴＨＯＮ 编程"])
+    """
+
+    def __init__(
+        self,
+        api: WxMPAPI,
+        cache_file: Path = Path("temp/fakeids.json"),
+        *,
+        max_workers: int = 4,
+        negative_ttl: float = 7 * 24 * 3600,
+    ):
+        """
+        初始化解析器
+
+        Args:
+            api: 用于搜索公众号的 API 实例
+            cache_file: 缓存文件路径
+            max_workers: 同时搜索的名称数
+            negative_ttl: 搜索结果为空的名称的缓存时间（秒），0 表示不缓存
+        """
+        self.api = api
+        self.cache_file = Path(cache_file)
+        self.max_workers = max(1, max_workers)
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self.bizs: dict[str, str] = (
+            load_json(self.cache_file) if self.cache_file.exists() else {}
+        )
+        index = load_json(self.index_file) if self.index_file.exists() else {}
+        # 归一化名称 -> 公众号名称
+        self._aliases: dict[str, str] = index.get("aliases", {})
+        # 归一化名称 -> 搜索结果为空的时间
+        self._misses: dict[str, float] = index.get("misses", {})
+        for nickname in self.bizs:
+            self._aliases.setdefault(normalize_name(nickname), nickname)
+
+    @property
+    def index_file(self) -> Path:
+        return self.cache_file.with_name(f"{self.cache_file.stem}.index.json")
+
+    def lookup(self, name: str) -> str | None:
+        """
+        只从缓存中查找
+
+        Args:
+            name: 公众号名称、名称变体或微信号
+
+        Returns:
+            缓存中的公众号名称，未命中时返回 None
+        """
+        if name in self.bizs:
+            return name
+        nickname = self._aliases.get(normalize_name(name))
+        return nickname if nickname in self.bizs else None
+
+    def is_known_miss(self, name: str) -> bool:
+        """name 最近搜索过且结果为空"""
+        missed_at = self._misses.get(normalize_name(name))
+        return missed_at is not None and time.time() - missed_at < self.negative_ttl
+
+    def resolve(self, names: Iterable[str]) -> dict[str, str]:
+        """
+        解析公众号名称
+
+        Args:
+            names: 公众号名称列表
+
+        Returns:
+            {公众号名称: fakeid}，键为搜索结果中的公众号名称；
+            搜索失败或结果为空的名称不包含在内
+        """
+        bizs: dict[str, str] = {}
+        need: dict[str, str] = {}
+        for name in names:
+            nickname = self.lookup(name)
+            if nickname is not None:
+                bizs[nickname] = self.bizs[nickname]
+            elif self.is_known_miss(name):
+                logger.info(f"公众号搜索结果为空（已缓存）: {name}")
+            else:
+                # 同一名称的不同变体只搜索一次
+                need.setdefault(normalize_name(name), name)
+
+        if not need:
+            return bizs
+
+        logger.info(f"从网络获取fakeids: {set(need.values())}")
+        workers = min(self.max_workers, len(need))
+        if workers > 1:
+            mount_pool(self.api.session, workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self._search, name): name for name in need.values()}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    account = future.result()
+                except SearchBizError as e:
+                    logger.error(f"搜索公众号失败: {name}, 错误: {str(e)}")
+                    continue
+                if account is None:
+                    logger.warning(f"公众号搜索结果为空: {name}")
+                    continue
+                bizs[account.nickname] = account.fakeid
+                logger.info(f"成功获取公众号: {account.nickname} -> {account.fakeid}")
+        return bizs
+
+    def _search(self, name: str) -> AccountInfo | None:
+        """
+        搜索一个名称并立即保存结果
+
+        Raises:
+            SearchBizError: 请求失败，或返回码不为 0（此时结果为空也不缓存）
+        """
+        result = self.api.fetch_fakeid(name)
+        if result.base_resp.ret != 0:
+            raise SearchBizError(
+                f"搜索公众号失败: ret={result.base_resp.ret}, {result.base_resp.err_msg}"
+            )
+        key = normalize_name(name)
+        # 优先选择名称或微信号与查询词一致的结果
+        account = next(
+            (
+                item
+                for item in result.arr
+                if key in (normalize_name(item.nickname), normalize_name(item.alias))
+            ),
+            result.arr[0] if result.arr else None,
+        )
+        with self._lock:
+            if account is None:
+                if self.negative_ttl > 0:
+                    self._misses[key] = time.time()
+                    self._save_index()
+                return None
+            self.bizs[account.nickname] = account.fakeid
+            for variant in (key, account.nickname, account.alias):
+                if variant:
+                    self._aliases[normalize_name(variant)] = account.nickname
+            self._misses.pop(key, None)
+            self._save()
+        return account
+
+    def _save(self) -> None:
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(json.dumps(self.bizs, ensure_ascii=False, indent=4), self.cache_file)
+        self._save_index()
+
+    def _save_index(self) -> None:
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        # 只保存未过期的空结果
+        now = time.time()
+        self._misses = {
+            key: missed_at
+            for key, missed_at in self._misses.items()
+            if now - missed_at < self.negative_ttl
+        }
+        index = {"aliases": self._aliases, "misses": self._misses}
+        atomic_write(json.dumps(index, ensure_ascii=False, indent=4), self.index_file)
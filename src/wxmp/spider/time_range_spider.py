@@ -1,16 +1,43 @@
-import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Literal, NamedTuple
+from typing import Callable, Literal, NamedTuple
 
 import pandas as pd
 from loguru import logger
 from tqdm import tqdm
 
-from wxmp.api import ArticleListItem, SearchBizError, TokenError, WxMPAPI
-from wxmp.tools import load_json, sanitize_filename, save_json
+from wxmp.api import (
+    ArticleListItem,
+    ListExError,
+    ListExResponse,
+    RateLimiter,
+    TokenError,
+    WxMPAPI,
+)
+from wxmp.api.list_ex import ListExPublishResponse
+from wxmp.api.session import get_content_session, mount_pool
+from wxmp.spider.fakeid_resolver import FakeidResolver
+from wxmp.tools import load_json, sanitize_filename
 from wxmp.tools.article_downloader import ArticleDownloader, ArticleMetadata
+from wxmp.tools.article_frame import ArticleColumns
+from wxmp.tools.article_pipeline import (
+    ArticlePipeline,
+    article_job_frame,
+    iter_article_jobs,
+)
+from wxmp.tools.asset_downloader import AssetDownloader
+from wxmp.tools.converters import HTMLConverter
+from wxmp.tools.download_journal import DEAD, DONE, FAILED, DownloadJournal
+from wxmp.tools.http_cache import HTMLCache
+from wxmp.tools.retry import RetryBudget, RetryPolicy
 from wxmp.tools.time_manager import TimeManager, TimeRange
+from wxmp.tools.time_storage import CSVStorage, TimeStorage
+
+
+DEFAULT_PAGE_SIZE = 5
+# 分页大小探测候选值，由大到小尝试
+PAGE_SIZE_CANDIDATES = (20, 10, DEFAULT_PAGE_SIZE)
 
 
 class ArticleDownloadTask(NamedTuple):
@@ -27,8 +54,14 @@ class ArticleDownloadTask(NamedTuple):
 
 
 class TimeRangeSpider(WxMPAPI):
-    def __init__(self, cookies: dict[str, str]) -> None:
-        super().__init__(cookies)
+    def __init__(
+        self, cookies: dict[str, str], rate_limiter: RateLimiter | None = None
+    ) -> None:
+        super().__init__(cookies, rate_limiter)
+        self._page_sizes: dict[str, int] = {}
+        self._page_size_lock = threading.Lock()
+        # 探测成功的那一页即为该公众号的第一页，search_article_list 直接复用
+        self._probe_pages: dict[tuple[str, bool, int], ListExResponse] = {}
         try:
             self._fetch_token()
             logger.info(f"获取token成功: {self.token}")
@@ -37,64 +70,50 @@ class TimeRangeSpider(WxMPAPI):
             raise
 
     @classmethod
-    def from_cookies_file(cls, file_path: str) -> "TimeRangeSpider":
+    def from_cookies_file(
+        cls, file_path: str, rate_limiter: RateLimiter | None = None
+    ) -> "TimeRangeSpider":
         data = load_json(file_path)
         cookies = data["请求 Cookie"]
-        return cls(cookies)
+        return cls(cookies, rate_limiter)
 
     def load_or_search_bizs(
-        self, gzh_names: list[str] = None, cache_file: Path = Path("temp/fakeids.json")
+        self,
+        gzh_names: list[str] = None,
+        cache_file: Path = Path("temp/fakeids.json"),
+        max_workers: int = 4,
+        negative_ttl: float = 7 * 24 * 3600,
     ) -> dict[str, str]:
         """
         加载或获取公众号fakeid映射（带缓存优化）
 
+        缓存未命中的名称并发搜索（受 searchbiz 限流器控制），每得到一个结果立即写入缓存；
+        名称按 NFKC、大小写和空白归一化后匹配，也可以使用微信号；搜索结果为空的名称
+        在 negative_ttl 内不再搜索。详见 FakeidResolver。
+
         Args:
             gzh_names: 公众号名称列表，如果为空则使用缓存文件中的所有公众号
             cache_file: 缓存文件路径
+            max_workers: 同时搜索的名称数
+            negative_ttl: 搜索结果为空的名称的缓存时间（秒）
 
         Returns:
             公众号名称到fakeid的映射
         """
-        bizs = {}
-
-        if cache_file.exists():
-            logger.info(f"从缓存加载fakeids: {cache_file}")
-            cached_bizs = load_json(cache_file)
-
-            # 如果公众号名称列表为空，则使用缓存文件中的所有公众号
-            if not gzh_names:
-                bizs = cached_bizs
-                logger.info(f"使用缓存文件中的所有公众号，共 {len(bizs)} 个")
-            else:
-                required_names = set(gzh_names)
-                required_cached_bizs = {
-                    name: cached_bizs[name]
-                    for name in required_names & set(cached_bizs.keys())
-                }
-                bizs.update(required_cached_bizs)
-        else:
-            if not gzh_names:
+        if not gzh_names:
+            if not cache_file.exists():
                 logger.warning("缓存文件不存在且未指定公众号名称，返回空字典")
                 return {}
+            bizs = load_json(cache_file)
+            logger.info(f"使用缓存文件中的所有公众号，共 {len(bizs)} 个")
+            return bizs
 
-        need_names = set(gzh_names) - set(bizs.keys()) if gzh_names else set()
-        if need_names:
-            logger.info(f"从网络获取fakeids: {need_names}")
-            for name in need_names:
-                try:
-                    result = self.fetch_fakeid(name)
-                    if result.arr:
-                        nickname = result.arr[0].nickname
-                        fakeid = result.arr[0].fakeid
-                        bizs[nickname] = fakeid
-                        logger.info(f"成功获取公众号: {nickname} -> {fakeid}")
-                    else:
-                        logger.warning(f"公众号搜索结果为空: {name}")
-                except SearchBizError as e:
-                    logger.error(f"搜索公众号失败: {name}, 错误: {str(e)}")
-            save_json(bizs, cache_file)
-
-        return bizs
+        if cache_file.exists():
+            logger.info(f"从缓存加载fakeids: {cache_file}")
+        resolver = FakeidResolver(
+            self, cache_file, max_workers=max_workers, negative_ttl=negative_ttl
+        )
+        return resolver.resolve(gzh_names)
 
     def search_article_list(
         self,
@@ -115,13 +134,92 @@ class TimeRangeSpider(WxMPAPI):
         Returns:
             过滤后的文章列表
         """
-        articles = self.fetch_article_list(fakeid, begin, count, is_publish)
+        return self._fetch_page(fakeid, begin, count, is_publish)[0]
+
+    def _fetch_page(
+        self, fakeid: str, begin: int, count: int, is_publish: bool
+    ) -> tuple[list[ArticleListItem], int]:
+        """
+        获取一页文章（见 search_article_list）
+
+        Returns:
+            (过滤后的文章列表, 本页分页单位数量)，下一页从 begin + 分页单位数量开始
+        """
+        response = None
+        if begin == 0:
+            response = self._probe_pages.pop((fakeid, is_publish, count), None)
+        if response is None:
+            response = self.fetch_article_list(
+                fakeid, begin, count, is_publish, lean=True
+            )
         valid_articles = [
             article
-            for article in articles.app_msg_list
+            for article in response.app_msg_list
             if self.is_valid_article_link(article.link)
         ]
-        return valid_articles
+        return valid_articles, self._page_units(response)[0]
+
+    @staticmethod
+    def _page_units(response: ListExResponse) -> tuple[int, int]:
+        """
+        获取一页响应中的分页单位数量和总数
+
+        appmsg 按文章分页，appmsgpublish 按发布记录分页
+
+        Returns:
+            (本页数量, 总数)
+        """
+        if isinstance(response, ListExPublishResponse):
+            return len(response.publish_list), response.total_count
+        return len(response.app_msg_list), response.app_msg_cnt or 0
+
+    def detect_page_size(self, fakeid: str, is_publish: bool = False) -> int:
+        """
+        探测接口接受的最大分页大小（按接口缓存）
+
+        从 PAGE_SIZE_CANDIDATES 中由大到小尝试，返回码为 0、总数大于候选值且返回了
+        完整一页时认为接口接受该分页大小并缓存；请求失败或都不满足时使用
+        DEFAULT_PAGE_SIZE。公众号的文章总数不超过候选值、且一页返回了全部文章时
+        无法判断接口上限：本次使用该候选值但不缓存，由之后的公众号继续探测。
+        探测使用的响应就是该公众号的第一页，随后的 search_article_list 直接复用，
+        探测在第一个候选值成功时不产生额外请求。
+
+        Args:
+            fakeid: 用于探测的公众号fakeid
+            is_publish: 是否获取已发布文章
+
+        Returns:
+            分页大小
+        """
+        endpoint = "appmsgpublish" if is_publish else "appmsg"
+        # 多个公众号并发获取时只由第一个线程探测，其他线程等待结果
+        with self._page_size_lock:
+            if endpoint in self._page_sizes:
+                return self._page_sizes[endpoint]
+
+            page_size = DEFAULT_PAGE_SIZE
+            for count in PAGE_SIZE_CANDIDATES:
+                try:
+                    response = self.fetch_article_list(
+                        fakeid, 0, count, is_publish, lean=True
+                    )
+                except ListExError as e:
+                    logger.warning(f"接口 {endpoint} 分页大小 {count} 探测失败: {e}")
+                    continue
+                if response.base_resp.ret != 0:
+                    continue
+                units, total = self._page_units(response)
+                if total <= count and units >= total:
+                    # 一页就是全部文章，接口是否接受该分页大小未经验证
+                    self._probe_pages[(fakeid, is_publish, count)] = response
+                    return count
+                if units == count:
+                    page_size = count
+                    self._probe_pages[(fakeid, is_publish, count)] = response
+                    break
+            logger.info(f"接口 {endpoint} 分页大小: {page_size}")
+            self._page_sizes[endpoint] = page_size
+            return page_size
 
     def search_articles(
         self,
@@ -130,7 +228,11 @@ class TimeRangeSpider(WxMPAPI):
         is_publish: bool = False,
         max_count: int | None = None,
         time_range: TimeRange | None = None,
-    ) -> list[ArticleListItem]:
+        page_size: int | None = None,
+        prefetch: bool = False,
+        compact: bool = False,
+        on_page: Callable[[list[ArticleListItem]], None] | None = None,
+    ) -> list[ArticleListItem] | ArticleColumns:
         """
         加载或获取文章链接列表（带缓存优化）
 
@@ -140,32 +242,61 @@ class TimeRangeSpider(WxMPAPI):
             is_publish: 是否获取已发布文章，默认是 False
             max_count: 最大获取数量限制
             time_range: 时间范围限制
+            page_size: 每页数量，默认自动探测接口接受的最大值
+            prefetch: 是否在校验当前页的同时预取下一页，
+                时间范围截止时最多浪费一次请求
+            compact: 每页文章的字段直接追加到 ArticleColumns 的列缓冲区，
+                返回 ArticleColumns，可用 to_frame() 构造 DataFrame
+            on_page: 每获取到一页（非空）文章时调用，参数为该页的文章列表，
+                可用于逐页保存结果
 
         Returns:
-            文章链接列表
+            文章链接列表，compact=True 时为 ArticleColumns
         """
-        EACH_COUNT = 5
+        page_size = page_size or self.detect_page_size(fakeid, is_publish)
         # article 中有时间属性，获取所有在时间范围的文章信息，
-        all_articles: list[ArticleListItem] = []
+        all_articles: list[ArticleListItem] | ArticleColumns = []
+        if compact:
+            # 按数量上限预分配，过大时由 ArticleColumns 按需扩容
+            capacity = min(max_count, 4096) if max_count else 16 * page_size
+            all_articles = ArticleColumns(capacity=capacity)
         begin = 0
-        while True:
-            # 获取到的文章都是倒序排列，就是由近到远的顺序，越在后面的越早
-            articles = self.search_article_list(fakeid, begin, EACH_COUNT, is_publish)
-            all_articles += articles
-            begin += EACH_COUNT
-            # 如果articles为空list，说明超出范围，停止获取
-            if not articles:
-                logger.info(f"公众号「{nickname}」获取到的文章为空，停止获取")
-                break
-            # 如果时间范围限制存在，超过start_date，停止向前获取
-            if time_range and articles[-1].update_time < time_range.begin.timestamp():
-                break
-            # 如果最大数量限制存在，超过最大数量，停止获取
-            if max_count and len(all_articles) >= max_count:
-                logger.warning(
-                    f"公众号「{nickname}」获取到的文章数量 {len(all_articles)} 已超过最大数量 {max_count}，停止获取"
-                )
-                break
+        next_page: Future | None = None
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            while True:
+                # 获取到的文章都是倒序排列，就是由近到远的顺序，越在后面的越早
+                if next_page is not None:
+                    articles, units = next_page.result()
+                else:
+                    articles, units = self._fetch_page(
+                        fakeid, begin, page_size, is_publish
+                    )
+                # 按实际返回的数量翻页，接口返回的条数少于 page_size 时不会跳过文章
+                begin += units
+                if prefetch and units:
+                    next_page = prefetcher.submit(
+                        self._fetch_page, fakeid, begin, page_size, is_publish
+                    )
+                all_articles.extend(articles)
+                if on_page is not None and articles:
+                    on_page(articles)
+                # 如果本页为空，说明超出范围，停止获取
+                if not units:
+                    logger.info(f"公众号「{nickname}」获取到的文章为空，停止获取")
+                    break
+                # 如果时间范围限制存在，超过start_date，停止向前获取
+                if (
+                    time_range
+                    and articles
+                    and articles[-1].update_time < time_range.begin.timestamp()
+                ):
+                    break
+                # 如果最大数量限制存在，超过最大数量，停止获取
+                if max_count and len(all_articles) >= max_count:
+                    logger.warning(
+                        f"公众号「{nickname}」获取到的文章数量 {len(all_articles)} 已超过最大数量 {max_count}，停止获取"
+                    )
+                    break
 
         return all_articles
 
@@ -193,12 +324,73 @@ class TimeRangeSpider(WxMPAPI):
         )
         return remaining_range, new_meta_info
 
+    def _crawl_account(
+        self,
+        nickname: str,
+        fakeid: str,
+        time_range: TimeRange,
+        is_publish: bool,
+        save_dir: Path,
+        page_size: int | None = None,
+        prefetch: bool = False,
+        storage: TimeStorage | None = None,
+        compact: bool = False,
+    ) -> int:
+        """
+        获取单个公众号剩余时间范围内的文章并保存
+
+        每个公众号独立加载、追加、保存自己的 TimeManager 文件，
+        可以在多个线程中同时调用。
+
+        Returns:
+            新获取的文章数量
+        """
+        safe_nickname = sanitize_filename(nickname)
+        try:
+            tm = TimeManager.load_file(safe_nickname, save_dir, storage)
+        except FileNotFoundError:
+            tm = TimeManager.new(storage)
+
+        gaps = tm.match_remaining_time_ranges(time_range)
+        if not gaps:
+            logger.info(f"公众号 {nickname} 已经获取到所有文章，跳过")
+            return 0
+        # 文章列表只能由近到远分页获取，翻到最早的缺口即可覆盖所有缺口，
+        # 重叠部分的文章在 append_data 中去重
+        articles = self.search_articles(
+            fakeid,
+            nickname,
+            time_range=TimeRange(begin=gaps[0].begin, end=gaps[-1].end),
+            is_publish=is_publish,
+            page_size=page_size,
+            prefetch=prefetch,
+            compact=compact,
+        )
+        if not articles:
+            logger.warning(f"公众号 {nickname} 没有获取到有效文章")
+            return 0
+
+        if compact:
+            df_articles = articles.to_frame()
+        else:
+            df_articles = pd.DataFrame([article.model_dump() for article in articles])
+        df_articles["fakeid"] = fakeid
+
+        tm.append_data(df_articles)
+        tm.save_file(safe_nickname, save_dir)
+        return len(articles)
+
     def search_articles_content(
         self,
         bizs: dict[str, str],
         time_range: TimeRange,
         is_publish: bool = False,
         save_dir: Path = Path("temp/articles_info/"),
+        max_workers: int = 1,
+        page_size: int | None = None,
+        prefetch: bool = False,
+        storage: TimeStorage | None = None,
+        compact: bool = False,
     ) -> pd.DataFrame:
         """
         获取文章内容（不带缓存优化）
@@ -207,6 +399,16 @@ class TimeRangeSpider(WxMPAPI):
             bizs: 公众号名称到fakeid的映射
             time_range: 时间范围
             is_publish: 是否获取已发布文章，默认是 False
+            save_dir: 文章信息保存目录
+            max_workers: 同时获取的公众号数量，所有线程共享同一个限流器；
+                大于 1 时单个公众号失败只记录日志，登录失效（TokenError）仍直接抛出；
+                等于 1 时与之前一样，任何错误都直接抛出
+            page_size: 每页数量，默认自动探测接口接受的最大值
+            prefetch: 是否预取下一页
+            storage: 文章信息存储后端，默认使用 CSVStorage，
+                使用 SQLiteStorage 时所有公众号保存在同一个数据库中
+            compact: 每页文章直接追加到 ArticleColumns 的列缓冲区，由 to_frame() 构造
+                DataFrame，不再逐个 model_dump()，文章数量多时更省内存和时间
 
         Returns:
             文章内容DataFrame
@@ -214,42 +416,39 @@ class TimeRangeSpider(WxMPAPI):
         # 创建保存目录
         save_dir.mkdir(parents=True, exist_ok=True)
 
-        for nickname, fakeid in tqdm(bizs.items(), desc="获取公众号列表"):
-            safe_nickname = sanitize_filename(nickname)
-            if TimeManager.check_file_exist(safe_nickname, save_dir):
-                tm = TimeManager.load_file(safe_nickname, save_dir)
-            else:
-                tm = TimeManager.new()
-
-            remaining_range = tm.match_remaining_time_range(time_range)
-            if remaining_range is None:
-                logger.info(f"公众号 {nickname} 已经获取到所有文章，跳过")
-                continue
-            articles = self.search_articles(
-                fakeid, nickname, time_range=remaining_range, is_publish=is_publish
-            )
-            if not articles:
-                logger.warning(f"公众号 {nickname} 没有获取到有效文章")
-                continue
-
-            df_articles = pd.DataFrame([article.model_dump() for article in articles])
-
-            tm.append_data(df_articles)
-            tm.save_file(safe_nickname, save_dir)
-
-        # 合并bizs中对应的csv文件，并且 nickname 列为对应公众号名称
-        csv_files: list[pd.DataFrame] = []
-        for nickname in bizs.keys():
-            safe_nickname = sanitize_filename(nickname)
-            tm = TimeManager.load_file(safe_nickname, save_dir)
-            df = tm.fliter_data(time_range)
-            df["nickname"] = nickname
-            csv_files.append(df)
-        if csv_files:
-            df = pd.concat(csv_files, ignore_index=True)
+        args = (time_range, is_publish, save_dir, page_size, prefetch, storage, compact)
+        if max_workers > 1:
+            mount_pool(self.session, max_workers)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(
+                        self._crawl_account, nickname, fakeid, *args
+                    ): nickname
+                    for nickname, fakeid in bizs.items()
+                }
+                for future in tqdm(
+                    as_completed(futures), total=len(futures), desc="获取公众号列表"
+                ):
+                    try:
+                        future.result()
+                    except TokenError:
+                        # 登录失效时其他公众号也会失败，取消未开始的任务并直接抛出
+                        for pending in futures:
+                            pending.cancel()
+                        raise
+                    except Exception as e:
+                        logger.error(f"获取公众号文章失败: {futures[future]}, 错误: {e}")
         else:
-            df = pd.DataFrame()
-        return df
+            for nickname, fakeid in tqdm(bizs.items(), desc="获取公众号列表"):
+                self._crawl_account(nickname, fakeid, *args)
+
+        # 合并bizs中对应的文件，并且 nickname 列为对应公众号名称
+        storage = storage or CSVStorage()
+        return storage.load_many(
+            {sanitize_filename(nickname): nickname for nickname in bizs},
+            save_dir,
+            time_range,
+        )
 
     @staticmethod
     def download_article_content(task: ArticleDownloadTask) -> bool:
@@ -285,7 +484,7 @@ class TimeRangeSpider(WxMPAPI):
                 url=task.url,
                 save_path=save_path,
                 metadata=metadata,
-                fetch_func=WxMPAPI.fetch_article_content,
+                fetch_func=WxMPAPI({}).fetch_article_content,
             )
         except Exception as e:
             logger.error(
@@ -302,10 +501,22 @@ class TimeRangeSpider(WxMPAPI):
         time_range: TimeRange = None,
         save_file: Literal["md", "html"] = "md",
         min_file_size: str = "3KB",
+        convert_workers: int | None = 0,
+        stream: bool = False,
+        download_assets: bool = False,
+        html_cache: HTMLCache | None = None,
+        journal: DownloadJournal | None = None,
+        retry_failed_only: bool = False,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        converter: HTMLConverter | None = None,
     ):
         """
         保存所有文章内容到Markdown文件（并发下载）
 
+        下载、转换、写入分为三个阶段执行（见 ArticlePipeline），convert_workers > 0 时
+        Markdown 转换在独立的进程池中进行，可以利用多核。
+
         Args:
             df: 包含文章信息的DataFrame
             save_dir: 保存目录
@@ -314,8 +525,31 @@ class TimeRangeSpider(WxMPAPI):
             time_range: 时间范围
             save_file: 保存格式（md 或 html）
             min_file_size: 最小文件大小（支持单位：B, KB, MB, GB）
+            convert_workers: 转换进程数，0 表示在下载线程中转换，None 表示 CPU 核数；
+                大于 0 时调用方脚本需要放在 ``if __name__ == "__main__":`` 中
+            stream: 流式下载，边下载边提取正文并写入，不缓存整个页面；保存 HTML 时
+                内存占用只与块大小有关，保存 Markdown 时仍需缓存正文部分再一次转换；
+                此时转换在下载线程中进行，convert_workers 不生效
+            download_assets: 下载文章中的图片到 save_dir/assets（所有公众号共享，按内容哈希去重），
+                并将 Markdown 中的链接改写为本地路径
+            html_cache: 文章页面缓存，指定后优先从缓存读取 HTML，下载的页面写入缓存，
+                更换保存格式或转换器后重新生成文件不需要访问网络
+            journal: 下载日志，每篇文章的结果（状态、累计请求次数、失败原因、文件大小）
+                追加写入日志；日志中已完成和已失效（如文章已删除）的文章直接跳过，
+                中断后重新运行只处理剩余的文章
+            retry_failed_only: 只重试 journal 中记录为失败的文章，需要同时指定 journal
+            retry_policy: 重试策略，默认最多请求 3 次，指数退避，所有文章共享一个重试预算；
+                需要重试的文章放回队列延后执行，不占用下载线程
+            rate_limiter: 文章页面和图片请求使用的限流器（article、asset 令牌桶），
+                同时设置为 html_cache 的限流器；未指定时使用 html_cache 的限流器，
+                都未指定时使用进程内共享的限流器
+            converter: HTML 转换器，默认使用 HTMLToMarkdownConverter
         """
+        if retry_failed_only and journal is None:
+            raise ValueError("retry_failed_only 需要指定 journal")
         save_dir.mkdir(parents=True, exist_ok=True)
+        # 连接池大小与并发线程数一致，保证每个线程都能复用 keep-alive 连接
+        get_content_session(pool_maxsize=max_workers)
         # 筛选出在时间范围内的文章
         df["create_time"] = pd.to_datetime(df["create_time"])
         if time_range:
@@ -324,56 +558,74 @@ class TimeRangeSpider(WxMPAPI):
                 & (df["create_time"] <= time_range.end)
             ]
 
-        tasks = []
         skip_count = 0
+        if journal is not None:
+            # 按日志过滤，已完成和已失效的文章不需要构造任务和检查文件
+            total = len(df)
+            if retry_failed_only:
+                df = df[df["link"].isin(journal.urls(FAILED))]
+            else:
+                df = df[~df["link"].isin(journal.urls(DONE, DEAD))]
+            skip_count += total - len(df)
+
         success_count = 0
         fail_count = 0
 
-        for _, row in df.iterrows():
-            safe_nickname = sanitize_filename(row["nickname"])
-            if exclude_titles and any(
-                title in row["title"] for title in exclude_titles
-            ):
-                skip_count += 1
-                continue
-            task = ArticleDownloadTask(
-                url=row["link"],
-                title=row["title"],
-                save_dir=save_dir / safe_nickname,
-                save_file=save_file,
-                max_retries=3,
-                timeout=30,
-                date_str=row.get("create_time", ""),
-                account_name=row.get("nickname", ""),
-                digest=row.get("digest", ""),
-                min_file_size=min_file_size,
+        # 排除、文件名清理和路径拼接按列批量完成，任务在下载时才逐个生成
+        job_frame = article_job_frame(df, save_dir, save_file, exclude_titles)
+        skip_count += len(df) - len(job_frame)
+        total_jobs = len(job_frame)
+        jobs = iter_article_jobs(job_frame)
+
+        if html_cache is not None:
+            # 缓存的条件请求与页面检查使用同一组令牌桶，否则限流不生效
+            if rate_limiter is None:
+                rate_limiter = html_cache.rate_limiter
+            else:
+                html_cache.rate_limiter = rate_limiter
+
+        asset_downloader = (
+            AssetDownloader(
+                save_dir / "assets", max_workers=max_workers, rate_limiter=rate_limiter
             )
-            tasks.append((task, row["link"], row["title"]))
-
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(TimeRangeSpider.download_article_content, task): (
-                    url,
-                    title,
-                )
-                for task, url, title in tasks
-            }
-
-            with tqdm(total=len(futures), desc="下载文章", unit="篇") as pbar:
-                for future in as_completed(futures):
-                    url, title = futures[future]
-                    try:
-                        result = future.result()
-                        if result:
-                            success_count += 1
-                        else:
-                            fail_count += 1
-                    except Exception as e:
-                        fail_count += 1
-                        logger.error(f"处理文章时发生异常: {title}, 错误: {e}")
-                    pbar.update(1)
+            if download_assets
+            else None
+        )
+        downloader = ArticleDownloader(
+            timeout=30,
+            save_format=save_file,
+            min_file_size=min_file_size,
+            asset_downloader=asset_downloader,
+            converter=converter,
+            retry_policy=retry_policy or RetryPolicy(max_attempts=3, budget=RetryBudget()),
+            rate_limiter=rate_limiter,
+        )
+        # 文章页面不需要登录，只使用 WxMPAPI 的文章请求方法和限流器
+        api = WxMPAPI({}, rate_limiter)
+        fetch_func, stream_func = api.fetch_article_content, api.stream_article_content
+        if html_cache is not None:
+            fetch_func, stream_func = html_cache.fetch, html_cache.stream
+        pipeline = ArticlePipeline(
+            downloader,
+            fetch_func,
+            io_workers=max_workers,
+            convert_workers=convert_workers,
+            stream_func=stream_func if stream else None,
+            journal=journal,
+        )
+
+        with tqdm(total=total_jobs, desc="下载文章", unit="篇") as pbar:
+            for _, result in pipeline.run(jobs):
+                if result.ok:
+                    success_count += 1
+                else:
+                    fail_count += 1
+                pbar.update(1)
+
+        if asset_downloader is not None:
+            asset_downloader.close()
 
         logger.info(
             f"文章下载完成: 成功 {success_count} 篇, 失败 {fail_count} 篇, "
-            f"跳过 {skip_count} 篇, 总计 {len(tasks)} 篇"
+            f"跳过 {skip_count} 篇, 总计 {total_jobs} 篇"
         )
@@ -1,6 +1,22 @@
-from .article_downloader import ArticleDownloader, ArticleMetadata
-from .converters import HTMLConverter, HTMLToMarkdownConverter, HTMLToTextConverter
+from .article_downloader import (
+    ArticleDownloader,
+    ArticleMetadata,
+    DownloadError,
+    DownloadResult,
+)
+from .article_frame import ArticleColumns, local_datetimes
+from .article_pipeline import ArticleJob, ArticlePipeline
+from .asset_downloader import AssetDownloader
+from .download_journal import DownloadJournal, JournalEntry
+from .converters import (
+    HTMLConverter,
+    HTMLToMarkdownConverter,
+    HTMLToTextConverter,
+)
+from .http_cache import HTMLCache
+from .html_extractor import ContentExtractor, ExtractedArticle, extract_article
 from .file import (
+    atomic_write,
     load_html,
     load_json,
     load_markdown,
@@ -11,18 +27,48 @@ from .file import (
     save_markdown,
     save_text,
 )
+from .retry import (
+    ArticleUnavailableError,
+    CacheMissError,
+    RetryBudget,
+    RetryPolicy,
+    ThrottledError,
+    interstitial_kind,
+    is_throttle_page,
+)
 from .size_parser import format_file_size, parse_file_size
-from .time_manager import TimeManager, TimeRange
+from .time_manager import TimeCoverage, TimeManager, TimeRange
+from .time_storage import CSVStorage, ParquetStorage, SQLiteStorage, TimeStorage
 
 __all__ = [
     # article_downloader.py
     "ArticleDownloader",
     "ArticleMetadata",
+    "DownloadResult",
+    "DownloadError",
+    # article_frame.py
+    "ArticleColumns",
+    "local_datetimes",
+    # article_pipeline.py
+    "ArticleJob",
+    "ArticlePipeline",
+    # asset_downloader.py
+    "AssetDownloader",
+    # download_journal.py
+    "DownloadJournal",
+    "JournalEntry",
     # converters.py
     "HTMLConverter",
     "HTMLToMarkdownConverter",
     "HTMLToTextConverter",
+    # http_cache.py
+    "HTMLCache",
+    # html_extractor.py
+    "ContentExtractor",
+    "ExtractedArticle",
+    "extract_article",
     # file.py
+    "atomic_write",
     "load_html",
     "load_json",
     "load_markdown",
@@ -32,10 +78,24 @@ __all__ = [
     "save_json",
     "save_markdown",
     "save_text",
+    # retry.py
+    "RetryPolicy",
+    "RetryBudget",
+    "ThrottledError",
+    "ArticleUnavailableError",
+    "CacheMissError",
+    "interstitial_kind",
+    "is_throttle_page",
     # size_parser.py
     "parse_file_size",
     "format_file_size",
     # time_manager.py
     "TimeManager",
     "TimeRange",
+    "TimeCoverage",
+    # time_storage.py
+    "TimeStorage",
+    "CSVStorage",
+    "ParquetStorage",
+    "SQLiteStorage",
 ]
@@ -1,10 +1,23 @@
+import itertools
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Callable, Literal
+from typing import Callable, Iterable, Iterator, Literal, NamedTuple
 
+from ..api.rate_limit import RateLimiter, get_default_rate_limiter
+from .asset_downloader import AssetDownloader
 from .converters import HTMLConverter, HTMLToMarkdownConverter
-from .file import save_html, save_markdown
+from .file import atomic_write, temp_path
+from .html_extractor import ContentExtractor, ExtractedArticle, extract_article
+from .retry import (
+    INTERSTITIAL_PEEK_SIZE,
+    PERMANENT,
+    THROTTLE,
+    ArticleUnavailableError,
+    RetryPolicy,
+    ThrottledError,
+    interstitial_kind,
+)
 from .size_parser import parse_file_size
 
 
@@ -17,6 +30,27 @@ class ArticleMetadata:
     link: str = ""
     account_name: str = ""
     digest: str = ""
+    author: str = ""
+
+    def merge(self, article: ExtractedArticle) -> "ArticleMetadata":
+        """
+        用页面中提取的信息补全缺少的字段
+
+        Args:
+            article: extract_article 的结果
+
+        Returns:
+            新的 ArticleMetadata
+        """
+        date_str = self.date_str
+        if not date_str and article.publish_time:
+            date_str = article.publish_time.strftime("%Y-%m-%d %H:%M:%S")
+        return replace(
+            self,
+            title=self.title or article.title,
+            date_str=date_str,
+            author=self.author or article.author,
+        )
 
     def generate_yaml(self) -> str:
         """
@@ -34,17 +68,108 @@ class ArticleMetadata:
             yaml_front_matter += f"link: {self.link}\n"
         if self.account_name:
             yaml_front_matter += f"account: {self.account_name}\n"
+        if self.author:
+            yaml_front_matter += f"author: {self.author}\n"
         if self.digest:
             yaml_front_matter += f"summary: {self.digest}\n"
         yaml_front_matter += "---\n"
         return yaml_front_matter
 
 
+class DownloadError(Exception):
+    """
+    重试后仍然无法获取文章
+
+    attempts 为请求次数，kind 为 RetryPolicy.classify 的错误类别，
+    __cause__ 为最后一次的异常
+    """
+
+    def __init__(self, message: str, attempts: int, kind: str = ""):
+        super().__init__(message)
+        self.attempts = attempts
+        self.kind = kind
+
+
+class DownloadResult(NamedTuple):
+    """单篇文章的下载结果，布尔值与 ok 相同"""
+
+    ok: bool
+    #: 本次请求页面的次数（文件已存在时为 0）
+    attempts: int = 0
+    #: 失败原因
+    error: str = ""
+    #: 保存的文件大小（字节）
+    size: int = 0
+    #: 文件已存在，没有重新下载
+    skipped: bool = False
+    #: 失败时的错误类别（见 RetryPolicy.classify）
+    error_kind: str = ""
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+    @classmethod
+    def from_error(
+        cls, error: BaseException, attempts: int = 0, kind: str = ""
+    ) -> "DownloadResult":
+        """由异常构造失败结果"""
+        if isinstance(error, DownloadError):
+            return cls(False, error.attempts, str(error), error_kind=error.kind)
+        return cls(False, attempts, _describe(error), error_kind=kind)
+
+
+def extract_main_content(html: str) -> str:
+    """
+    提取文章主体内容
+
+    Args:
+        html: HTML 内容
+
+    Returns:
+        js_content 的完整内容，找不到时返回 body 内容或整个页面
+    """
+    return extract_article(html).content
+
+
+def render_article(
+    html: str,
+    metadata: ArticleMetadata,
+    save_format: Literal["md", "html"],
+    converter: HTMLConverter,
+) -> str:
+    """
+    将文章 HTML 渲染为要保存的内容
+
+    模块级函数，可以直接提交给 ProcessPoolExecutor 在子进程中执行。
+    md 格式下正文、标题、作者和发布时间在同一次扫描中提取，元数据中缺少的字段
+    使用页面中的值补全。
+
+    Args:
+        html: HTML 内容
+        metadata: 文章元数据
+        save_format: 保存格式（"md" 或 "html"）
+        converter: HTML 转换器
+
+    Returns:
+        md 格式返回 YAML front matter + Markdown，html 格式返回原始 HTML
+    """
+    if save_format == "html":
+        return html
+    article = extract_article(html)
+    return metadata.merge(article).generate_yaml() + converter.convert(article.content)
+
+
 class ArticleDownloader:
     """
     文章下载器
 
     封装文章下载、转换、保存的完整流程，支持重试机制和文件大小检查。
+    download 由 fetch（网络 I/O）、render（CPU）、write（磁盘 I/O）三步组成，
+    ArticlePipeline 会把这三步拆分到不同的执行阶段。
+
+    重试由 RetryPolicy 决定：404 等永久错误不重试，其他错误按指数退避加抖动重试。
+    fetch / download_stream 在当前线程中等待后重试；ArticlePipeline 只调用单次请求的
+    attempt_fetch / attempt_stream，把需要重试的任务放回队列。
 
     Example:
         >>> downloader = ArticleDownloader(
@@ -75,17 +200,24 @@ class ArticleDownloader:
         save_format: Literal["md", "html"] = "md",
         min_file_size: str = "200B",
         converter: HTMLConverter | None = None,
+        asset_downloader: AssetDownloader | None = None,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
     ):
         """
         初始化文章下载器
 
         Args:
-            max_retries: 最大重试次数
-            retry_delay: 重试间隔（秒）
+            max_retries: 最大请求次数，指定 retry_policy 时不生效
+            retry_delay: 重试的基础等待时间（秒），之后指数增长；指定 retry_policy 时不生效
             timeout: 请求超时时间（秒）
             save_format: 保存格式（"md" 或 "html"）
             min_file_size: 最小文件大小（支持单位：B, KB, MB, GB），小于此值的文件会被删除
             converter: HTML 转换器，默认使用 HTMLToMarkdownConverter
+            asset_downloader: 资源下载器，指定后 Markdown 中的远程图片会下载到本地并改写链接
+            retry_policy: 重试策略，默认为 RetryPolicy(max_retries, retry_delay)
+            rate_limiter: 检查页面后上报结果的限流器（article 令牌桶）：访问频繁提示页降速，
+                正常页面提速；应与获取页面时使用的限流器相同，默认使用进程内共享的限流器
         """
         self.max_retries = max_retries
         self.retry_delay = retry_delay
@@ -93,6 +225,11 @@ class ArticleDownloader:
         self.save_format = save_format
         self.min_file_size_bytes = parse_file_size(min_file_size)
         self.converter = converter or HTMLToMarkdownConverter()
+        self.asset_downloader = asset_downloader
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_attempts=max_retries, base_delay=retry_delay
+        )
+        self.rate_limiter = rate_limiter or get_default_rate_limiter()
 
     def download(
         self,
@@ -118,97 +255,386 @@ class ArticleDownloader:
         if save_path.exists():
             return True
 
-        for attempt in range(self.max_retries):
-            try:
-                content = fetch_func(url, self.timeout)
-                return self._save_content(content, save_path, metadata)
-            except Exception as e:
-                if attempt == self.max_retries - 1:
-                    return False
-                time.sleep(self.retry_delay)
-
-        return False
+        try:
+            html = self.fetch(url, fetch_func)
+        except Exception:
+            return False
+        return self._save_content(html, save_path, metadata)
 
-    def _save_content(
-        self, html: str, save_path: Path, metadata: ArticleMetadata
+    def download_stream(
+        self,
+        url: str,
+        save_path: Path,
+        metadata: ArticleMetadata,
+        stream_func: Callable[[str, int], Iterable[str]],
     ) -> bool:
         """
-        保存文章内容
+        流式下载文章并保存
+
+        HTML 按块读取，不缓存整个页面，写入临时文件完成后再重命名。保存 HTML 时
+        每块直接写入，内存占用只与块大小有关；保存 Markdown 时转换器不支持增量转换，
+        正文提取器只保留 js_content 部分，提取完后一次转换，内存占用与正文大小有关。
 
         Args:
-            html: HTML 内容
+            url: 文章 URL
             save_path: 保存路径
             metadata: 文章元数据
+            stream_func: 流式获取文章内容的函数，接收 (url, timeout) 返回 HTML 片段迭代器，
+                如 WxMPAPI.stream_article_content
 
         Returns:
             是否成功保存
         """
+        return self.stream_result(url, save_path, metadata, stream_func).ok
+
+    def stream_result(
+        self,
+        url: str,
+        save_path: Path,
+        metadata: ArticleMetadata,
+        stream_func: Callable[[str, int], Iterable[str]],
+    ) -> DownloadResult:
+        """
+        与 download_stream 相同，返回包含请求次数、失败原因和文件大小的 DownloadResult
+        """
+        save_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if save_path.exists():
+            return self.existing(save_path)
+
+        for attempt in itertools.count(1):
+            try:
+                return self.attempt_stream(url, save_path, metadata, stream_func, attempt)
+            except Exception as e:
+                delay = self.retry_policy.retry_delay(e, attempt)
+                if delay is None:
+                    return DownloadResult.from_error(
+                        e, attempt, self.retry_policy.classify(e)
+                    )
+                time.sleep(delay)
+
+    def attempt_stream(
+        self,
+        url: str,
+        save_path: Path,
+        metadata: ArticleMetadata,
+        stream_func: Callable[[str, int], Iterable[str]],
+        attempt: int = 1,
+    ) -> DownloadResult:
+        """
+        流式下载一次，不重试
+
+        Args:
+            url: 文章 URL
+            save_path: 保存路径
+            metadata: 文章元数据
+            stream_func: 流式获取文章内容的函数
+            attempt: 第几次请求，写入结果
+
+        Returns:
+            检查文件大小后的结果
+
+        Raises:
+            Exception: 请求或转换失败；页面为提示页时抛出 ArticleUnavailableError 或
+                ThrottledError
+        """
+        self.retry_policy.record_request()
+        chunks = self._check_page_stream(stream_func(url, self.timeout))
+        return self._stream_to_file(chunks, save_path, metadata, attempt)
+
+    def _check_page_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        """先读取页面开头，整个页面很短时检查是否为提示页（见 _check_page）"""
+        chunks = iter(chunks)
+        head: list[str] = []
+        size = 0
+        for chunk in chunks:
+            head.append(chunk)
+            size += len(chunk)
+            if size >= INTERSTITIAL_PEEK_SIZE:
+                # 提示页都很短，足够长的页面是正常文章
+                self.rate_limiter.bucket("article").on_success()
+                break
+        else:
+            self._check_page("".join(head))
+        yield from head
+        yield from chunks
+
+    def _stream_to_file(
+        self,
+        chunks: Iterable[str],
+        save_path: Path,
+        metadata: ArticleMetadata,
+        attempts: int = 1,
+    ) -> DownloadResult:
+        """
+        将 HTML 片段转换后写入临时文件，完成后替换为 save_path
+
+        输出达到 min_file_size 之前只缓存在内存中，过小的结果不会产生任何磁盘写入。
+
+        Returns:
+            检查文件大小后的结果
+        """
+        tmp_path = temp_path(save_path, ".part")
+        writer = _GatedWriter(tmp_path, self.min_file_size_bytes)
         try:
-            if self.save_format == "md":
-                yaml_front_matter = metadata.generate_yaml()
-                main_content = self._extract_main_content(html)
-                markdown_content = yaml_front_matter + self.converter.convert(
-                    main_content
-                )
-                save_markdown(markdown_content, save_path)
-            elif self.save_format == "html":
-                save_html(html, save_path)
-
-            return self._check_file_size(save_path)
+            with writer:
+                if self.save_format == "html":
+                    for chunk in chunks:
+                        writer.write(chunk)
+                else:
+                    self._stream_markdown(chunks, writer.write, metadata)
+            if writer.size < self.min_file_size_bytes:
+                return self._too_small(writer.size, attempts)
+            size = writer.size
+            if self.asset_downloader is not None and self.save_format == "md":
+                # Markdown 只包含图片链接，体积远小于页面，读回改写即可
+                markdown = tmp_path.read_text(encoding="utf-8")
+                size = atomic_write(self.localize(markdown, save_path), tmp_path)
+            tmp_path.replace(save_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        return DownloadResult(True, attempts, size=size)
+
+    def _stream_markdown(
+        self,
+        chunks: Iterable[str],
+        write: Callable[[str], object],
+        metadata: ArticleMetadata,
+    ) -> None:
+        """提取 HTML 片段中的正文，转换为带 front matter 的 Markdown"""
+        parts: list[str] = []
+        extractor = ContentExtractor(parts.append)
+        for chunk in chunks:
+            extractor.feed(chunk)
+        article = extractor.close()
+
+        write(metadata.merge(article).generate_yaml())
+        write(self.converter.convert("".join(parts)))
+
+    def fetch(self, url: str, fetch_func: Callable[[str, int], str]) -> str:
+        """
+        获取文章 HTML，失败时按重试策略等待后重试
 
-        except Exception:
-            self._cleanup_on_error(save_path)
-            return False
+        Args:
+            url: 文章 URL
+            fetch_func: 获取文章内容的函数，接收 (url, timeout) 返回 HTML 内容
 
-    def _extract_main_content(self, html: str) -> str:
+        Returns:
+            HTML 内容
+
+        Raises:
+            DownloadError: 重试策略不再重试时抛出，__cause__ 为最后一次的异常
         """
-        提取文章主体内容
+        return self.fetch_counted(url, fetch_func)[0]
+
+    def fetch_counted(
+        self, url: str, fetch_func: Callable[[str, int], str]
+    ) -> tuple[str, int]:
+        """
+        与 fetch 相同，同时返回请求次数
+
+        Returns:
+            (HTML 内容, 请求次数)
+        """
+        for attempt in itertools.count(1):
+            try:
+                return self.attempt_fetch(url, fetch_func), attempt
+            except Exception as e:
+                delay = self.retry_policy.retry_delay(e, attempt)
+                if delay is None:
+                    raise DownloadError(
+                        _describe(e), attempt, self.retry_policy.classify(e)
+                    ) from e
+                time.sleep(delay)
+
+    def attempt_fetch(self, url: str, fetch_func: Callable[[str, int], str]) -> str:
+        """
+        获取一次文章 HTML，不重试
+
+        Raises:
+            Exception: 请求失败；页面为提示页时抛出 ArticleUnavailableError 或 ThrottledError
+        """
+        self.retry_policy.record_request()
+        html = fetch_func(url, self.timeout)
+        self._check_page(html)
+        return html
+
+    def _check_page(self, html: str) -> None:
+        """
+        检查页面是否为微信的提示页，正常页面上报给限流器以逐步恢复请求速率
+
+        Raises:
+            ArticleUnavailableError: 文章已删除或因违规无法查看
+            ThrottledError: 访问频繁或环境异常验证页，同时降低文章页面的请求速率
+        """
+        kind = interstitial_kind(html)
+        bucket = self.rate_limiter.bucket("article")
+        if kind == PERMANENT:
+            raise ArticleUnavailableError("文章已被删除或无法查看")
+        if kind == THROTTLE:
+            bucket.on_throttle()
+            raise ThrottledError("访问过于频繁或需要验证")
+        bucket.on_success()
+
+    def render(self, html: str, metadata: ArticleMetadata) -> str:
+        """
+        将 HTML 渲染为要保存的内容（纯 CPU 计算，不涉及 I/O）
 
         Args:
             html: HTML 内容
+            metadata: 文章元数据
 
         Returns:
-            主体内容 HTML
+            要保存的文本内容
         """
-        import re
+        return render_article(html, metadata, self.save_format, self.converter)
 
-        content_match = re.search(
-            r'<div[^>]*id="js_content"[^>]*>(.*?)</div>', html, re.DOTALL
-        )
+    def write(self, content: str, save_path: Path) -> bool:
+        """
+        检查渲染后内容的大小，满足要求时原子写入（先写临时文件再重命名）
+
+        大小按 UTF-8 编码后的字节数在内存中判断，过小的内容不会写入磁盘。
 
-        if content_match:
-            return content_match.group(1)
+        Args:
+            content: render 返回的内容
+            save_path: 保存路径
 
-        body_match = re.search(r"<body[^>]*>(.*?)</body>", html, re.DOTALL)
-        return body_match.group(1) if body_match else html
+        Returns:
+            是否成功保存
+        """
+        return self.write_result(content, save_path).ok
 
-    def _check_file_size(self, save_path: Path) -> bool:
+    def localize(self, content: str, save_path: Path) -> str:
         """
-        检查文件大小是否满足要求
+        下载 render 结果中引用的图片并改写为本地链接（网络 I/O）
+
+        未指定 asset_downloader 或保存为 HTML 时原样返回。
 
         Args:
-            save_path: 文件路径
+            content: render 返回的内容
+            save_path: 保存路径，用于计算图片的相对路径
 
         Returns:
-            文件大小是否满足要求
+            改写链接后的内容
         """
-        file_size = save_path.stat().st_size
+        if self.asset_downloader is None or self.save_format != "md":
+            return content
+        return self.asset_downloader.localize(content, save_path)
 
-        if file_size < self.min_file_size_bytes:
-            save_path.unlink()
-            return False
+    def write_result(
+        self,
+        content: str,
+        save_path: Path,
+        attempts: int = 0,
+        localize: bool = True,
+    ) -> DownloadResult:
+        """
+        与 write 相同，返回 DownloadResult
 
-        return True
+        Args:
+            content: render 返回的内容
+            save_path: 保存路径
+            attempts: 获取页面时的请求次数，原样写入结果
+            localize: 是否先调用 localize 下载图片；调用方已在其他线程完成时传 False
+
+        Returns:
+            保存结果
+        """
+        try:
+            if localize:
+                content = self.localize(content, save_path)
+            data = content.encode("utf-8")
+            if len(data) < self.min_file_size_bytes:
+                return self._too_small(len(data), attempts)
+            save_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(data, save_path)
+        except Exception as e:
+            return DownloadResult.from_error(e, attempts)
+        return DownloadResult(True, attempts, size=len(data))
 
-    def _cleanup_on_error(self, save_path: Path) -> None:
+    def _save_content(
+        self, html: str, save_path: Path, metadata: ArticleMetadata
+    ) -> bool:
         """
-        出错时清理文件
+        保存文章内容
 
         Args:
-            save_path: 文件路径
+            html: HTML 内容
+            save_path: 保存路径
+            metadata: 文章元数据
+
+        Returns:
+            是否成功保存
         """
-        if save_path.exists():
-            try:
-                save_path.unlink()
-            except Exception:
-                pass
+        try:
+            content = self.render(html, metadata)
+        except Exception:
+            return False
+        return self.write(content, save_path)
+
+    def _extract_main_content(self, html: str) -> str:
+        """
+        提取文章主体内容
+
+        Args:
+            html: HTML 内容
+
+        Returns:
+            主体内容 HTML
+        """
+        return extract_main_content(html)
+
+    @staticmethod
+    def _too_small(size: int, attempts: int) -> DownloadResult:
+        """内容小于 min_file_size 时的失败结果"""
+        return DownloadResult(False, attempts, f"文件大小 {size}B 小于 min_file_size", size)
+
+    @staticmethod
+    def existing(save_path: Path) -> DownloadResult:
+        """已存在的文件视为成功，不重新下载"""
+        return DownloadResult(True, size=save_path.stat().st_size, skipped=True)
+
+
+class _GatedWriter:
+    """
+    流式写入文件，累计达到 min_size 字节之后才创建文件
+
+    之前的内容缓存在内存中，关闭时仍未达到 min_size 则不创建文件。
+    """
+
+    def __init__(self, path: Path, min_size: int):
+        self.path = path
+        self.min_size = min_size
+        self.size = 0
+        self._pending: list[bytes] = []
+        self._file = None
+
+    def write(self, text: str) -> None:
+        data = text.encode("utf-8")
+        self.size += len(data)
+        if self._file is not None:
+            self._file.write(data)
+            return
+        self._pending.append(data)
+        if self.size >= self.min_size:
+            self._open()
+
+    def _open(self) -> None:
+        self._file = open(self.path, "wb")
+        self._file.writelines(self._pending)
+        self._pending = []
+
+    def __enter__(self) -> "_GatedWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if self._file is None and exc_type is None and self.size >= self.min_size:
+            self._open()
+        if self._file is not None:
+            self._file.close()
+
+
+def _describe(error: BaseException) -> str:
+    """异常的简短描述，用于记录失败原因"""
+    message = str(error)
+    return f"{type(error).__name__}: {message}" if message else type(error).__name__
@@ -0,0 +1,176 @@
+import os
+import time
+from typing import Sequence
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+import pandas as pd
+
+from ..api.list_ex import ArticleListItem
+
+#: 文章列表 DataFrame 的列（与 ArticleListItem.model_dump() 的键相同）
+ARTICLE_COLUMNS = tuple(ArticleListItem.model_fields)
+
+# 整数列（含时间戳）保存在 numpy 数组中，其余为字符串列
+_INT_COLUMNS = (
+    "appmsgid",
+    "create_time",
+    "is_pay_subscribe",
+    "item_show_type",
+    "itemidx",
+    "update_time",
+)
+_STR_COLUMNS = tuple(name for name in ARTICLE_COLUMNS if name not in _INT_COLUMNS)
+
+# 与 ArticleListItem 的时间序列化格式相同
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _local_zone() -> ZoneInfo | None:
+    """本地时区（取自 TZ 环境变量或 /etc/localtime），不是 IANA 时区时返回 None"""
+    name = os.environ.get("TZ", "").lstrip(":")
+    if not name:
+        name = os.path.realpath("/etc/localtime")
+    if os.path.isabs(name):
+        _, found, name = name.partition("zoneinfo/")
+        if not found:
+            return None
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+def local_datetimes(seconds) -> pd.Series:
+    """
+    整数时间戳按列转换为本地时间
+
+    结果与逐个调用 datetime.fromtimestamp 相同（不带时区）。本地时区为 IANA 时区
+    （TZ 环境变量或 /etc/localtime）时由 pandas 整列转换，历史上调整过基准偏移或
+    夏令时规则的时区（如 Europe/Moscow、Asia/Shanghai）也按当时的偏移换算；
+    无法确定时区名称时（如 TZ 为 POSIX 格式）退回逐个时间戳调用 time.localtime。
+
+    Args:
+        seconds: 秒级时间戳序列
+
+    Returns:
+        datetime64 序列
+    """
+    seconds = pd.Series(seconds, dtype="int64")
+    zone = _local_zone()
+    if zone is not None:
+        values = pd.to_datetime(seconds, unit="s", utc=True)
+        return values.dt.tz_convert(zone).dt.tz_localize(None)
+    unique, inverse = np.unique(seconds.to_numpy(), return_inverse=True)
+    offsets = np.fromiter(
+        (time.localtime(t).tm_gmtoff for t in unique.tolist()),
+        dtype=np.int64,
+        count=len(unique),
+    )
+    return pd.to_datetime(seconds + offsets[inverse], unit="s")
+
+
+class ArticleColumns:
+    """
+    按列累积的文章列表
+
+    每页文章的字段直接追加到列缓冲区：整数和时间戳写入预分配的 int64 数组（容量不足时
+    翻倍），字符串追加到列表，最后由 to_frame 一次构造带类型的 DataFrame，
+    不经过逐条 model_dump() 的字典。
+
+    Example:
+        >>> columns = ArticleColumns(capacity=1000)
+        >>> columns.extend(response.app_msg_list)
+        >>> df = columns.to_frame()
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        初始化列缓冲区
+
+        Args:
+            capacity: 预分配的行数
+        """
+        capacity = max(1, capacity)
+        self._size = 0
+        self._ints = {name: np.empty(capacity, dtype=np.int64) for name in _INT_COLUMNS}
+        self._strs: dict[str, list[str]] = {name: [] for name in _STR_COLUMNS}
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """整数列当前的容量"""
+        return len(self._ints["appmsgid"])
+
+    def _reserve(self, size: int) -> None:
+        if size <= self.capacity:
+            return
+        capacity = max(size, self.capacity * 2)
+        for name, values in self._ints.items():
+            grown = np.empty(capacity, dtype=np.int64)
+            grown[: self._size] = values[: self._size]
+            self._ints[name] = grown
+
+    def extend(self, items: Sequence[ArticleListItem]) -> None:
+        """
+        追加一页文章
+
+        Args:
+            items: ArticleListItem 列表
+        """
+        count = len(items)
+        if not count:
+            return
+        self._reserve(self._size + count)
+        end = self._size + count
+        for name, values in self._ints.items():
+            values[self._size : end] = [getattr(item, name) for item in items]
+        for name, values in self._strs.items():
+            values.extend(getattr(item, name) for item in items)
+        # tagid 为列表，与 model_dump() 一样转为逗号分隔的字符串
+        tagid = self._strs["tagid"]
+        for i in range(self._size, end):
+            tagid[i] = ",".join(tagid[i])
+        self._size = end
+
+    def column(self, name: str) -> np.ndarray | list[str]:
+        """
+        读取一列（整数列返回数组视图，不复制）
+
+        Args:
+            name: 列名
+
+        Returns:
+            已追加的值
+        """
+        if name in self._ints:
+            return self._ints[name][: self._size]
+        return self._strs[name]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        构造 DataFrame
+
+        create_time 为 datetime64（TimeManager.append_data 本来也会转换），update_time
+        与 model_dump() 一样格式化为 "YYYY-MM-DD HH:MM:SS"，已保存的数据格式不变；
+        其他整数列为 int64。
+
+        Returns:
+            列与 ArticleListItem.model_dump() 相同的 DataFrame
+        """
+        data = {}
+        for name in ARTICLE_COLUMNS:
+            if name == "create_time":
+                data[name] = local_datetimes(self.column(name))
+            elif name == "update_time":
+                data[name] = local_datetimes(self.column(name)).dt.strftime(
+                    _TIME_FORMAT
+                )
+            elif name in self._ints:
+                data[name] = self.column(name).copy()
+            else:
+                data[name] = list(self._strs[name])
+        return pd.DataFrame(data, columns=ARTICLE_COLUMNS)
+
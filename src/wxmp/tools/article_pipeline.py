@@ -0,0 +1,460 @@
+import heapq
+import itertools
+import multiprocessing
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Literal, NamedTuple
+
+import pandas as pd
+
+from .article_downloader import (
+    ArticleDownloader,
+    ArticleMetadata,
+    DownloadResult,
+    render_article,
+)
+from .file import sanitize_filename, sanitize_filenames
+
+if TYPE_CHECKING:
+    from .download_journal import DownloadJournal
+
+# 下载线程退出标记
+_WORKER_DONE = object()
+
+
+class ArticleJob(NamedTuple):
+    """文章下载任务"""
+
+    url: str
+    save_path: Path
+    metadata: ArticleMetadata
+
+
+# article_job_frame 返回的列，与 iter_article_jobs 中的顺序一致
+_JOB_COLUMNS = ["url", "save_path", "title", "date_str", "account_name", "digest"]
+
+
+def article_job_frame(
+    df: pd.DataFrame,
+    save_dir: Path,
+    save_format: Literal["md", "html"] = "md",
+    exclude_titles: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    由文章列表构造下载任务表（按列批量计算，不逐行遍历）
+
+    标题排除、文件名清理和保存路径拼接都是整列的字符串操作，
+    公众号名称只对去重后的值清理一次。
+
+    Args:
+        df: 文章数据，需要 title、link、nickname 列，create_time、digest 列可选
+        save_dir: 保存目录，文章保存为 save_dir/{公众号}/{标题}.{save_format}
+        save_format: 保存格式（"md" 或 "html"）
+        exclude_titles: 标题包含其中任一字符串的文章不下载
+
+    Returns:
+        列为 url、save_path、title、date_str、account_name、digest 的任务表，
+        索引与 df 相同，可以交给 iter_article_jobs 逐个生成任务
+    """
+    titles = df["title"].fillna("").astype(str)
+    if exclude_titles:
+        pattern = "|".join(re.escape(title) for title in exclude_titles)
+        keep = ~titles.str.contains(pattern, regex=True)
+        df, titles = df[keep], titles[keep]
+
+    nicknames = df["nickname"].fillna("").astype(str)
+    safe_nicknames = nicknames.map(
+        {name: sanitize_filename(name) for name in nicknames.unique()}
+    )
+    save_paths = (
+        f"{Path(save_dir).as_posix()}/"
+        + safe_nicknames
+        + "/"
+        + sanitize_filenames(titles)
+        + f".{save_format}"
+    )
+
+    if "create_time" in df:
+        create_time = df["create_time"]
+        if pd.api.types.is_datetime64_any_dtype(create_time):
+            create_time = create_time.dt.strftime("%Y-%m-%d %H:%M:%S")
+        date_str = create_time.fillna("").astype(str)
+    else:
+        date_str = ""
+    digest = df["digest"].fillna("").astype(str) if "digest" in df else ""
+
+    return pd.DataFrame(
+        {
+            "url": df["link"],
+            "save_path": save_paths,
+            "title": titles,
+            "date_str": date_str,
+            "account_name": nicknames,
+            "digest": digest,
+        },
+        index=df.index,
+        columns=_JOB_COLUMNS,
+    )
+
+
+def iter_article_jobs(frame: pd.DataFrame) -> Iterator[ArticleJob]:
+    """
+    按 article_job_frame 的结果逐个生成下载任务
+
+    ArticleJob、Path 和 ArticleMetadata 在取出时才创建，可以直接交给 ArticlePipeline.run。
+    """
+    columns = [frame[col].tolist() for col in _JOB_COLUMNS]
+    for url, save_path, title, date_str, account_name, digest in zip(*columns):
+        yield ArticleJob(
+            url=url,
+            save_path=Path(save_path),
+            metadata=ArticleMetadata(
+                title=title,
+                date_str=date_str,
+                link=url,
+                account_name=account_name,
+                digest=digest,
+            ),
+        )
+
+
+class _JobScheduler:
+    """
+    任务调度：优先取出已到期的重试任务，否则从任务迭代器中取新任务
+
+    需要重试的任务放入按到期时间排序的堆中，下载线程不必等待；
+    迭代器耗尽、没有待重试任务且没有正在处理的任务时结束。
+    """
+
+    def __init__(self, jobs: Iterable[ArticleJob], stop: threading.Event):
+        self._jobs = iter(jobs)
+        self._exhausted = False
+        # (到期时间, 序号, 任务, 第几次请求)
+        self._retries: list[tuple[float, int, ArticleJob, int]] = []
+        self._seq = itertools.count()
+        self._active = 0
+        self._stop = stop
+        self._cond = threading.Condition()
+
+    def next(self) -> tuple[ArticleJob, int] | None:
+        """
+        取出下一个任务
+
+        Returns:
+            (任务, 第几次请求)，全部完成或已停止时返回 None
+        """
+        with self._cond:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                if self._retries and self._retries[0][0] <= now:
+                    _, _, job, attempt = heapq.heappop(self._retries)
+                    self._active += 1
+                    return job, attempt
+                if not self._exhausted:
+                    job = next(self._jobs, None)
+                    if job is not None:
+                        self._active += 1
+                        return job, 1
+                    self._exhausted = True
+                if not self._retries and self._active == 0:
+                    return None
+                timeout = self._retries[0][0] - now if self._retries else 0.1
+                self._cond.wait(min(timeout, 0.1))
+            return None
+
+    def retry(self, job: ArticleJob, attempt: int, delay: float) -> None:
+        """delay 秒后重新执行任务"""
+        with self._cond:
+            heapq.heappush(
+                self._retries, (time.monotonic() + delay, next(self._seq), job, attempt)
+            )
+            self._cond.notify()
+
+    def done(self) -> None:
+        """当前任务处理结束（包括放回重试）"""
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+
+class _ConvertSlots:
+    """
+    提交给转换进程、尚未转换完成的文章数上限
+
+    下载线程在请求 HTML 前取得名额，转换完成时释放；
+    已停止时不再等待，避免转换进程池关闭后下载线程永远阻塞。
+    """
+
+    def __init__(self, size: int, stop: threading.Event):
+        self._semaphore = threading.BoundedSemaphore(size)
+        self._stop = stop
+
+    def acquire(self) -> bool:
+        """等待名额，已停止时返回 False"""
+        while not self._stop.is_set():
+            if self._semaphore.acquire(timeout=0.1):
+                return True
+        return False
+
+    def release(self, _future: Future | None = None) -> None:
+        """释放名额，可以直接作为 Future 的完成回调"""
+        self._semaphore.release()
+
+
+class ArticlePipeline:
+    """
+    文章下载流水线
+
+    将 ArticleDownloader 的三步拆分为独立的阶段：
+
+    1. 下载：io_workers 个线程获取 HTML（网络 I/O，不受 GIL 影响）
+    2. 转换：convert_workers 个进程提取正文并转换为 Markdown（CPU 密集）
+    3. 写入：调用方所在线程按顺序写文件并返回结果
+
+    下载器指定了 asset_downloader 时，图片在写入之前下载并改写链接：在下载线程中转换时
+    由下载线程完成，使用转换进程时由独立的 io_workers 个线程等待转换结果后完成，
+    写入线程只做文件写入。
+
+    每个阶段之间的队列都有上限，下游跟不上时上游阻塞，内存占用有上限：
+
+    - 下载 → 转换：已提交给转换进程、尚未转换完成的文章最多 fetch_queue_size 篇，
+      名额用完时下载线程在请求下一篇之前等待
+    - 转换 → 写入：尚未写入的文章（包括正在转换的）最多 convert_queue_size 篇，
+      写入跟不上时下载线程在提交结果时等待
+
+    写入在调用方线程中进行，本身没有队列；调用方处理结果越慢，
+    转换 → 写入的队列越快填满。下载线程按需从任务迭代器中取任务。
+    请求失败时按 downloader.retry_policy 计算等待时间，任务放回队列延后重试，
+    下载线程继续处理其他文章。
+
+    注意：convert_workers > 0 时会以 spawn 方式启动子进程，调用方脚本需要放在
+    ``if __name__ == "__main__":`` 中。
+
+    Example:
+        >>> pipeline = ArticlePipeline(
+        ...     ArticleDownloader(min_file_size="3KB"),
+        ...     api.fetch_article_content,
+        ...     io_workers=8,
+        ...     convert_workers=os.cpu_count(),
+        ... )
+        >>> for job, result in pipeline.run(jobs):
+        ...     print(job.url, result.ok, result.error)
+    """
+
+    def __init__(
+        self,
+        downloader: ArticleDownloader,
+        fetch_func: Callable[[str, int], str],
+        *,
+        io_workers: int = 5,
+        convert_workers: int | None = 0,
+        convert_queue_size: int | None = None,
+        fetch_queue_size: int | None = None,
+        stream_func: Callable[[str, int], Iterable[str]] | None = None,
+        journal: "DownloadJournal | None" = None,
+    ):
+        """
+        初始化下载流水线
+
+        Args:
+            downloader: 提供重试、转换器、保存格式和文件大小检查的下载器
+            fetch_func: 获取文章内容的函数，接收 (url, timeout) 返回 HTML 内容
+            io_workers: 下载线程数
+            convert_workers: 转换进程数，0 表示在下载线程中转换，None 表示 CPU 核数
+            convert_queue_size: 已下载未写入的文章数上限，默认为转换并发数的 2 倍
+            fetch_queue_size: 已下载未转换完成的文章数上限，默认为转换进程数的 2 倍，
+                只在 convert_workers > 0 时生效
+            stream_func: 流式获取文章内容的函数（如 WxMPAPI.stream_article_content），
+                指定后每个下载线程边下载边提取正文并写入（ArticleDownloader.download_stream），
+                不缓存整个页面（保存 Markdown 时仍缓存正文后一次转换），
+                convert_workers 不再生效
+            journal: 下载日志，每篇文章的结果写入后立即追加记录
+        """
+        if convert_workers is None:
+            convert_workers = os.cpu_count() or 1
+        self.downloader = downloader
+        self.fetch_func = fetch_func
+        self.stream_func = stream_func
+        self.journal = journal
+        self.io_workers = max(1, io_workers)
+        self.convert_workers = convert_workers
+        self.convert_queue_size = convert_queue_size or 2 * max(
+            convert_workers, self.io_workers
+        )
+        self.fetch_queue_size = fetch_queue_size or 2 * max(convert_workers, 1)
+
+    def run(
+        self, jobs: Iterable[ArticleJob]
+    ) -> Iterator[tuple[ArticleJob, DownloadResult]]:
+        """
+        执行下载任务
+
+        已存在的文件直接视为成功，不会重新下载。提前结束迭代时会停止所有阶段。
+
+        Args:
+            jobs: 下载任务，可以是惰性生成器
+
+        Yields:
+            (任务, 下载结果)，按写入顺序产出；DownloadResult 的布尔值表示是否成功保存
+        """
+        pool = None
+        if self.convert_workers > 0 and self.stream_func is None:
+            # 调用方进程通常已有其他线程，fork 可能死锁，统一使用 spawn
+            pool = ProcessPoolExecutor(
+                max_workers=self.convert_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+        results: queue.Queue = queue.Queue(maxsize=self.convert_queue_size)
+        stop = threading.Event()
+        slots = _ConvertSlots(self.fetch_queue_size, stop) if pool is not None else None
+        localize_pool = None
+        if pool is not None and self._localizes:
+            localize_pool = ThreadPoolExecutor(
+                max_workers=self.io_workers, thread_name_prefix="wxmp-localize"
+            )
+        scheduler = _JobScheduler(jobs, stop)
+        policy = self.downloader.retry_policy
+
+        def put(item) -> None:
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def worker() -> None:
+            try:
+                while (task := scheduler.next()) is not None:
+                    job, attempt = task
+                    try:
+                        content = self._fetch_and_render(job, attempt, pool, slots)
+                    except Exception as e:
+                        delay = policy.retry_delay(e, attempt)
+                        if delay is not None:
+                            scheduler.retry(job, attempt + 1, delay)
+                            continue
+                        content = DownloadResult.from_error(
+                            e, attempt, policy.classify(e)
+                        )
+                    finally:
+                        scheduler.done()
+                    if localize_pool is not None and isinstance(content, Future):
+                        content = localize_pool.submit(
+                            self._localize_converted, content, job.save_path
+                        )
+                    put((job, attempt, content))
+            finally:
+                put(_WORKER_DONE)
+
+        threads = [
+            threading.Thread(target=worker, daemon=True) for _ in range(self.io_workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            running = len(threads)
+            while running:
+                item = results.get()
+                if item is _WORKER_DONE:
+                    running -= 1
+                    continue
+                job, attempts, content = item
+                result = self._write(job, attempts, content)
+                if self.journal is not None:
+                    self.journal.record(job.url, result, job.save_path)
+                yield job, result
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            if localize_pool is not None:
+                localize_pool.shutdown(cancel_futures=True)
+
+    @property
+    def _localizes(self) -> bool:
+        """写入前是否需要下载图片"""
+        return (
+            self.downloader.asset_downloader is not None
+            and self.downloader.save_format == "md"
+        )
+
+    def _fetch_and_render(
+        self,
+        job: ArticleJob,
+        attempt: int,
+        pool: ProcessPoolExecutor | None,
+        slots: _ConvertSlots | None = None,
+    ):
+        """
+        下载阶段：请求一次 HTML 并提交转换
+
+        Returns:
+            已完成的结果（文件已存在或流式下载）、转换结果、转换 Future 或转换异常；
+            等待转换名额时已停止则返回 None（此时结果不会再被写入）
+
+        Raises:
+            Exception: 请求失败，由调用方决定是否重试
+        """
+        if job.save_path.exists():
+            return self.downloader.existing(job.save_path)
+        if self.stream_func is not None:
+            return self.downloader.attempt_stream(
+                job.url, job.save_path, job.metadata, self.stream_func, attempt
+            )
+        if pool is None:
+            html = self.downloader.attempt_fetch(job.url, self.fetch_func)
+            try:
+                content = self.downloader.render(html, job.metadata)
+                return self.downloader.localize(content, job.save_path)
+            except Exception as e:
+                return e
+
+        if not slots.acquire():
+            return None
+        try:
+            html = self.downloader.attempt_fetch(job.url, self.fetch_func)
+        except Exception:
+            slots.release()
+            raise
+        try:
+            future = pool.submit(
+                render_article,
+                html,
+                job.metadata,
+                self.downloader.save_format,
+                self.downloader.converter,
+            )
+        except Exception as e:
+            slots.release()
+            return e
+        future.add_done_callback(slots.release)
+        return future
+
+    def _localize_converted(self, future: Future, save_path: Path) -> str:
+        """等待转换完成后下载图片，在 localize 线程池中执行"""
+        return self.downloader.localize(future.result(), save_path)
+
+    def _write(self, job: ArticleJob, attempts: int, content) -> DownloadResult:
+        """写入阶段：等待转换完成并保存"""
+        if isinstance(content, DownloadResult):
+            return content
+        if isinstance(content, Future):
+            try:
+                content = content.result()
+            except Exception as e:
+                content = e
+        if isinstance(content, Exception):
+            return DownloadResult.from_error(content, attempts)
+        return self.downloader.write_result(
+            content, job.save_path, attempts, localize=False
+        )
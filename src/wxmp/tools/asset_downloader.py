@@ -0,0 +1,216 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import parse_qs, urldefrag, urlparse
+
+import requests
+
+from ..api.rate_limit import RateLimiter, get_default_rate_limiter
+from ..api.session import get_content_session, random_user_agent
+
+# Markdown 图片链接中的远程地址
+_IMAGE_LINK_RE = re.compile(r"(!\[[^\]]*\]\()(https?://[^)\s]+)(\))")
+
+# Content-Type / wx_fmt 到扩展名的映射
+_EXTENSIONS = {
+    "image/jpeg": "jpg",
+    "image/jpg": "jpg",
+    "image/png": "png",
+    "image/gif": "gif",
+    "image/webp": "webp",
+    "image/svg+xml": "svg",
+    "image/bmp": "bmp",
+    "jpeg": "jpg",
+    "jpg": "jpg",
+    "png": "png",
+    "gif": "gif",
+    "webp": "webp",
+    "svg": "svg",
+    "bmp": "bmp",
+}
+
+
+class AssetDownloader:
+    """
+    图片等资源的本地化下载器
+
+    资源按内容的 SHA-256 命名保存在共享目录 asset_dir/{hash[:2]}/{hash}.{ext} 中，
+    不同文章、不同公众号引用的同一张图片只保存一份。URL 到文件的映射追加写入
+    asset_dir/index.jsonl，已下载过的 URL 不会再次请求。
+
+    Example:
+        >>> assets = AssetDownloader(Path("articles/assets"))
+        >>> downloader = ArticleDownloader(asset_downloader=assets)
+    """
+
+    INDEX_FILE = "index.jsonl"
+
+    def __init__(
+        self,
+        asset_dir: Path,
+        *,
+        max_workers: int = 8,
+        timeout: int = 30,
+        session: requests.Session | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        """
+        初始化资源下载器
+
+        Args:
+            asset_dir: 资源保存目录，可以在所有公众号之间共享
+            max_workers: 并发下载数
+            timeout: 请求超时时间（秒）
+            session: 下载使用的 Session，默认为共享的文章内容连接池
+            rate_limiter: 限流器，图片请求使用 asset 令牌桶，默认使用进程内共享的限流器
+        """
+        self.asset_dir = Path(asset_dir)
+        self.asset_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._session = session
+        self.rate_limiter = rate_limiter or get_default_rate_limiter()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="wxmp-asset"
+        )
+        self._lock = threading.Lock()
+        # URL -> 相对 asset_dir 的文件路径
+        self._index: dict[str, str] = self._load_index()
+        # 正在下载的 URL，避免并发重复下载
+        self._pending: dict[str, Future] = {}
+
+    @property
+    def index_path(self) -> Path:
+        return self.asset_dir / self.INDEX_FILE
+
+    def _load_index(self) -> dict[str, str]:
+        index: dict[str, str] = {}
+        if not self.index_path.exists():
+            return index
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # 进程中途退出时最后一行可能不完整
+                    continue
+                index[entry["url"]] = entry["path"]
+        return index
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """去掉 URL 中的片段（如 #imgIndex=0），http 统一为 https"""
+        url = urldefrag(url)[0]
+        if url.startswith("http://"):
+            url = "https://" + url[len("http://") :]
+        return url
+
+    def localize(self, markdown: str, save_path: Path) -> str:
+        """
+        下载 Markdown 中引用的远程图片，并将链接改写为本地相对路径
+
+        下载失败的图片保留原链接。
+
+        Args:
+            markdown: Markdown 内容
+            save_path: Markdown 文件的保存路径，用于计算相对路径
+
+        Returns:
+            改写链接后的 Markdown
+        """
+        urls = {m.group(2) for m in _IMAGE_LINK_RE.finditer(markdown)}
+        if not urls:
+            return markdown
+
+        futures = {url: self.fetch(url) for url in urls}
+        base_dir = Path(save_path).parent
+        local: dict[str, str] = {}
+        for url, future in futures.items():
+            try:
+                path = future.result()
+            except Exception:
+                continue
+            local[url] = Path(os.path.relpath(path, base_dir)).as_posix()
+
+        return _IMAGE_LINK_RE.sub(
+            lambda m: m.group(1) + local.get(m.group(2), m.group(2)) + m.group(3),
+            markdown,
+        )
+
+    def fetch(self, url: str) -> Future:
+        """
+        获取资源的本地路径，必要时在后台下载
+
+        Args:
+            url: 资源 URL
+
+        Returns:
+            结果为本地文件路径的 Future
+        """
+        key = self.normalize_url(url)
+        with self._lock:
+            relative = self._index.get(key)
+            if relative is not None and (self.asset_dir / relative).exists():
+                future: Future = Future()
+                future.set_result(self.asset_dir / relative)
+                return future
+            if key in self._pending:
+                return self._pending[key]
+            future = self._executor.submit(self._download, key)
+            self._pending[key] = future
+        future.add_done_callback(lambda _: self._pending.pop(key, None))
+        return future
+
+    def _download(self, url: str) -> Path:
+        """下载资源并按内容哈希保存"""
+        if self._session is None:
+            session = get_content_session()
+            headers = {"User-Agent": random_user_agent()}
+        else:
+            session, headers = self._session, {}
+        self.rate_limiter.acquire("asset")
+        response = session.get(url, headers=headers, timeout=self.timeout)
+        self.rate_limiter.report_status("asset", response.status_code)
+        response.raise_for_status()
+        data = response.content
+
+        digest = hashlib.sha256(data).hexdigest()
+        ext = self._guess_extension(url, response.headers.get("Content-Type", ""))
+        relative = f"{digest[:2]}/{digest}.{ext}" if ext else f"{digest[:2]}/{digest}"
+        path = self.asset_dir / relative
+        # 同样内容的文件已存在时不再写入
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            tmp_path.replace(path)
+
+        with self._lock:
+            self._index[url] = relative
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"url": url, "path": relative, "size": len(data)}) + "\n")
+        return path
+
+    @staticmethod
+    def _guess_extension(url: str, content_type: str) -> str:
+        ext = _EXTENSIONS.get(content_type.split(";")[0].strip().lower())
+        if ext:
+            return ext
+        wx_fmt = parse_qs(urlparse(url).query).get("wx_fmt")
+        if wx_fmt:
+            return _EXTENSIONS.get(wx_fmt[0].lower(), "")
+        return ""
+
+    def close(self) -> None:
+        """等待正在进行的下载完成并释放线程池"""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "AssetDownloader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,171 @@
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple
+
+from .article_downloader import DownloadResult
+from .article_pipeline import ArticleJob
+from .retry import PERMANENT, SKIPPED as _SKIPPED_KIND
+
+# 记录状态
+DONE = "done"
+FAILED = "failed"
+#: 永久错误（如 404），不再重试
+DEAD = "dead"
+#: 本次运行无法处理（如离线缓存未命中），下次运行视为未下载
+SKIPPED = "skipped"
+
+
+class JournalEntry(NamedTuple):
+    """一篇文章最近一次的下载记录"""
+
+    url: str
+    status: str
+    #: 累计请求次数（跨多次运行）
+    attempts: int = 0
+    error: str = ""
+    size: int = 0
+    path: str = ""
+    time: float = 0.0
+
+
+class DownloadJournal:
+    """
+    文章下载日志
+
+    每篇文章下载结束后向 JSONL 文件追加一行 {url, status, attempts, error, size, path, time}，
+    同一 URL 以最后一行为准。重新运行时先按日志过滤任务，已完成的文章不需要再检查文件，
+    恢复下载的开销只与剩余的文章数有关；retry_failed_only 只重试失败过的文章。
+    因永久错误（RetryPolicy 判断为 permanent，如文章已删除）失败的文章记录为 dead，不再重试；
+    离线缓存未命中的文章记录为 skipped，下次运行（如联网后）按未下载处理。
+
+    进程中途退出时最后一行可能不完整，加载时会被忽略。过期的行超过一半时，
+    加载后自动压缩为每个 URL 一行。
+
+    Example:
+        >>> journal = DownloadJournal(Path("articles/download_journal.jsonl"))
+        >>> pipeline = ArticlePipeline(downloader, fetch_func, journal=journal)
+        >>> for job, result in pipeline.run(journal.pending(jobs)):
+        ...     pass
+    """
+
+    def __init__(self, path: Path, *, compact: bool = True):
+        """
+        初始化下载日志
+
+        Args:
+            path: 日志文件路径，不存在时自动创建
+            compact: 加载时是否压缩过期的记录
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._entries: dict[str, JournalEntry] = {}
+        lines = self._load()
+        if compact and lines > 2 * len(self._entries):
+            self.compact()
+
+    def _load(self) -> int:
+        """读取日志，返回行数"""
+        if not self.path.exists():
+            return 0
+        lines = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                lines += 1
+                try:
+                    entry = JournalEntry(**json.loads(line))
+                except (json.JSONDecodeError, TypeError):
+                    continue
+                self._entries[entry.url] = entry
+        return lines
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._entries
+
+    def get(self, url: str) -> JournalEntry | None:
+        """URL 最近一次的记录"""
+        return self._entries.get(url)
+
+    def urls(self, *statuses: str) -> set[str]:
+        """最近一次记录为指定状态之一的 URL"""
+        return {url for url, entry in self._entries.items() if entry.status in statuses}
+
+    def record(
+        self, url: str, result: DownloadResult, save_path: Path | None = None
+    ) -> JournalEntry:
+        """
+        追加一条下载结果
+
+        Args:
+            url: 文章 URL
+            result: ArticleDownloader / ArticlePipeline 返回的结果
+            save_path: 保存路径
+
+        Returns:
+            写入的记录，attempts 为累计请求次数
+        """
+        with self._lock:
+            previous = self._entries.get(url)
+            if result.ok:
+                status = DONE
+            elif result.error_kind == PERMANENT:
+                status = DEAD
+            elif result.error_kind == _SKIPPED_KIND:
+                status = SKIPPED
+            else:
+                status = FAILED
+            entry = JournalEntry(
+                url=url,
+                status=status,
+                attempts=(previous.attempts if previous else 0) + result.attempts,
+                error=result.error,
+                size=result.size,
+                path=str(save_path) if save_path is not None else "",
+                time=round(time.time(), 3),
+            )
+            self._entries[url] = entry
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry._asdict(), ensure_ascii=False) + "\n")
+        return entry
+
+    def pending(
+        self,
+        jobs: Iterable[ArticleJob],
+        *,
+        retry_failed_only: bool = False,
+        max_attempts: int | None = None,
+    ) -> Iterator[ArticleJob]:
+        """
+        过滤出还需要下载的任务
+
+        Args:
+            jobs: 全部任务，可以是惰性生成器
+            retry_failed_only: 只保留日志中记录为失败的任务
+            max_attempts: 累计请求次数达到该值的失败任务视为失效链接，不再重试
+
+        Yields:
+            未完成且不是 dead 的任务
+        """
+        for job in jobs:
+            entry = self._entries.get(job.url)
+            if entry is None or entry.status == SKIPPED:
+                if not retry_failed_only:
+                    yield job
+            elif entry.status == FAILED and (
+                max_attempts is None or entry.attempts < max_attempts
+            ):
+                yield job
+
+    def compact(self) -> None:
+        """重写日志文件，每个 URL 只保留最后一条记录"""
+        with self._lock:
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for entry in self._entries.values():
+                    f.write(json.dumps(entry._asdict(), ensure_ascii=False) + "\n")
+            tmp_path.replace(self.path)
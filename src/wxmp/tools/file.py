@@ -1,8 +1,17 @@
 import json
+import os
 import re
+import threading
 from pathlib import Path
 from typing import Union
 
+import pandas as pd
+
+# Windows 不允许的字符: \ / : * ? " < > |
+_ILLEGAL_CHARS = r'[\\/:*?"<>|]'
+# 控制字符
+_CONTROL_CHARS = r"[\x00-\x1f]"
+
 
 def sanitize_filename(filename: str, max_length: int = 200) -> str:
     """
@@ -15,11 +24,8 @@ def sanitize_filename(filename: str, max_length: int = 200) -> str:
     Returns:
         清理后的合法文件名
     """
-    # Windows 不允许的字符: \ / : * ? " < > |
-    illegal_chars = r'[\\/:*?"<>|]'
-
     # 移除非法字符
-    filename = re.sub(illegal_chars, "_", filename)
+    filename = re.sub(_ILLEGAL_CHARS, "_", filename)
 
     # 移除控制字符
     filename = "".join(char for char in filename if ord(char) >= 32)
@@ -38,6 +44,28 @@ def sanitize_filename(filename: str, max_length: int = 200) -> str:
     return filename
 
 
+def sanitize_filenames(filenames: pd.Series, max_length: int = 200) -> pd.Series:
+    """
+    批量清理文件名，结果与逐个调用 sanitize_filename 相同
+
+    Args:
+        filenames: 原始文件名，缺失值视为空字符串
+        max_length: 最大文件名长度
+
+    Returns:
+        清理后的文件名，索引不变
+    """
+    cleaned = (
+        filenames.fillna("")
+        .astype(str)
+        .str.replace(_ILLEGAL_CHARS, "_", regex=True)
+        .str.replace(_CONTROL_CHARS, "", regex=True)
+        .str.strip(". ")
+        .str.slice(0, max_length)
+    )
+    return cleaned.mask(cleaned == "", "untitled")
+
+
 def load_json(file_path: Union[str, Path]) -> dict:
     file_path = Path(file_path)
     with open(file_path, "r", encoding="utf-8") as f:
@@ -84,3 +112,49 @@ def save_markdown(markdown: str, file_path: Union[str, Path]):
     file_path = Path(file_path)
     with open(file_path, "w", encoding="utf-8") as f:
         f.write(markdown)
+
+
+def temp_path(file_path: Union[str, Path], suffix: str = ".tmp") -> Path:
+    """
+    目标文件同目录下的临时文件路径
+
+    文件名包含进程号和线程号，多个进程或线程同时写同一个目标文件时互不覆盖。
+
+    Args:
+        file_path: 目标文件路径
+        suffix: 临时文件后缀
+
+    Returns:
+        临时文件路径，重命名为目标文件时在同一文件系统内
+    """
+    file_path = Path(file_path)
+    return file_path.with_name(
+        f".{file_path.name}.{os.getpid()}.{threading.get_ident()}{suffix}"
+    )
+
+
+def atomic_write(data: Union[str, bytes], file_path: Union[str, Path]) -> int:
+    """
+    原子写入文件
+
+    先写入同目录下的临时文件再重命名为目标文件，进程中途退出不会留下写了一半的文件，
+    读取方只会看到完整的旧文件或新文件。
+
+    Args:
+        data: 文件内容，str 按 UTF-8 编码
+        file_path: 目标文件路径
+
+    Returns:
+        写入的字节数
+    """
+    file_path = Path(file_path)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    tmp_path = temp_path(file_path)
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        tmp_path.replace(file_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return len(data)
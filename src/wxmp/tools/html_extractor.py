@@ -0,0 +1,188 @@
+import html as html_lib
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+
+# 一次扫描需要关注的内容：div/meta/body 标签 | 发布时间变量（var ct = "1700000000"）
+# 两个分支分别以 "<" 和 "var" 开头，正则引擎可以快速跳过无关字符，因此不使用 IGNORECASE
+_SCAN_RE = re.compile(
+    r"<(/?)(div|meta|body|DIV|META|BODY)\b([^>]*)>"
+    r"|var\s+(?:ct|create_time)\s*=\s*[\"'](\d{9,11})[\"']"
+)
+_CONTENT_ID_RE = re.compile(r"""\bid\s*=\s*["']?js_content\b""", re.IGNORECASE)
+_ATTR_RE = re.compile(r"""([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""")
+
+# 分块输入时保留在缓冲区末尾的字符数，保证发布时间变量不会被切断
+_TAIL_SIZE = 64
+
+# 提取状态
+_BEFORE, _INSIDE, _AFTER = range(3)
+
+
+@dataclass
+class ExtractedArticle:
+    """从文章页面提取的内容"""
+
+    content: str = ""
+    title: str = ""
+    author: str = ""
+    publish_time: datetime | None = None
+    #: 是否找到 js_content，未找到时 content 为 body 内容
+    found: bool = False
+
+
+def _parse_attrs(attrs: str) -> dict[str, str]:
+    """解析标签属性"""
+    return {
+        m.group(1).lower(): html_lib.unescape(m.group(2) or m.group(3) or m.group(4) or "")
+        for m in _ATTR_RE.finditer(attrs)
+    }
+
+
+class ContentExtractor:
+    """
+    文章正文提取器
+
+    线性扫描一次页面：找到 id="js_content" 的 div 后按 div 嵌套深度找到匹配的结束标签，
+    同时提取 og:title、作者和发布时间。支持分块 feed，正文片段可以直接交给 sink，
+    不需要缓存整个页面。
+
+    Example:
+        >>> extractor = ContentExtractor()
+        >>> extractor.feed(html)
+        >>> article = extractor.close()
+        >>> article.title, article.content
+    """
+
+    def __init__(self, sink: Callable[[str], object] | None = None):
+        """
+        Args:
+            sink: 接收正文 HTML 片段的函数，None 表示收集到 ExtractedArticle.content
+        """
+        self._parts: list[str] = []
+        self._sink = sink or self._parts.append
+        self._buffer = ""
+        self._state = _BEFORE
+        self._depth = 0
+        # 未找到 js_content 时的备用内容（body）
+        self._body: list[str] | None = None
+        self._body_closed = False
+        self._article = ExtractedArticle()
+
+    @property
+    def found(self) -> bool:
+        """是否已找到 js_content"""
+        return self._state != _BEFORE
+
+    @property
+    def article(self) -> ExtractedArticle:
+        """目前为止提取到的信息（close 之前 content 为空）"""
+        return self._article
+
+    def feed(self, chunk: str) -> None:
+        """输入一段 HTML"""
+        data = self._buffer + chunk if self._buffer else chunk
+        end = max(0, len(data) - _TAIL_SIZE)
+        # 不能从标签中间切开
+        lt = data.rfind("<", 0, end)
+        if lt > data.rfind(">", 0, end):
+            end = lt
+        self._buffer = data[end:]
+        self._scan(data, end)
+
+    def close(self) -> ExtractedArticle:
+        """
+        输入结束
+
+        Returns:
+            提取结果；使用 sink 时 content 为空
+        """
+        if self._buffer:
+            self._scan(self._buffer, len(self._buffer))
+            self._buffer = ""
+        if self._state == _BEFORE and self._body:
+            for part in self._body:
+                self._sink(part)
+        self._body = None
+        self._article.content = "".join(self._parts)
+        self._article.found = self._state != _BEFORE
+        return self._article
+
+    def _scan(self, data: str, end: int) -> None:
+        """扫描 data[:end]，处理完的内容不再保留"""
+        article = self._article
+        pos = 0
+        if self._state == _AFTER and article.title and article.publish_time:
+            return
+
+        # end 不会落在标签中间；发布时间变量可能跨过 end，因此扫描到 data 末尾
+        for m in _SCAN_RE.finditer(data):
+            if m.start() >= end:
+                break
+            if m.group(4):
+                if article.publish_time is None:
+                    article.publish_time = datetime.fromtimestamp(int(m.group(4)))
+                continue
+
+            closing, tag, attrs = m.group(1), m.group(2).lower(), m.group(3)
+            if self._state == _INSIDE:
+                if tag != "div":
+                    continue
+                if closing:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self._sink(data[pos : m.start()])
+                        self._state = _AFTER
+                elif not attrs.endswith("/"):
+                    self._depth += 1
+            elif tag == "meta":
+                self._handle_meta(attrs)
+            elif self._state == _BEFORE:
+                if tag == "div" and not closing and _CONTENT_ID_RE.search(attrs):
+                    self._state = _INSIDE
+                    self._depth = 1
+                    self._body = None
+                    pos = m.end()
+                elif tag == "body" and self._body is not None and closing:
+                    self._body.append(data[pos : m.start()])
+                    self._body_closed = True
+                elif tag == "body" and not closing:
+                    self._body = []
+                    self._body_closed = False
+                    pos = m.end()
+
+        if self._state == _INSIDE:
+            self._sink(data[pos:end])
+        elif self._state == _BEFORE and self._body is not None and not self._body_closed:
+            self._body.append(data[pos:end])
+
+    def _handle_meta(self, attrs: str) -> None:
+        attr = _parse_attrs(attrs)
+        key = attr.get("property") or attr.get("name")
+        content = attr.get("content", "")
+        if not content:
+            return
+        if key == "og:title" and not self._article.title:
+            self._article.title = content
+        elif key in ("author", "og:article:author") and not self._article.author:
+            self._article.author = content
+
+
+def extract_article(html: str) -> ExtractedArticle:
+    """
+    提取文章正文和元数据
+
+    Args:
+        html: 文章页面 HTML
+
+    Returns:
+        ExtractedArticle；未找到 js_content 时 content 为 body 内容，
+        没有 body 时为整个页面
+    """
+    extractor = ContentExtractor()
+    extractor.feed(html)
+    article = extractor.close()
+    if not article.found and not article.content:
+        article.content = html
+    return article
@@ -0,0 +1,445 @@
+import codecs
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Iterator
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from ..api.index import WxMPAPI
+from ..api.rate_limit import RateLimiter
+from .file import atomic_write, temp_path
+from .retry import INTERSTITIAL_PEEK_SIZE, CacheMissError, interstitial_kind
+from .size_parser import parse_file_size
+
+# 微信文章链接中唯一确定一篇文章的参数，其余参数（chksm、scene 等）在归一化时去掉
+_ARTICLE_PARAMS = ("__biz", "mid", "idx", "sn")
+
+# 读取缓存文件的块大小
+_READ_SIZE = 64 * 1024
+
+
+class HTMLCache:
+    """
+    文章页面 HTML 的本地缓存
+
+    以归一化后的 URL 为键，HTML 经 zlib 压缩后保存在 cache_dir/{key[:2]}/{key}.html.z，
+    SQLite 索引（cache_dir/index.db）记录 ETag、Last-Modified、大小和最近访问时间。
+    总大小超过 max_size 时按最近访问时间淘汰（LRU）。
+
+    fetch / stream 的签名与 WxMPAPI.fetch_article_content / stream_article_content 相同，
+    可以直接作为 ArticleDownloader 的 fetch_func / stream_func：
+
+    - 默认命中缓存时不访问网络，重新渲染已下载的文章完全在本地完成
+    - revalidate=True 时携带 If-None-Match / If-Modified-Since 请求，304 时使用缓存
+    - offline=True 时从不访问网络，未命中抛出 CacheMissError
+
+    访问频繁、环境异常验证、文章已删除等提示页（见 interstitial_kind）不写入缓存；
+    读取到已缓存的提示页时删除该条目，按未命中处理。
+
+    Example:
+        >>> cache = HTMLCache(Path("temp/html_cache"), max_size="5GB")
+        >>> html = cache.fetch(url)
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_size: str = "2GB",
+        *,
+        revalidate: bool = False,
+        offline: bool = False,
+        compress_level: int = 6,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 缓存目录
+            max_size: 缓存总大小上限（压缩后，支持单位：B, KB, MB, GB）
+            revalidate: 命中缓存时是否向服务器发送条件请求确认页面未变化
+            offline: 离线模式，只使用缓存
+            compress_level: zlib 压缩级别
+            rate_limiter: 访问网络时使用的限流器，默认使用进程内共享的限流器
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size = parse_file_size(max_size)
+        self.revalidate = revalidate
+        self.offline = offline
+        self.compress_level = compress_level
+        # 文章页面不需要登录，只使用 WxMPAPI 的文章请求方法和限流器
+        self._api = WxMPAPI({}, rate_limiter)
+        self._local = threading.local()
+        # 保护 _total 和淘汰过程
+        self._size_lock = threading.Lock()
+        # 条目总大小，写入和删除时增量更新，不必每次写入都统计全表
+        self._total = self._sum_size()
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """访问网络时使用的限流器"""
+        return self._api.rate_limiter
+
+    @rate_limiter.setter
+    def rate_limiter(self, rate_limiter: RateLimiter) -> None:
+        self._api.rate_limiter = rate_limiter
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """
+        归一化文章 URL
+
+        http 统一为 https，去掉片段；包含 __biz/mid/idx/sn 的链接只保留这几个参数，
+        其他链接按参数名排序。
+        """
+        parts = urlsplit(url.strip())
+        params = parse_qsl(parts.query, keep_blank_values=True)
+        names = {name for name, _ in params}
+        if all(name in names for name in _ARTICLE_PARAMS):
+            params = [(name, value) for name, value in params if name in _ARTICLE_PARAMS]
+        query = urlencode(sorted(params))
+        return urlunsplit(("https", parts.netloc.lower(), parts.path, query, ""))
+
+    @classmethod
+    def key(cls, url: str) -> str:
+        """缓存键（归一化 URL 的 SHA-256）"""
+        return hashlib.sha256(cls.normalize_url(url).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.html.z"
+
+    def _connect(self) -> sqlite3.Connection:
+        """获取当前线程的索引连接"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.cache_dir / "index.db", timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                conn.executescript(
+                    """
+                    CREATE TABLE IF NOT EXISTS entries (
+                        key TEXT PRIMARY KEY,
+                        url TEXT NOT NULL,
+                        etag TEXT,
+                        last_modified TEXT,
+                        size INTEGER NOT NULL,
+                        created REAL NOT NULL,
+                        accessed REAL NOT NULL
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed);
+                    """
+                )
+            self._local.conn = conn
+        return conn
+
+    def _lookup(self, key: str) -> tuple[str | None, str | None] | None:
+        """返回 (etag, last_modified)，缓存文件不存在时返回 None"""
+        row = (
+            self._connect()
+            .execute("SELECT etag, last_modified FROM entries WHERE key = ?", (key,))
+            .fetchone()
+        )
+        if row is None or not self._path(key).exists():
+            return None
+        return row
+
+    def _touch(self, key: str) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+
+    def __contains__(self, url: str) -> bool:
+        return self._lookup(self.key(url)) is not None
+
+    def get(self, url: str) -> str | None:
+        """
+        读取缓存的 HTML
+
+        Args:
+            url: 文章 URL
+
+        Returns:
+            HTML 内容，未命中或缓存的是提示页时返回 None
+        """
+        key = self.key(url)
+        if self._lookup(key) is None:
+            return None
+        try:
+            html = zlib.decompress(self._path(key).read_bytes()).decode("utf-8")
+        except (OSError, zlib.error):
+            return None
+        if interstitial_kind(html) is not None:
+            self.evict(url)
+            return None
+        self._touch(key)
+        return html
+
+    def put(
+        self,
+        url: str,
+        html: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> bool:
+        """
+        写入缓存，提示页不写入
+
+        Args:
+            url: 文章 URL
+            html: HTML 内容
+            etag: 响应头 ETag
+            last_modified: 响应头 Last-Modified
+
+        Returns:
+            是否写入
+        """
+        if interstitial_kind(html) is not None:
+            return False
+        key = self.key(url)
+        data = zlib.compress(html.encode("utf-8"), self.compress_level)
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(data, path)
+        self._commit(key, url, etag, last_modified, len(data))
+        return True
+
+    def evict(self, url: str) -> None:
+        """删除缓存的页面"""
+        key = self.key(url)
+        conn = self._connect()
+        with self._size_lock, conn:
+            row = conn.execute(
+                "SELECT size FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            if row is not None:
+                self._total -= row[0]
+        self._path(key).unlink(missing_ok=True)
+
+    def _commit(
+        self,
+        key: str,
+        url: str,
+        etag: str | None,
+        last_modified: str | None,
+        size: int,
+    ) -> None:
+        now = time.time()
+        conn = self._connect()
+        with self._size_lock, conn:
+            row = conn.execute(
+                "SELECT size FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(key, url, etag, last_modified, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, self.normalize_url(url), etag, last_modified, size, now, now),
+            )
+            self._total += size - (row[0] if row is not None else 0)
+        self._evict()
+
+    def _evict(self) -> None:
+        """总大小超过上限时，按最近访问时间删除最旧的条目"""
+        with self._size_lock:
+            if self._total <= self.max_size:
+                return
+            conn = self._connect()
+            # 其他进程可能也在使用同一个缓存目录，淘汰前重新统计实际大小
+            total = self._sum_size()
+            # 一次淘汰到上限的 90%，避免每次写入都触发淘汰
+            target = self.max_size * 0.9
+            victims = []
+            for key, size in conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed"
+            ):
+                if total <= target:
+                    break
+                victims.append(key)
+                total -= size
+            with conn:
+                conn.executemany(
+                    "DELETE FROM entries WHERE key = ?", [(key,) for key in victims]
+                )
+            for key in victims:
+                self._path(key).unlink(missing_ok=True)
+            self._total = total
+
+    def _sum_size(self) -> int:
+        return self._connect().execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+
+    def size(self) -> int:
+        """缓存的总大小（字节）"""
+        return self._sum_size()
+
+    def _conditional_headers(self, key: str) -> dict[str, str] | None:
+        """
+        判断是否需要访问网络
+
+        Returns:
+            None 表示直接使用缓存；否则为请求头（命中缓存时包含条件请求头）
+        """
+        entry = self._lookup(key)
+        if entry is not None and (self.offline or not self.revalidate):
+            return None
+        if entry is None and self.offline:
+            raise CacheMissError("离线模式下缓存未命中")
+        headers: dict[str, str] = {}
+        if entry is not None:
+            etag, last_modified = entry
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def fetch(self, url: str, timeout: int = 10) -> str:
+        """
+        获取文章 HTML，优先使用缓存
+
+        Args:
+            url: 文章 URL
+            timeout: 请求超时时间（秒）
+
+        Returns:
+            HTML 内容
+
+        Raises:
+            CacheMissError: 离线模式下缓存未命中
+        """
+        key = self.key(url)
+        headers = self._conditional_headers(key)
+        if headers is not None:
+            html = self._download(url, timeout, headers)
+            if html is not None:
+                return html
+
+        html = self.get(url)
+        if html is None:
+            # 缓存文件在检查后被淘汰，或缓存的是提示页，重新下载
+            if self.offline:
+                raise CacheMissError("离线模式下缓存未命中")
+            html = self._download(url, timeout, {})
+        return html
+
+    def _download(self, url: str, timeout: int, headers: dict[str, str]) -> str | None:
+        """请求页面并写入缓存，304 时返回 None"""
+        response = self._api.fetch_article_response(url, timeout, headers=headers)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        html = response.text
+        self.put(
+            url,
+            html,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+        return html
+
+    def stream(
+        self, url: str, timeout: int = 10, chunk_size: int = _READ_SIZE
+    ) -> Iterator[str]:
+        """
+        流式获取文章 HTML，优先使用缓存
+
+        命中时边解压边产出；未命中时边下载边产出，同时压缩写入缓存，
+        内存占用只与块大小有关。
+
+        Args:
+            url: 文章 URL
+            timeout: 请求超时时间（秒）
+            chunk_size: 每次读取的字节数
+
+        Yields:
+            HTML 片段
+
+        Raises:
+            CacheMissError: 离线模式下缓存未命中
+        """
+        key = self.key(url)
+        headers = self._conditional_headers(key)
+        if headers is not None:
+            with self._api.fetch_article_response(
+                url, timeout, headers=headers, stream=True
+            ) as response:
+                if response.status_code != 304:
+                    response.raise_for_status()
+                    yield from self._tee(url, key, response, chunk_size)
+                    return
+
+        chunks = self._read(key, chunk_size)
+        head: list[str] = []
+        size = 0
+        for text in chunks:
+            head.append(text)
+            size += len(text)
+            if size >= INTERSTITIAL_PEEK_SIZE:
+                break
+        else:
+            if interstitial_kind("".join(head)) is not None:
+                # 缓存的是提示页，删除后重新获取
+                self.evict(url)
+                yield from self.stream(url, timeout, chunk_size)
+                return
+        yield from head
+        yield from chunks
+        self._touch(key)
+
+    def _read(self, key: str, chunk_size: int) -> Iterator[str]:
+        """边解压边产出缓存的 HTML"""
+        decompressor = zlib.decompressobj()
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        with open(self._path(key), "rb") as f:
+            while block := f.read(chunk_size):
+                text = decoder.decode(decompressor.decompress(block))
+                if text:
+                    yield text
+        tail = decoder.decode(decompressor.flush(), final=True)
+        if tail:
+            yield tail
+
+    def _tee(self, url: str, key: str, response, chunk_size: int) -> Iterator[str]:
+        """产出响应内容的同时压缩写入缓存，完整读取后才提交，提示页不提交"""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = temp_path(path)
+        compressor = zlib.compressobj(self.compress_level)
+        size = 0
+        # 页面开头，用于识别提示页
+        head: list[str] = []
+        length = 0
+        try:
+            with open(tmp_path, "wb") as f:
+                for text in WxMPAPI.iter_response_text(response, chunk_size):
+                    if length < INTERSTITIAL_PEEK_SIZE:
+                        head.append(text)
+                    length += len(text)
+                    data = compressor.compress(text.encode("utf-8"))
+                    f.write(data)
+                    size += len(data)
+                    yield text
+                data = compressor.flush()
+                f.write(data)
+                size += len(data)
+            if length < INTERSTITIAL_PEEK_SIZE and interstitial_kind("".join(head)):
+                return
+            tmp_path.replace(path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        self._commit(
+            key,
+            url,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            size,
+        )
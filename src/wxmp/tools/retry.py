@@ -0,0 +1,266 @@
+import random
+import socket
+import threading
+from typing import Literal
+
+import requests
+
+from ..api.rate_limit import FrequencyControlError
+
+#: 错误类别
+ErrorKind = Literal[
+    "permanent", "timeout", "connection", "throttle", "skipped", "other"
+]
+PERMANENT: ErrorKind = "permanent"
+TIMEOUT: ErrorKind = "timeout"
+CONNECTION: ErrorKind = "connection"
+THROTTLE: ErrorKind = "throttle"
+#: 本次运行无法处理（如离线缓存未命中），不重试，但换个条件（联网）可能成功
+SKIPPED: ErrorKind = "skipped"
+OTHER: ErrorKind = "other"
+
+# 重试也不会成功的 HTTP 状态码（文章被删除、无权限等）
+PERMANENT_STATUSES = frozenset({400, 401, 403, 404, 405, 410, 451})
+
+# 流式读取时用于识别提示页的页面开头长度，提示页都远小于该值
+INTERSTITIAL_PEEK_SIZE = 64 * 1024
+
+# 文章页面被限流或要求验证时的提示文字
+_THROTTLE_MARKERS = (
+    "访问过于频繁",
+    "操作过于频繁",
+    "操作频繁",
+    "环境异常",
+    "完成验证后即可继续访问",
+)
+# 文章已不可访问时的提示文字
+_UNAVAILABLE_MARKERS = (
+    "该内容已被发布者删除",
+    "此内容因违规无法查看",
+    "此内容被投诉且经审核涉嫌侵权",
+    "该公众号已迁移",
+)
+
+
+class ThrottledError(Exception):
+    """文章页面返回了访问频繁或环境异常验证的提示页"""
+
+    pass
+
+
+class ArticleUnavailableError(Exception):
+    """文章已被删除或因违规无法查看，重试也不会成功"""
+
+    pass
+
+
+class CacheMissError(LookupError):
+    """离线模式下请求的页面不在缓存中"""
+
+    pass
+
+
+def interstitial_kind(html: str) -> ErrorKind | None:
+    """
+    判断页面是否为微信的提示页
+
+    提示页没有正文（js_content），只在这种情况下查找提示文字。
+
+    Args:
+        html: 文章页面 HTML
+
+    Returns:
+        删除、违规等提示页返回 PERMANENT；访问频繁、环境异常验证页返回 THROTTLE；
+        正常页面返回 None
+    """
+    if "js_content" in html:
+        return None
+    if any(marker in html for marker in _UNAVAILABLE_MARKERS):
+        return PERMANENT
+    if any(marker in html for marker in _THROTTLE_MARKERS):
+        return THROTTLE
+    return None
+
+
+def is_throttle_page(html: str) -> bool:
+    """判断页面是否为访问频繁或环境异常验证的提示页"""
+    return interstitial_kind(html) == THROTTLE
+
+
+class RetryBudget:
+    """
+    全局重试预算（线程安全）
+
+    多个下载线程共享同一个预算，重试次数不超过 min_retries + ratio * 请求数。
+    服务端整体不可用时，所有线程的重试很快耗尽预算，不会把请求量放大为
+    max_attempts 倍。
+
+    Example:
+        >>> budget = RetryBudget(ratio=0.1)
+        >>> policy = RetryPolicy(budget=budget)
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10):
+        """
+        初始化重试预算
+
+        Args:
+            ratio: 每次请求增加的可重试次数
+            min_retries: 不依赖请求数的基础重试次数
+        """
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self._requests = 0
+        self._retries = 0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> int:
+        """当前剩余的重试次数"""
+        with self._lock:
+            return self._remaining()
+
+    def _remaining(self) -> int:
+        return int(self.min_retries + self.ratio * self._requests) - self._retries
+
+    def record_request(self) -> None:
+        """记录一次请求"""
+        with self._lock:
+            self._requests += 1
+
+    def try_acquire(self) -> bool:
+        """
+        申请一次重试
+
+        Returns:
+            预算是否足够，足够时扣除一次
+        """
+        with self._lock:
+            if self._remaining() <= 0:
+                return False
+            self._retries += 1
+            return True
+
+
+class RetryPolicy:
+    """
+    重试策略
+
+    按异常类型分类：永久错误（404 等 HTTP 状态码、文章已删除）和离线缓存未命中不重试；
+    超时、连接错误和其他错误按指数退避加随机抖动（full jitter）重试；
+    访问频繁（429、提示页、频率限制）至少等待 throttle_delay 秒。
+
+    retry_delay 只计算等待时间，不会阻塞，ArticlePipeline 据此把任务放回队列延后执行，
+    下载线程可以先处理其他文章。
+
+    Example:
+        >>> policy = RetryPolicy(max_attempts=5, base_delay=0.5, budget=RetryBudget())
+        >>> downloader = ArticleDownloader(retry_policy=policy)
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        multiplier: float = 2.0,
+        jitter: bool = True,
+        throttle_delay: float = 30.0,
+        retry_on: frozenset[ErrorKind] = frozenset({TIMEOUT, CONNECTION, THROTTLE, OTHER}),
+        permanent_statuses: frozenset[int] = PERMANENT_STATUSES,
+        budget: RetryBudget | None = None,
+    ):
+        """
+        初始化重试策略
+
+        Args:
+            max_attempts: 每篇文章的最大请求次数（包括第一次）
+            base_delay: 第一次重试前的基础等待时间（秒）
+            max_delay: 最长等待时间（秒）
+            multiplier: 每次重试等待时间的倍数
+            jitter: 是否在 [0, 退避时间] 内随机取值，避免多个线程同时重试
+            throttle_delay: 访问频繁时的最短等待时间（秒）
+            retry_on: 需要重试的错误类别
+            permanent_statuses: 视为永久错误的 HTTP 状态码
+            budget: 全局重试预算，None 表示不限制
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.throttle_delay = throttle_delay
+        self.retry_on = retry_on
+        self.permanent_statuses = permanent_statuses
+        self.budget = budget
+
+    def classify(self, error: BaseException) -> ErrorKind:
+        """
+        判断异常的类别
+
+        Args:
+            error: 请求或处理过程中的异常
+
+        Returns:
+            错误类别
+        """
+        if isinstance(error, (ThrottledError, FrequencyControlError)):
+            return THROTTLE
+        if isinstance(error, ArticleUnavailableError):
+            return PERMANENT
+        if isinstance(error, CacheMissError):
+            return SKIPPED
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            status = error.response.status_code
+            if status == 429:
+                return THROTTLE
+            if status in self.permanent_statuses:
+                return PERMANENT
+            return OTHER
+        # ConnectTimeout 同时是 ConnectionError，先判断超时
+        if isinstance(error, (requests.Timeout, TimeoutError, socket.timeout)):
+            return TIMEOUT
+        if isinstance(error, (requests.ConnectionError, ConnectionError)):
+            return CONNECTION
+        return OTHER
+
+    def backoff(self, attempt: int, kind: ErrorKind = OTHER) -> float:
+        """
+        第 attempt 次请求失败后的等待时间
+
+        Args:
+            attempt: 已请求的次数（从 1 开始）
+            kind: 错误类别
+
+        Returns:
+            等待时间（秒）
+        """
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if kind == THROTTLE:
+            delay = max(delay, self.throttle_delay)
+        return delay
+
+    def record_request(self) -> None:
+        """每次请求前调用，用于累计重试预算"""
+        if self.budget is not None:
+            self.budget.record_request()
+
+    def retry_delay(self, error: BaseException, attempt: int) -> float | None:
+        """
+        判断第 attempt 次请求失败后是否重试
+
+        Args:
+            error: 失败的异常
+            attempt: 已请求的次数（从 1 开始）
+
+        Returns:
+            重试前需要等待的秒数，不重试时返回 None
+        """
+        kind = self.classify(error)
+        if kind not in self.retry_on or attempt >= self.max_attempts:
+            return None
+        if self.budget is not None and not self.budget.try_acquire():
+            return None
+        return self.backoff(attempt, kind)
@@ -10,7 +10,7 @@ from loguru import logger
 from pydantic import BaseModel, field_serializer
 from tqdm import tqdm
 
-from wxmp.tools.file import load_json, save_json
+from wxmp.tools.time_storage import CSVStorage, TimeStorage
 
 
 class TimeRange(BaseModel):
@@ -22,7 +22,8 @@ class TimeRange(BaseModel):
     @field_serializer("begin", "end")
     def serialize_datetime(self, dt: datetime) -> str:
         """将 datetime 对象序列化为 YYYY-MM-DD 格式字符串"""
-        return dt.strftime("%Y-%m-%d")
+        # 不用 strftime：部分平台上 datetime.min 会被格式化为 1-01-01，无法再解析
+        return dt.date().isoformat()
 
     # 包含 begin 和 end 时间，支持 datetime 和 TimeRange 对象
     def __contains__(self, dt: datetime | "TimeRange") -> bool:
@@ -31,10 +32,102 @@ class TimeRange(BaseModel):
         return self.begin <= dt <= self.end
 
 
+class TimeCoverage(BaseModel):
+    """已获取的时间范围集合，保存为按时间排序、互不重叠的区间列表"""
+
+    ranges: list[TimeRange] = []
+
+    @classmethod
+    def from_meta(cls, meta: dict) -> "TimeCoverage":
+        """从元数据加载，兼容旧的单区间格式 {"begin": ..., "end": ...}"""
+        if "ranges" in meta:
+            return cls(**meta)
+        coverage = cls()
+        coverage.add(TimeRange(**meta))
+        return coverage
+
+    def add(self, t: TimeRange) -> None:
+        """添加区间，并与重叠或相邻的区间合并"""
+        if t.begin >= t.end:
+            return
+        merged: list[TimeRange] = []
+        new = TimeRange(begin=t.begin, end=t.end)
+        for r in self.ranges:
+            if r.end < new.begin or new.end < r.begin:
+                merged.append(r)
+            else:
+                new = TimeRange(begin=min(r.begin, new.begin), end=max(r.end, new.end))
+        merged.append(new)
+        self.ranges = sorted(merged, key=lambda r: r.begin)
+
+    def gaps(self, t: TimeRange) -> list[TimeRange]:
+        """
+        获取时间范围中尚未覆盖的部分
+
+        Args:
+            t: 需要的时间范围
+
+        Returns:
+            按时间排序的未覆盖区间列表，完全覆盖时为空列表
+        """
+        gaps: list[TimeRange] = []
+        cursor = t.begin
+        for r in self.ranges:
+            if r.end <= cursor:
+                continue
+            if r.begin >= t.end:
+                break
+            if r.begin > cursor:
+                gaps.append(TimeRange(begin=cursor, end=r.begin))
+            cursor = max(cursor, r.end)
+        if cursor < t.end:
+            gaps.append(TimeRange(begin=cursor, end=t.end))
+        return gaps
+
+    @property
+    def bounds(self) -> TimeRange:
+        """覆盖范围的外包区间，为空时返回 (datetime.min, datetime.min)"""
+        if not self.ranges:
+            return TimeRange(begin=datetime.min, end=datetime.min)
+        return TimeRange(begin=self.ranges[0].begin, end=self.ranges[-1].end)
+
+    def __contains__(self, t: TimeRange) -> bool:
+        return any(t in r for r in self.ranges)
+
+
 class TimeManager:
-    def __init__(self, meta: TimeRange, df: pd.DataFrame):
-        self.meta = meta
+    def __init__(
+        self,
+        meta: TimeRange | TimeCoverage,
+        df: pd.DataFrame,
+        storage: TimeStorage | None = None,
+        partial: bool = False,
+    ):
+        if isinstance(meta, TimeCoverage):
+            self.coverage = meta
+        else:
+            self.meta = meta
         self.data = df
+        self.storage = storage or CSVStorage()
+        # 按时间范围加载时 data 只包含部分数据
+        self.partial = partial
+        # 自加载以来新追加的数据，支持追加的存储后端只写入这部分
+        self._new_data: list[pd.DataFrame] = []
+        # 已有数据的去重键哈希集合，首次追加时构建
+        self._keys: set[int] | None = None
+        self._key_cols: list[str] | None = None
+        # 加载来源 (file_name, file_dir)，部分加载时用于读取完整的去重键
+        self._source: tuple[str, Path] | None = None
+
+    @property
+    def meta(self) -> TimeRange:
+        """已获取时间范围的外包区间（只读视图，覆盖情况见 coverage）"""
+        return self.coverage.bounds
+
+    @meta.setter
+    def meta(self, value: TimeRange) -> None:
+        self.coverage = TimeCoverage()
+        self.coverage.add(value)
 
     @staticmethod
     def check_file_exist(file_name: str, file_dir: Path) -> None:
@@ -45,48 +138,75 @@ class TimeManager:
             raise FileNotFoundError(f"文件不存在: {json_path} 或 {csv_path}")
 
     @classmethod
-    def new(cls) -> "TimeManager":
+    def new(cls, storage: TimeStorage | None = None) -> "TimeManager":
         """创建新的 TimeManager 实例"""
         # 时间创建为 最开始的时间，min_value
         meta = TimeRange(begin=datetime.min, end=datetime.min)
         df = pd.DataFrame(columns=["title", "create_time"])
-        return cls(meta, df)
+        return cls(meta, df, storage)
 
     @classmethod
-    def load_file(cls, file_name: str, file_dir: Path) -> "TimeManager":
-        """加载文件"""
-        json_path = file_dir / f"{file_name}.json"
-        csv_path = file_dir / f"{file_name}.csv"
-        cls.check_file_exist(file_name, file_dir)
-        meta = TimeRange(**load_json(json_path))
-        df = pd.read_csv(csv_path)
-        return cls(meta, df)
+    def load_file(
+        cls,
+        file_name: str,
+        file_dir: Path,
+        storage: TimeStorage | None = None,
+        time_range: TimeRange | None = None,
+    ) -> "TimeManager":
+        """
+        加载文件
+
+        Args:
+            file_name: 文件名（不含扩展名）
+            file_dir: 文件目录
+            storage: 存储后端，默认使用 CSVStorage
+            time_range: 只加载该时间范围内的数据（支持下推的后端只读取匹配部分）
+
+        Raises:
+            FileNotFoundError: 文件不存在
+        """
+        storage = storage or CSVStorage()
+        if not storage.exists(file_name, file_dir):
+            raise FileNotFoundError(
+                f"文件不存在: {storage.meta_path(file_name, file_dir)} "
+                f"或 {storage.data_path(file_name, file_dir)}"
+            )
+        meta = TimeCoverage.from_meta(storage.load_meta(file_name, file_dir))
+        df = storage.load_data(file_name, file_dir, time_range)
+        tm = cls(meta, df, storage, partial=time_range is not None)
+        tm._source = (file_name, file_dir)
+        return tm
+
+    def match_remaining_time_ranges(self, need_time: TimeRange) -> list[TimeRange]:
+        """
+        获取剩余（未覆盖）的时间范围，并将 need_time 记为已覆盖
+
+        Args:
+            need_time: 需要获取的时间范围
+
+        Returns:
+            按时间排序的未覆盖区间列表，为空表示已全部获取
+        """
+        gaps = self.coverage.gaps(need_time)
+        self.coverage.add(need_time)
+        return gaps
 
     def match_remaining_time_range(self, need_time: TimeRange) -> TimeRange | None:
         """
         获取剩余的时间范围
 
+        未覆盖的部分可能不连续，此时返回包含所有缺口的最小范围。
+
         Args:
-            meta_time: 元数据时间范围
             need_time: 需要获取的时间范围
 
         Returns:
-            剩余的时间范围
-        """
-        if self.meta.end <= need_time.begin or need_time.end <= self.meta.begin:
-            self.meta.begin = need_time.begin
-            self.meta.end = need_time.end
-            return need_time
-        elif self.meta.begin < need_time.begin < self.meta.end < need_time.end:
-            remaining_range = TimeRange(begin=self.meta.end, end=need_time.end)
-            self.meta.end = need_time.end
-            return remaining_range
-        elif need_time.begin < self.meta.begin < need_time.end < self.meta.end:
-            remaining_range = TimeRange(begin=need_time.begin, end=self.meta.begin)
-            self.meta.begin = need_time.begin
-            return remaining_range
-        else:
+            剩余的时间范围，已全部获取时为 None
+        """
+        gaps = self.match_remaining_time_ranges(need_time)
+        if not gaps:
             return None
+        return TimeRange(begin=gaps[0].begin, end=gaps[-1].end)
 
     def fliter_data(
         self, time_range: TimeRange, time_col: str = "create_time"
@@ -110,23 +230,126 @@ class TimeManager:
         return self.data[(time_ser >= time_range.begin) & (time_ser <= time_range.end)]
 
     def save_file(self, file_name: str, file_dir: Path):
-        """保存文件"""
-        json_path = file_dir / f"{file_name}.json"
-        csv_path = file_dir / f"{file_name}.csv"
+        """
+        保存文件
+
+        数据先于元数据保存，元数据中只会记录已经落盘的时间范围。
+
+        Raises:
+            ValueError: 按时间范围加载的数据不完整，且存储后端不支持追加
+        """
+        if self.partial and not self.storage.supports_append:
+            raise ValueError("按时间范围加载的数据不完整，不能覆盖保存")
+        new_data = (
+            pd.concat(self._new_data, ignore_index=True)
+            if self._new_data
+            else self.data.iloc[0:0]
+        )
+        self.storage.save_data(self.data, new_data, file_name, file_dir)
         # 保存元数据
-        save_json(self.meta.model_dump(), json_path)
-        self.data.to_csv(csv_path, index=False, encoding="utf-8-sig")
+        self.storage.save_meta(self.coverage.model_dump(), file_name, file_dir)
+        self._new_data = []
+
+    @staticmethod
+    def resolve_key_cols(df: pd.DataFrame) -> list[str]:
+        """
+        选择文章的稳定去重键
+
+        优先使用 aid，其次 appmsgid + itemidx，都不存在时退回 title
+        """
+        if "aid" in df.columns:
+            return ["aid"]
+        if "appmsgid" in df.columns and "itemidx" in df.columns:
+            return ["appmsgid", "itemidx"]
+        return ["title"]
+
+    @staticmethod
+    def hash_keys(df: pd.DataFrame, key_cols: list[str]) -> pd.Series:
+        """
+        计算去重键的 64 位哈希
+
+        统一转为字符串后再哈希，从 CSV 读回的数据与新数据的哈希一致；
+        数值列先规范为整数（见 _key_strings），含缺失值时读回为 float 的 123.0
+        与新数据的 123 哈希相同
+        """
+        keys = df.reindex(columns=key_cols).apply(TimeManager._key_strings)
+        key = keys.iloc[:, 0] if len(key_cols) == 1 else keys.agg("_".join, axis=1)
+        return pd.util.hash_pandas_object(key, index=False)
+
+    @staticmethod
+    def _key_strings(col: pd.Series) -> pd.Series:
+        """
+        将去重键列转为字符串
+
+        只含整数值的数值列（包括因缺失值变为 float 的列）按整数格式化，
+        缺失值（NaN、None、pd.NA）统一为 "nan"
+        """
+        if pd.api.types.is_numeric_dtype(col) and not pd.api.types.is_bool_dtype(col):
+            values = col.dropna()
+            if (values == values.round()).all():
+                col = col.astype("Int64")
+        return col.astype(str).where(col.notna(), "nan")
+
+    def _existing_keys(self, key_cols: list[str]) -> set[int]:
+        """获取已有数据的去重键集合（只在首次调用或去重键变化时构建）"""
+        if self._keys is None or self._key_cols != key_cols:
+            if self.partial and self._source:
+                # 部分加载时 data 不完整，从存储中读取完整的去重键列
+                existing = self.storage.load_columns(*self._source, key_cols)
+            else:
+                existing = self.data
+            self._keys = (
+                set(self.hash_keys(existing, key_cols).tolist())
+                if len(existing)
+                else set()
+            )
+            self._key_cols = key_cols
+        return self._keys
 
     def append_data(
-        self, df: pd.DataFrame, id_col: str = "title", time_col: str = "create_time"
-    ):
-        """追加数据"""
-        # 去重
-        df = df.drop_duplicates(subset=[id_col], keep="first", ignore_index=True)
+        self,
+        df: pd.DataFrame,
+        id_col: str | list[str] | None = None,
+        time_col: str = "create_time",
+    ) -> int:
+        """
+        追加数据
+
+        按稳定键与已有数据和本批数据去重，已存在的文章不会重复追加。
+        去重键的哈希集合常驻内存，每次追加只需处理新数据。
+
+        Args:
+            df: 新数据
+            id_col: 去重键列，默认依次尝试 aid、appmsgid + itemidx、title
+            time_col: 时间列名
+
+        Returns:
+            实际追加的行数
+        """
+        if isinstance(id_col, str):
+            key_cols = [id_col]
+        else:
+            key_cols = id_col or self.resolve_key_cols(df)
+        existing_keys = self._existing_keys(key_cols)
+
+        # 去重：本批数据内部去重，再排除已有数据
+        hashes = self.hash_keys(df, key_cols)
+        is_new = ~hashes.duplicated(keep="first") & ~hashes.isin(existing_keys)
+        df = df[is_new.to_numpy()].reset_index(drop=True)
+        if df.empty:
+            return 0
+        existing_keys.update(hashes[is_new].tolist())
+
         # 按照时间排序
         df[time_col] = pd.to_datetime(df[time_col])
         df = df.sort_values(by=time_col, ascending=False, ignore_index=True)
-        self.data = pd.concat([self.data, df], ignore_index=True)
+        self._new_data.append(df)
+        # 与空 DataFrame 拼接会触发 pandas 的 FutureWarning，且列类型会退化为 object
+        if self.data.empty:
+            self.data = df
+        else:
+            self.data = pd.concat([self.data, df], ignore_index=True)
+        return len(df)
 
     def include_time_range(self, t: TimeRange) -> bool:
         """
@@ -138,4 +361,4 @@ class TimeManager:
         Returns:
             是否在范围中
         """
-        return t in self.meta
+        return t in self.coverage
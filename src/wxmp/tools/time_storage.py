@@ -0,0 +1,537 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pandas as pd
+from loguru import logger
+
+from wxmp.tools.file import load_json, save_json
+
+if TYPE_CHECKING:
+    from wxmp.tools.time_manager import TimeRange
+
+
+class TimeStorage(ABC):
+    """
+    TimeManager 存储后端抽象基类
+
+    元数据（已获取的时间范围）默认保存为 {file_name}.json，
+    文章数据的存储格式由子类实现。
+    """
+
+    #: 是否支持只追加新数据（不需要整体重写）
+    supports_append: bool = False
+
+    @abstractmethod
+    def data_path(self, file_name: str, file_dir: Path) -> Path:
+        """数据文件（或目录）路径"""
+        pass
+
+    @abstractmethod
+    def load_data(
+        self,
+        file_name: str,
+        file_dir: Path,
+        time_range: TimeRange | None = None,
+        time_col: str = "create_time",
+    ) -> pd.DataFrame:
+        """
+        读取文章数据
+
+        Args:
+            file_name: 文件名（不含扩展名）
+            file_dir: 文件目录
+            time_range: 只读取该时间范围内的数据，None 表示读取全部
+            time_col: 时间列名
+
+        Returns:
+            文章数据，时间列为 datetime 类型
+        """
+        pass
+
+    @abstractmethod
+    def save_data(
+        self, data: pd.DataFrame, new_data: pd.DataFrame, file_name: str, file_dir: Path
+    ) -> None:
+        """
+        保存文章数据
+
+        Args:
+            data: 全部数据
+            new_data: 自加载以来新追加的数据
+            file_name: 文件名（不含扩展名）
+            file_dir: 文件目录
+        """
+        pass
+
+    def load_columns(
+        self, file_name: str, file_dir: Path, columns: list[str]
+    ) -> pd.DataFrame:
+        """
+        只读取指定列的全部数据（如去重键），不存在的列填充为空
+
+        Args:
+            file_name: 文件名（不含扩展名）
+            file_dir: 文件目录
+            columns: 列名列表
+
+        Returns:
+            只包含指定列的数据
+        """
+        return self.load_data(file_name, file_dir).reindex(columns=columns)
+
+    def load_many(
+        self,
+        file_names: dict[str, str],
+        file_dir: Path,
+        time_range: TimeRange | None = None,
+        time_col: str = "create_time",
+    ) -> pd.DataFrame:
+        """
+        读取多个公众号的文章数据并合并
+
+        Args:
+            file_names: 文件名到公众号名称的映射，公众号名称写入 nickname 列
+            file_dir: 文件目录
+            time_range: 只读取该时间范围内的数据
+            time_col: 时间列名
+
+        Returns:
+            合并后的文章数据，不存在的文件会被跳过
+        """
+        frames: list[pd.DataFrame] = []
+        for file_name, nickname in file_names.items():
+            if not self.exists(file_name, file_dir):
+                continue
+            df = self.load_data(file_name, file_dir, time_range, time_col)
+            df["nickname"] = nickname
+            frames.append(df)
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def meta_path(self, file_name: str, file_dir: Path) -> Path:
+        """元数据文件路径"""
+        return file_dir / f"{file_name}.json"
+
+    def exists(self, file_name: str, file_dir: Path) -> bool:
+        """元数据和数据文件是否都存在"""
+        return (
+            self.meta_path(file_name, file_dir).exists()
+            and self.data_path(file_name, file_dir).exists()
+        )
+
+    def load_meta(self, file_name: str, file_dir: Path) -> dict:
+        """读取元数据"""
+        return load_json(self.meta_path(file_name, file_dir))
+
+    def save_meta(self, meta: dict, file_name: str, file_dir: Path) -> None:
+        """保存元数据（先写临时文件再替换）"""
+        meta_path = self.meta_path(file_name, file_dir)
+        tmp_path = meta_path.with_name(meta_path.name + ".tmp")
+        save_json(meta, tmp_path)
+        tmp_path.replace(meta_path)
+
+
+class CSVStorage(TimeStorage):
+    """CSV 存储后端，每次保存整体重写 {file_name}.csv"""
+
+    def data_path(self, file_name: str, file_dir: Path) -> Path:
+        return file_dir / f"{file_name}.csv"
+
+    def load_data(
+        self,
+        file_name: str,
+        file_dir: Path,
+        time_range: TimeRange | None = None,
+        time_col: str = "create_time",
+    ) -> pd.DataFrame:
+        df = pd.read_csv(self.data_path(file_name, file_dir))
+        if time_col in df.columns:
+            df[time_col] = pd.to_datetime(df[time_col])
+            if time_range:
+                df = df[
+                    (df[time_col] >= time_range.begin)
+                    & (df[time_col] <= time_range.end)
+                ]
+        return df
+
+    def save_data(
+        self, data: pd.DataFrame, new_data: pd.DataFrame, file_name: str, file_dir: Path
+    ) -> None:
+        csv_path = self.data_path(file_name, file_dir)
+        # 先写临时文件再替换，进程中途退出不会留下写了一半的文件
+        tmp_path = csv_path.with_name(csv_path.name + ".tmp")
+        data.to_csv(tmp_path, index=False, encoding="utf-8-sig")
+        tmp_path.replace(csv_path)
+
+
+class ParquetStorage(TimeStorage):
+    """
+    Parquet 存储后端（需要安装 pyarrow）
+
+    数据保存在 {file_name}.parquet/ 目录下，每次保存只把新追加的数据写为一个新的
+    part 文件，时间列保持 datetime 类型；按时间范围读取时过滤条件下推到文件，
+    只读取匹配的 row group。part 文件数量超过 max_parts 时自动合并。
+
+    合并前先原子写入 _compaction.json 记录合并后的文件名和被替换的 part，
+    合并后的文件存在时读取会忽略被替换的 part；进程在合并中途退出也不会读到重复的行，
+    下次保存时完成删除（或在合并文件未写完时放弃本次合并）。
+    """
+
+    #: 记录进行中的合并的文件名
+    COMPACTION_FILE = "_compaction.json"
+
+    supports_append = True
+
+    def __init__(self, max_parts: int = 64, compression: str = "zstd"):
+        """
+        初始化 Parquet 存储后端
+
+        Args:
+            max_parts: part 文件数量上限，超过时合并为一个文件
+            compression: 压缩算法
+        """
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("ParquetStorage 需要安装 pyarrow: pip install 'wxmp[parquet]'")
+        self.max_parts = max_parts
+        self.compression = compression
+
+    def data_path(self, file_name: str, file_dir: Path) -> Path:
+        return file_dir / f"{file_name}.parquet"
+
+    def _parts(self, file_name: str, file_dir: Path) -> list[Path]:
+        data_dir = self.data_path(file_name, file_dir)
+        parts = sorted(data_dir.glob("part-*.parquet"))
+        compaction = self._pending_compaction(data_dir)
+        if compaction is not None and (data_dir / compaction["merged"]).exists():
+            replaced = set(compaction["replaced"])
+            parts = [part for part in parts if part.name not in replaced]
+        return parts
+
+    def _pending_compaction(self, data_dir: Path) -> dict | None:
+        """未完成的合并记录，没有时返回 None"""
+        path = data_dir / self.COMPACTION_FILE
+        if not path.exists():
+            return None
+        return load_json(path)
+
+    def _finish_compaction(self, data_dir: Path) -> None:
+        """
+        完成上次中断的合并
+
+        合并后的文件已存在时删除被替换的 part，否则删除未写完的临时文件，旧 part 保持不变
+        """
+        compaction = self._pending_compaction(data_dir)
+        if compaction is None:
+            return
+        merged = compaction["merged"]
+        if (data_dir / merged).exists():
+            for name in compaction["replaced"]:
+                (data_dir / name).unlink(missing_ok=True)
+        else:
+            (data_dir / f".{merged}.tmp").unlink(missing_ok=True)
+        (data_dir / self.COMPACTION_FILE).unlink()
+
+    def _dataset(self, parts: list[Path]):
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        # 各 part 的列类型可能不同（如全空列），先统一 schema
+        schema = pa.unify_schemas(
+            [pq.read_schema(part) for part in parts], promote_options="permissive"
+        )
+        return ds.dataset([str(part) for part in parts], schema=schema, format="parquet")
+
+    def load_data(
+        self,
+        file_name: str,
+        file_dir: Path,
+        time_range: TimeRange | None = None,
+        time_col: str = "create_time",
+    ) -> pd.DataFrame:
+        import pyarrow.dataset as ds
+
+        parts = self._parts(file_name, file_dir)
+        if not parts:
+            return pd.DataFrame(columns=["title", time_col])
+
+        dataset = self._dataset(parts)
+        expression = None
+        if time_range and time_col in dataset.schema.names:
+            expression = (ds.field(time_col) >= time_range.begin) & (
+                ds.field(time_col) <= time_range.end
+            )
+        return dataset.to_table(filter=expression).to_pandas()
+
+    def load_columns(
+        self, file_name: str, file_dir: Path, columns: list[str]
+    ) -> pd.DataFrame:
+        parts = self._parts(file_name, file_dir)
+        if not parts:
+            return pd.DataFrame(columns=columns)
+        dataset = self._dataset(parts)
+        names = [col for col in columns if col in dataset.schema.names]
+        return dataset.to_table(columns=names).to_pandas().reindex(columns=columns)
+
+    def save_data(
+        self, data: pd.DataFrame, new_data: pd.DataFrame, file_name: str, file_dir: Path
+    ) -> None:
+        data_dir = self.data_path(file_name, file_dir)
+        data_dir.mkdir(parents=True, exist_ok=True)
+        self._finish_compaction(data_dir)
+        if not new_data.empty:
+            self._write_part(new_data, data_dir)
+
+        parts = self._parts(file_name, file_dir)
+        if len(parts) > self.max_parts:
+            self._compact(parts, data_dir)
+
+    def _compact(self, parts: list[Path], data_dir: Path) -> None:
+        """将 parts 合并为一个文件，合并记录先于合并文件生效"""
+        merged = self._dataset(parts).to_table()
+        name = self._part_name()
+        tmp_path = self._write_tmp(merged, data_dir, name)
+        compaction = {"merged": name, "replaced": [part.name for part in parts]}
+        compaction_path = data_dir / self.COMPACTION_FILE
+        compaction_tmp = compaction_path.with_name(compaction_path.name + ".tmp")
+        save_json(compaction, compaction_tmp)
+        compaction_tmp.replace(compaction_path)
+        tmp_path.replace(data_dir / name)
+        self._finish_compaction(data_dir)
+
+    @staticmethod
+    def _part_name() -> str:
+        # 文件名以纳秒时间戳开头，保证按文件名排序即为写入顺序
+        return f"part-{pd.Timestamp.now().value:020d}-{uuid.uuid4().hex[:8]}.parquet"
+
+    def _write_tmp(self, data, data_dir: Path, name: str) -> Path:
+        """写入 part 的临时文件，返回临时文件路径"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = (
+            data
+            if isinstance(data, pa.Table)
+            else pa.Table.from_pandas(data, preserve_index=False)
+        )
+        tmp_path = data_dir / f".{name}.tmp"
+        pq.write_table(table, tmp_path, compression=self.compression)
+        return tmp_path
+
+    def _write_part(self, data, data_dir: Path) -> None:
+        name = self._part_name()
+        self._write_tmp(data, data_dir, name).replace(data_dir / name)
+
+
+class SQLiteStorage(TimeStorage):
+    """
+    SQLite 存储后端
+
+    所有公众号的文章和已获取的时间范围保存在同一个数据库中（默认
+    {file_dir}/articles.db），文章表在 (fakeid, create_time)、(account, create_time)、
+    aid 和 link 上建有索引，多个公众号的时间范围查询只需一次索引查询。
+    数据库使用 WAL 模式，每个线程使用独立连接，支持多线程、多进程同时写入。
+    """
+
+    supports_append = True
+
+    #: 文章表的列，create_time 以 "YYYY-MM-DD HH:MM:SS" 文本保存以便范围查询
+    COLUMNS = (
+        "aid",
+        "fakeid",
+        "appmsgid",
+        "itemidx",
+        "title",
+        "link",
+        "digest",
+        "cover",
+        "create_time",
+        "update_time",
+        "is_pay_subscribe",
+        "item_show_type",
+        "tagid",
+    )
+
+    def __init__(self, db_path: Path | None = None, timeout: float = 30.0):
+        """
+        初始化 SQLite 存储后端
+
+        Args:
+            db_path: 数据库路径，默认为 {file_dir}/articles.db
+            timeout: 等待其他写入者释放锁的时间（秒）
+        """
+        self.db_path = db_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def data_path(self, file_name: str, file_dir: Path) -> Path:
+        return self.db_path or file_dir / "articles.db"
+
+    def _connect(self, file_dir: Path) -> sqlite3.Connection:
+        """获取当前线程的数据库连接，首次连接时建表"""
+        db_path = self.data_path("", file_dir)
+        connections = self._local.__dict__.setdefault("connections", {})
+        if db_path not in connections:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(db_path, timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                conn.executescript(
+                    """
+                    CREATE TABLE IF NOT EXISTS articles (
+                        account TEXT NOT NULL,
+                        aid TEXT NOT NULL,
+                        fakeid TEXT,
+                        appmsgid INTEGER,
+                        itemidx INTEGER,
+                        title TEXT,
+                        link TEXT,
+                        digest TEXT,
+                        cover TEXT,
+                        create_time TEXT,
+                        update_time TEXT,
+                        is_pay_subscribe INTEGER,
+                        item_show_type INTEGER,
+                        tagid TEXT,
+                        PRIMARY KEY (account, aid)
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_articles_fakeid_time
+                        ON articles (fakeid, create_time);
+                    CREATE INDEX IF NOT EXISTS idx_articles_account_time
+                        ON articles (account, create_time);
+                    CREATE INDEX IF NOT EXISTS idx_articles_aid ON articles (aid);
+                    CREATE INDEX IF NOT EXISTS idx_articles_link ON articles (link);
+                    CREATE TABLE IF NOT EXISTS coverage (
+                        account TEXT PRIMARY KEY,
+                        meta TEXT NOT NULL
+                    );
+                    """
+                )
+            connections[db_path] = conn
+        return connections[db_path]
+
+    def exists(self, file_name: str, file_dir: Path) -> bool:
+        if not self.data_path(file_name, file_dir).exists():
+            return False
+        row = (
+            self._connect(file_dir)
+            .execute("SELECT 1 FROM coverage WHERE account = ?", (file_name,))
+            .fetchone()
+        )
+        return row is not None
+
+    def load_meta(self, file_name: str, file_dir: Path) -> dict:
+        row = (
+            self._connect(file_dir)
+            .execute("SELECT meta FROM coverage WHERE account = ?", (file_name,))
+            .fetchone()
+        )
+        if row is None:
+            raise FileNotFoundError(f"数据库中不存在公众号: {file_name}")
+        return json.loads(row[0])
+
+    def save_meta(self, meta: dict, file_name: str, file_dir: Path) -> None:
+        conn = self._connect(file_dir)
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO coverage (account, meta) VALUES (?, ?)",
+                (file_name, json.dumps(meta, ensure_ascii=False)),
+            )
+
+    def _query(
+        self,
+        file_names: list[str],
+        file_dir: Path,
+        time_range: TimeRange | None,
+        time_col: str,
+    ) -> pd.DataFrame:
+        placeholders = ",".join("?" * len(file_names))
+        sql = f"SELECT * FROM articles WHERE account IN ({placeholders})"
+        params: list = list(file_names)
+        if time_range:
+            sql += f" AND {time_col} >= ? AND {time_col} <= ?"
+            params += [
+                time_range.begin.strftime("%Y-%m-%d %H:%M:%S"),
+                time_range.end.strftime("%Y-%m-%d %H:%M:%S"),
+            ]
+        sql += f" ORDER BY account, {time_col} DESC"
+        df = pd.read_sql_query(sql, self._connect(file_dir), params=params)
+        df[time_col] = pd.to_datetime(df[time_col])
+        return df
+
+    def load_data(
+        self,
+        file_name: str,
+        file_dir: Path,
+        time_range: TimeRange | None = None,
+        time_col: str = "create_time",
+    ) -> pd.DataFrame:
+        return self._query([file_name], file_dir, time_range, time_col).drop(
+            columns="account"
+        )
+
+    def load_columns(
+        self, file_name: str, file_dir: Path, columns: list[str]
+    ) -> pd.DataFrame:
+        names = [col for col in columns if col in self.COLUMNS]
+        if not names:
+            return pd.DataFrame(columns=columns)
+        df = pd.read_sql_query(
+            f"SELECT {', '.join(names)} FROM articles WHERE account = ?",
+            self._connect(file_dir),
+            params=[file_name],
+        )
+        return df.reindex(columns=columns)
+
+    def load_many(
+        self,
+        file_names: dict[str, str],
+        file_dir: Path,
+        time_range: TimeRange | None = None,
+        time_col: str = "create_time",
+    ) -> pd.DataFrame:
+        if not file_names or not self.data_path("", file_dir).exists():
+            return pd.DataFrame()
+        df = self._query(list(file_names), file_dir, time_range, time_col)
+        df["nickname"] = df.pop("account").map(file_names)
+        return df
+
+    def save_data(
+        self, data: pd.DataFrame, new_data: pd.DataFrame, file_name: str, file_dir: Path
+    ) -> None:
+        if new_data.empty:
+            return
+        rows = new_data.reindex(columns=list(self.COLUMNS))
+        # aid 是主键的一部分，缺失时无法保存；显式跳过并记录，不交给 INSERT OR IGNORE 静默丢弃
+        missing_aid = rows["aid"].isna()
+        if missing_aid.any():
+            logger.warning(
+                f"公众号 {file_name} 有 {int(missing_aid.sum())} 篇文章缺少 aid，未保存到数据库"
+            )
+            rows = rows[~missing_aid]
+            if rows.empty:
+                return
+        rows["create_time"] = pd.to_datetime(rows["create_time"]).dt.strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
+        rows = rows.astype(object).where(rows.notna(), None)
+        rows.insert(0, "account", file_name)
+
+        columns = ", ".join(rows.columns)
+        placeholders = ", ".join("?" * len(rows.columns))
+        conn = self._connect(file_dir)
+        with conn:
+            # 主键 (account, aid) 冲突时保留已有记录（aid 已确保非空）
+            conn.executemany(
+                f"INSERT OR IGNORE INTO articles ({columns}) VALUES ({placeholders})",
+                rows.itertuples(index=False, name=None),
+            )
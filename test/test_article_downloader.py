@@ -0,0 +1,195 @@
+"""测试 article_downloader 模块的写入前检查"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# 添加 src 到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from wxmp.api.rate_limit import RateLimiter, get_default_rate_limiter
+from wxmp.tools.article_downloader import ArticleDownloader, ArticleMetadata
+from wxmp.tools.file import atomic_write
+from wxmp.tools.retry import PERMANENT, THROTTLE, RetryPolicy, interstitial_kind
+
+ARTICLE = '<div id="js_content"><p>{}</p></div>'
+DELETED = "<html><body><p>该内容已被发布者删除</p></body></html>"
+VERIFY = "<html><body><p>环境异常</p><p>完成验证后即可继续访问</p></body></html>"
+
+
+def chunked(html: str, size: int = 7):
+    for i in range(0, len(html), size):
+        yield html[i : i + size]
+
+
+class TestInterstitial:
+    """测试提示页识别"""
+
+    def test_interstitial_kind(self):
+        """测试删除页、验证页和正常文章"""
+        assert interstitial_kind(DELETED) == PERMANENT
+        assert interstitial_kind(VERIFY) == THROTTLE
+        assert interstitial_kind(ARTICLE.format("环境异常的分析")) is None
+
+    def test_deleted_page_not_retried_or_written(self, tmp_path):
+        """测试文章已删除时只请求一次，且不写入任何文件"""
+        calls = []
+
+        def fetch(url, timeout):
+            calls.append(url)
+            return DELETED
+
+        downloader = ArticleDownloader(retry_delay=0, min_file_size="1B")
+
+        assert not downloader.download("u", tmp_path / "a.md", ArticleMetadata(), fetch)
+        result = downloader.stream_result(
+            "u", tmp_path / "b.md", ArticleMetadata(), lambda u, t: chunked(fetch(u, t))
+        )
+
+        assert result.error_kind == PERMANENT
+        assert result.attempts == 1
+        assert calls == ["u", "u"]
+        assert list(tmp_path.iterdir()) == []
+
+    def test_verify_page_retried(self):
+        """测试环境异常验证页按访问频繁重试"""
+        pages = iter([VERIFY, ARTICLE.format("正文")])
+        policy = RetryPolicy(base_delay=0, throttle_delay=0)
+        downloader = ArticleDownloader(retry_policy=policy)
+
+        html, attempts = downloader.fetch_counted("u", lambda url, timeout: next(pages))
+
+        assert attempts == 2
+        assert "正文" in html
+
+    def test_page_outcome_reported(self):
+        """测试验证页降速、正常页面提速，上报给传入的限流器而不是全局限流器"""
+        limiter = RateLimiter({"article": (100.0, 200.0)})
+        bucket = limiter.bucket("article")
+        bucket.base_backoff = bucket._backoff = 0.001
+        global_rate = get_default_rate_limiter().bucket("article").rate
+        pages = iter([VERIFY, ARTICLE.format("正文"), ARTICLE.format("正文")])
+        policy = RetryPolicy(base_delay=0, throttle_delay=0)
+        downloader = ArticleDownloader(retry_policy=policy, rate_limiter=limiter)
+
+        # 验证页时减半，随后的正常页面线性增加 5%
+        downloader.fetch_counted("u", lambda url, timeout: next(pages))
+        assert bucket.rate == 60.0
+        downloader.fetch("u", lambda url, timeout: next(pages))
+
+        assert bucket.rate == 70.0
+        assert get_default_rate_limiter().bucket("article").rate == global_rate
+
+
+class TestPreWriteCheck:
+    """测试写入前的大小检查"""
+
+    def test_small_content_not_written(self, tmp_path):
+        """测试过小的内容不会写入磁盘"""
+        downloader = ArticleDownloader(min_file_size="1KB")
+        save_path = tmp_path / "sub" / "a.md"
+
+        result = downloader.write_result("太短", save_path)
+
+        assert not result
+        assert result.size == len("太短".encode("utf-8"))
+        assert not save_path.parent.exists()
+
+    def test_size_counts_encoded_bytes(self, tmp_path):
+        """测试按 UTF-8 编码后的字节数判断大小"""
+        downloader = ArticleDownloader(min_file_size="30B")
+
+        result = downloader.write_result("中" * 10, tmp_path / "a.md")
+
+        assert result.ok
+        assert result.size == 30
+        assert (tmp_path / "a.md").stat().st_size == 30
+
+    def test_stream_small_output_never_touches_disk(self, tmp_path, monkeypatch):
+        """测试流式下载的输出过小时不创建临时文件"""
+        opened = []
+        real_open = open
+
+        def tracking_open(path, *args, **kwargs):
+            opened.append(Path(path))
+            return real_open(path, *args, **kwargs)
+
+        monkeypatch.setattr("builtins.open", tracking_open)
+        downloader = ArticleDownloader(min_file_size="1KB")
+
+        result = downloader.stream_result(
+            "u",
+            tmp_path / "a.md",
+            ArticleMetadata(),
+            lambda url, timeout: chunked(ARTICLE.format("短文")),
+        )
+
+        assert not result
+        assert not any(path.parent == tmp_path for path in opened)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_stream_large_output_written(self, tmp_path):
+        """测试流式下载达到大小要求时完整写入"""
+        downloader = ArticleDownloader(min_file_size="100B")
+        html = ARTICLE.format("正文" * 100)
+
+        result = downloader.stream_result(
+            "u", tmp_path / "a.md", ArticleMetadata(), lambda u, t: chunked(html)
+        )
+
+        assert result.ok
+        assert result.size == (tmp_path / "a.md").stat().st_size
+        assert (tmp_path / "a.md").read_text(encoding="utf-8").endswith("正文" * 100)
+
+    def test_concurrent_streams_same_path(self, tmp_path):
+        """测试两个线程同时流式写入同一文件时临时文件互不覆盖"""
+        # 保存 HTML 时逐块写入临时文件
+        downloader = ArticleDownloader(save_format="html", min_file_size="100B")
+        html = ARTICLE.format("正文" * 100)
+        barrier = threading.Barrier(2)
+
+        def stream(url, timeout):
+            chunks = list(chunked(html, 50))
+            yield from chunks[:-1]
+            # 两个线程都已打开临时文件后再写完
+            barrier.wait(timeout=5)
+            yield chunks[-1]
+
+        results = []
+
+        def download():
+            results.append(
+                downloader.attempt_stream("u", tmp_path / "a.md", ArticleMetadata(), stream)
+            )
+
+        threads = [threading.Thread(target=download) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert [r.ok for r in results] == [True, True]
+        assert (tmp_path / "a.md").read_text(encoding="utf-8") == html
+        assert [p.name for p in tmp_path.iterdir()] == ["a.md"]
+
+
+def test_atomic_write_failure_keeps_old_file(tmp_path, monkeypatch):
+    """测试写入失败时保留原文件，且不留下临时文件"""
+    path = tmp_path / "a.md"
+    atomic_write("旧内容", path)
+
+    def broken_replace(self, target):
+        raise OSError("磁盘已满")
+
+    monkeypatch.setattr(Path, "replace", broken_replace)
+    with pytest.raises(OSError):
+        atomic_write("新内容", path)
+
+    assert path.read_text(encoding="utf-8") == "旧内容"
+    assert [p.name for p in tmp_path.iterdir()] == ["a.md"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
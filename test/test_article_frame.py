@@ -0,0 +1,196 @@
+"""测试 article_frame 模块"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# 添加 src 到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from wxmp.api.list_ex import ArticleListItem
+from wxmp.spider import TimeRangeSpider
+from wxmp.tools.article_frame import ARTICLE_COLUMNS, ArticleColumns, local_datetimes
+
+
+def make_item(i: int, timestamp: int) -> ArticleListItem:
+    return ArticleListItem(
+        aid=f"{i}_1",
+        appmsgid=i,
+        cover="https://mmbiz.qpic.cn/cover.jpg",
+        create_time=timestamp,
+        digest=f"摘要{i}",
+        itemidx=1,
+        link=f"https://mp.weixin.qq.com/s/{i}",
+        tagid=["1", "2"] if i % 2 else [],
+        title=f"文章{i}",
+        update_time=timestamp + 60,
+    )
+
+
+# 覆盖冬令时、夏令时和切换当天，以及历史上的偏移调整：
+# 1988 年（中国夏令时）、2012 年（莫斯科 UTC+4）、2015 年（圣保罗夏令时）、
+# 2020 年（德黑兰夏令时）
+TIMESTAMPS = [
+    1_700_000_000,
+    1_720_000_000,
+    1_710_054_000,
+    1_710_050_000,
+    0,
+    584_000_000,
+    1_330_000_000,
+    1_420_000_000,
+    1_590_000_000,
+]
+
+
+@pytest.fixture(
+    params=[
+        "Asia/Shanghai",
+        "UTC",
+        "America/New_York",
+        "Europe/Moscow",
+        "America/Sao_Paulo",
+        "Asia/Tehran",
+        # POSIX 格式，没有时区名称，逐个时间戳换算
+        "EST+5EDT,M3.2.0/2,M11.1.0/2",
+    ]
+)
+def local_tz(request):
+    """临时切换本地时区"""
+    original = os.environ.get("TZ")
+    os.environ["TZ"] = request.param
+    time.tzset()
+    yield request.param
+    if original is None:
+        os.environ.pop("TZ", None)
+    else:
+        os.environ["TZ"] = original
+    time.tzset()
+
+
+class TestToFrame:
+    """测试 ArticleColumns.to_frame 与 model_dump() 的结果一致"""
+
+    def test_columns_match_model_dump(self):
+        """列顺序与 ArticleListItem.model_dump() 的键相同"""
+        assert ARTICLE_COLUMNS == tuple(make_item(1, 0).model_dump())
+
+    @pytest.mark.skipif(not hasattr(time, "tzset"), reason="需要 time.tzset")
+    def test_same_as_model_dump(self, local_tz):
+        """与逐个 model_dump() 后构造 DataFrame 的结果一致"""
+        items = [make_item(i, ts) for i, ts in enumerate(TIMESTAMPS)]
+        expected = pd.DataFrame([item.model_dump() for item in items])
+        expected["create_time"] = pd.to_datetime(expected["create_time"])
+
+        columns = ArticleColumns()
+        columns.extend(items)
+        df = columns.to_frame()
+        assert list(df.columns) == list(expected.columns)
+        assert (df["create_time"] == expected["create_time"]).all()
+        assert df["update_time"].tolist() == expected["update_time"].tolist()
+        for col in ("aid", "appmsgid", "tagid", "title", "link"):
+            assert df[col].tolist() == expected[col].tolist()
+
+    def test_empty(self):
+        """没有文章时返回带列名的空 DataFrame"""
+        df = ArticleColumns().to_frame()
+        assert df.empty
+        assert tuple(df.columns) == ARTICLE_COLUMNS
+
+    def test_local_datetimes_dtype(self):
+        """返回 datetime64 序列"""
+        values = local_datetimes([1_700_000_000, 1_700_000_060])
+        assert pd.api.types.is_datetime64_dtype(values)
+        assert (values.iloc[1] - values.iloc[0]).total_seconds() == 60
+
+
+class TestArticleColumns:
+    """测试 ArticleColumns"""
+
+    def test_grows_past_capacity(self):
+        """超过预分配容量时扩容，已追加的值不变"""
+        columns = ArticleColumns(capacity=2)
+        items = [make_item(i, 1_700_000_000 + i) for i in range(5)]
+        columns.extend(items[:3])
+        columns.extend(items[3:])
+        columns.extend([])
+        assert len(columns) == 5
+        assert columns.capacity >= 5
+        assert columns.column("appmsgid").tolist() == [0, 1, 2, 3, 4]
+        assert columns.column("tagid") == ["", "1,2", "", "1,2", ""]
+
+    def test_typed_frame(self):
+        """整数列为 int64，create_time 为 datetime64，与 model_dump() 的值一致"""
+        items = [make_item(i, TIMESTAMPS[i]) for i in range(4)]
+        columns = ArticleColumns()
+        columns.extend(items)
+        df = columns.to_frame()
+        expected = pd.DataFrame([item.model_dump() for item in items])
+        assert df["appmsgid"].dtype == "int64"
+        assert pd.api.types.is_datetime64_dtype(df["create_time"])
+        assert (df["create_time"] == pd.to_datetime(expected["create_time"])).all()
+        assert df["update_time"].tolist() == expected["update_time"].tolist()
+
+    def test_to_frame_copies(self):
+        """to_frame 之后继续追加不影响已构造的 DataFrame"""
+        columns = ArticleColumns(capacity=8)
+        columns.extend([make_item(1, 1_700_000_000)])
+        df = columns.to_frame()
+        columns.extend([make_item(2, 1_700_000_000)])
+        assert len(df) == 1
+        assert len(columns.to_frame()) == 2
+
+
+class TestSearchArticlesCompact:
+    """测试 search_articles 的按列累积和逐页回调"""
+
+    @staticmethod
+    def make_spider(pages: list[list[ArticleListItem]]) -> TimeRangeSpider:
+        spider = TimeRangeSpider.__new__(TimeRangeSpider)
+        spider._page_sizes = {}
+
+        def fetch_page(fakeid, begin, count, is_publish=False):
+            index = begin // count
+            page = pages[index] if index < len(pages) else []
+            return page, len(page)
+
+        spider._fetch_page = fetch_page
+        return spider
+
+    def test_compact_same_as_list(self):
+        """compact=True 返回的 ArticleColumns 与逐条 model_dump() 的结果一致"""
+        pages = [
+            [make_item(i, 1_700_000_000 - i * 3600) for i in range(start, start + 5)]
+            for start in (0, 5, 10)
+        ]
+        spider = self.make_spider(pages)
+        items = spider.search_articles("fakeid", "公众号", page_size=5)
+        seen = []
+        columns = spider.search_articles(
+            "fakeid", "公众号", page_size=5, compact=True, on_page=seen.append
+        )
+        assert isinstance(columns, ArticleColumns)
+        assert len(columns) == len(items) == 15
+        assert seen == pages
+
+        df = columns.to_frame()
+        expected = pd.DataFrame([item.model_dump() for item in items])
+        assert df["aid"].tolist() == expected["aid"].tolist()
+        assert df["update_time"].tolist() == expected["update_time"].tolist()
+
+    def test_compact_max_count(self):
+        """数量上限按已累积的行数判断"""
+        pages = [[make_item(i, 1_700_000_000) for i in range(5)]] * 4
+        spider = self.make_spider(pages)
+        columns = spider.search_articles(
+            "fakeid", "公众号", page_size=5, max_count=8, compact=True
+        )
+        assert len(columns) == 10
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,239 @@
+"""测试 article_pipeline 模块"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# 添加 src 到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from wxmp.tools import article_pipeline
+from wxmp.tools.article_downloader import (
+    ArticleDownloader,
+    ArticleMetadata,
+    DownloadResult,
+)
+from wxmp.tools.article_pipeline import (
+    ArticleJob,
+    ArticlePipeline,
+    article_job_frame,
+    iter_article_jobs,
+)
+from wxmp.tools.file import sanitize_filename, sanitize_filenames
+
+
+def fake_fetch(url: str, timeout: int) -> str:
+    """模拟获取文章 HTML，URL 中包含 fail 时抛出异常"""
+    if "fail" in url:
+        raise ConnectionError(url)
+    return f'<div id="js_content"><p>{url} 的正文内容</p></div>'
+
+
+def fake_stream(url: str, timeout: int):
+    """模拟流式获取，按 5 个字符一块产出"""
+    html = fake_fetch(url, timeout)
+    for i in range(0, len(html), 5):
+        yield html[i : i + 5]
+
+
+def make_jobs(tmp_path: Path, urls: list[str]) -> list[ArticleJob]:
+    return [
+        ArticleJob(
+            url=url,
+            save_path=tmp_path / f"{i}.md",
+            metadata=ArticleMetadata(title=f"文章{i}", link=url),
+        )
+        for i, url in enumerate(urls)
+    ]
+
+
+class TestArticlePipeline:
+    """测试 ArticlePipeline 类"""
+
+    @pytest.mark.parametrize("convert_workers", [0, 2])
+    def test_run(self, tmp_path, convert_workers):
+        """测试下载、转换、写入，失败的任务返回请求次数和失败原因"""
+        downloader = ArticleDownloader(max_retries=2, retry_delay=0, min_file_size="1B")
+        pipeline = ArticlePipeline(
+            downloader, fake_fetch, io_workers=3, convert_workers=convert_workers
+        )
+        urls = [f"https://mp.weixin.qq.com/s/{i}" for i in range(10)] + ["fail"]
+
+        results = {
+            job.url: result for job, result in pipeline.run(make_jobs(tmp_path, urls))
+        }
+
+        assert len(results) == 11
+        failed = results.pop("fail")
+        assert not failed
+        assert failed.attempts == 2
+        assert failed.error == "ConnectionError: fail"
+        assert all(results.values())
+        assert all(r.attempts == 1 and r.size > 0 for r in results.values())
+        content = (tmp_path / "3.md").read_text(encoding="utf-8")
+        assert content.startswith("---\ntitle: 文章3\n")
+        assert content.endswith("https://mp.weixin.qq.com/s/3 的正文内容")
+
+    def test_existing_file_skipped(self, tmp_path):
+        """测试已存在的文件不会重新下载"""
+        jobs = make_jobs(tmp_path, ["fail"])
+        jobs[0].save_path.write_text("已保存", encoding="utf-8")
+        pipeline = ArticlePipeline(ArticleDownloader(), fake_fetch, io_workers=1)
+
+        size = len("已保存".encode("utf-8"))
+        assert list(pipeline.run(jobs)) == [
+            (jobs[0], DownloadResult(True, size=size, skipped=True))
+        ]
+
+    def test_stream(self, tmp_path):
+        """测试流式下载与普通下载保存的内容相同"""
+        downloader = ArticleDownloader(min_file_size="1B")
+        urls = [f"https://mp.weixin.qq.com/s/{i}" for i in range(3)] + ["fail"]
+        (tmp_path / "normal").mkdir()
+        (tmp_path / "stream").mkdir()
+
+        normal = ArticlePipeline(downloader, fake_fetch).run(
+            make_jobs(tmp_path / "normal", urls)
+        )
+        streamed = ArticlePipeline(downloader, fake_fetch, stream_func=fake_stream).run(
+            make_jobs(tmp_path / "stream", urls)
+        )
+
+        assert {job.url: r for job, r in normal} == {job.url: r for job, r in streamed}
+        for i in range(3):
+            assert (tmp_path / "stream" / f"{i}.md").read_text(encoding="utf-8") == (
+                tmp_path / "normal" / f"{i}.md"
+            ).read_text(encoding="utf-8")
+        assert not list((tmp_path / "stream").glob("*.part"))
+
+    def test_early_stop(self, tmp_path):
+        """测试提前结束迭代时流水线停止"""
+        downloader = ArticleDownloader(min_file_size="1B")
+        pipeline = ArticlePipeline(
+            downloader, fake_fetch, io_workers=2, convert_queue_size=1
+        )
+        jobs = make_jobs(tmp_path, [f"u{i}" for i in range(100)])
+
+        for _ in pipeline.run(jobs):
+            break
+
+        assert len(list(tmp_path.glob("*.md"))) < 100
+
+    def test_fetch_queue_bound(self, tmp_path, monkeypatch):
+        """测试提交给转换进程、尚未转换完成的文章数不超过 fetch_queue_size"""
+        pending = 0
+        peak = 0
+        lock = threading.Lock()
+
+        class CountingPool(ThreadPoolExecutor):
+            """用线程代替进程，记录同时等待转换的文章数"""
+
+            def __init__(self, max_workers, mp_context=None):
+                super().__init__(max_workers=max_workers)
+
+            def submit(self, fn, *args):
+                nonlocal pending, peak
+                with lock:
+                    pending += 1
+                    peak = max(peak, pending)
+
+                def slow_render():
+                    nonlocal pending
+                    time.sleep(0.005)
+                    try:
+                        return fn(*args)
+                    finally:
+                        with lock:
+                            pending -= 1
+
+                return super().submit(slow_render)
+
+        monkeypatch.setattr(article_pipeline, "ProcessPoolExecutor", CountingPool)
+        downloader = ArticleDownloader(min_file_size="1B")
+        pipeline = ArticlePipeline(
+            downloader,
+            fake_fetch,
+            io_workers=4,
+            convert_workers=1,
+            convert_queue_size=8,
+            fetch_queue_size=2,
+        )
+        urls = [f"https://mp.weixin.qq.com/s/{i}" for i in range(12)]
+
+        results = [result for _, result in pipeline.run(make_jobs(tmp_path, urls))]
+
+        assert len(results) == 12 and all(results)
+        assert peak <= 2
+
+    @pytest.mark.parametrize("convert_workers", [0, 2])
+    def test_localize_off_writer_thread(self, tmp_path, convert_workers):
+        """测试图片在下载线程或独立线程池中本地化，不占用写入线程"""
+
+        class FakeAssets:
+            def __init__(self):
+                self.threads: list[threading.Thread] = []
+
+            def localize(self, markdown: str, save_path: Path) -> str:
+                self.threads.append(threading.current_thread())
+                return markdown + "\n![](../assets/a.png)"
+
+        assets = FakeAssets()
+        downloader = ArticleDownloader(min_file_size="1B", asset_downloader=assets)
+        pipeline = ArticlePipeline(
+            downloader, fake_fetch, io_workers=2, convert_workers=convert_workers
+        )
+        urls = [f"https://mp.weixin.qq.com/s/{i}" for i in range(4)]
+
+        results = [result for _, result in pipeline.run(make_jobs(tmp_path, urls))]
+
+        assert all(results)
+        assert len(assets.threads) == 4
+        assert threading.current_thread() not in assets.threads
+        content = (tmp_path / "0.md").read_text(encoding="utf-8")
+        assert content.endswith("![](../assets/a.png)")
+
+
+
+class TestArticleJobFrame:
+    """测试 article_job_frame / iter_article_jobs"""
+
+    def test_sanitize_filenames_matches_scalar(self):
+        """测试批量清理与逐个清理的结果相同"""
+        names = ["a/b:c", " .隐藏. ", "\x01控制\x1f字符", "", "...", "长" * 300, None]
+        expected = [sanitize_filename(name or "") for name in names]
+
+        assert sanitize_filenames(pd.Series(names)).tolist() == expected
+
+    def test_jobs(self, tmp_path):
+        """测试排除标题（按字面匹配）、路径拼接和元数据"""
+        df = pd.DataFrame(
+            {
+                "title": ["正常/文章", "广告 (推广)", "另一篇", "[置顶] 通知"],
+                "link": ["u0", "u1", "u2", "u3"],
+                "nickname": ["公众号:A", "公众号:A", "公众号B", "公众号B"],
+                "create_time": pd.to_datetime(["2026-01-01 08:00:00"] * 4),
+                "digest": ["摘要", None, "摘要2", ""],
+            }
+        )
+
+        frame = article_job_frame(df, tmp_path, "md", exclude_titles=["(推广)", "[置顶]"])
+        jobs = list(iter_article_jobs(frame))
+
+        assert [job.url for job in jobs] == ["u0", "u2"]
+        assert jobs[0].save_path == tmp_path / "公众号_A" / "正常_文章.md"
+        assert jobs[0].metadata == ArticleMetadata(
+            title="正常/文章",
+            date_str="2026-01-01 08:00:00",
+            link="u0",
+            account_name="公众号:A",
+            digest="摘要",
+        )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
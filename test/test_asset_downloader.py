@@ -0,0 +1,109 @@
+"""测试 asset_downloader 模块"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加 src 到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from wxmp.api.rate_limit import RateLimiter
+from wxmp.tools.asset_downloader import AssetDownloader
+
+
+class FakeResponse:
+    def __init__(
+        self, content: bytes, content_type: str = "image/png", status_code: int = 0
+    ):
+        self.content = content
+        self.status_code = status_code or (200 if content else 404)
+        self.headers = {"Content-Type": content_type}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise ConnectionError(str(self.status_code))
+
+
+class FakeSession:
+    """按 URL 返回预设的图片内容，并记录请求次数"""
+
+    def __init__(self, images: dict[str, bytes]):
+        self.images = images
+        self.calls: list[str] = []
+
+    def get(self, url, headers=None, timeout=None) -> FakeResponse:
+        self.calls.append(url)
+        return FakeResponse(self.images.get(url, b""))
+
+
+MARKDOWN = """![](https://mmbiz.qpic.cn/logo.png#imgIndex=0)
+正文
+![](https://mmbiz.qpic.cn/banner?wx_fmt=png)
+![](https://mmbiz.qpic.cn/missing.png)
+![](https://mmbiz.qpic.cn/logo.png)"""
+
+
+class TestAssetDownloader:
+    """测试 AssetDownloader 类"""
+
+    def test_localize_and_dedup(self, tmp_path):
+        """测试下载图片、改写链接，相同内容只保存一份"""
+        session = FakeSession(
+            {
+                "https://mmbiz.qpic.cn/logo.png": b"same image",
+                "https://mmbiz.qpic.cn/banner?wx_fmt=png": b"same image",
+            }
+        )
+        with AssetDownloader(tmp_path / "assets", session=session) as assets:
+            markdown = assets.localize(MARKDOWN, tmp_path / "公众号" / "文章.md")
+
+        files = [p for p in (tmp_path / "assets").rglob("*.png")]
+        assert len(files) == 1
+        local = f"../assets/{files[0].relative_to(tmp_path / 'assets').as_posix()}"
+        assert markdown.count(f"![]({local})") == 3
+        assert "![](https://mmbiz.qpic.cn/missing.png)" in markdown
+        # logo.png 的两种写法只请求一次
+        assert sorted(session.calls) == sorted(
+            [
+                "https://mmbiz.qpic.cn/logo.png",
+                "https://mmbiz.qpic.cn/banner?wx_fmt=png",
+                "https://mmbiz.qpic.cn/missing.png",
+            ]
+        )
+
+    def test_index_skips_downloaded(self, tmp_path):
+        """测试重新创建下载器后，已下载的 URL 不再请求"""
+        images = {"https://mmbiz.qpic.cn/logo.png": b"image"}
+        with AssetDownloader(tmp_path, session=FakeSession(images)) as assets:
+            first = assets.localize(MARKDOWN, tmp_path / "a.md")
+
+        session = FakeSession(images)
+        with AssetDownloader(tmp_path, session=session) as assets:
+            second = assets.localize(MARKDOWN, tmp_path / "a.md")
+
+        assert first == second
+        assert "https://mmbiz.qpic.cn/logo.png" not in session.calls
+
+    def test_asset_bucket(self, tmp_path):
+        """测试图片请求使用 asset 令牌桶：成功时提速，429 时降速"""
+        limiter = RateLimiter({"asset": (100.0, 200.0)})
+        bucket = limiter.bucket("asset")
+        session = FakeSession({"https://mmbiz.qpic.cn/logo.png": b"image"})
+        with AssetDownloader(tmp_path, session=session, rate_limiter=limiter) as assets:
+            assets.localize("![](https://mmbiz.qpic.cn/logo.png)", tmp_path / "a.md")
+            assert bucket.rate == 110.0
+
+            session.get = lambda url, headers=None, timeout=None: FakeResponse(
+                b"", status_code=429
+            )
+            markdown = assets.localize(
+                "![](https://mmbiz.qpic.cn/other.png)", tmp_path / "a.md"
+            )
+
+        assert markdown == "![](https://mmbiz.qpic.cn/other.png)"
+        assert bucket.rate == 55.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,224 @@
+"""测试 async_index 模块"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+# 添加 src 到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from wxmp.api import (
+    AsyncWxMPAPI,
+    FrequencyControlError,
+    ListExError,
+    RateLimiter,
+    SearchBizError,
+    TokenError,
+)
+
+HOME = "https://mp.weixin.qq.com/cgi-bin/home?t=home/index&lang=zh_CN&token=123456"
+
+
+def account(fakeid: str) -> dict:
+    return {
+        "fakeid": fakeid,
+        "nickname": "示例公众号",
+        "alias": "",
+        "round_head_img": "",
+        "service_type": 1,
+        "signature": "",
+        "verify_status": 0,
+    }
+
+
+def fast_limiter(**kwargs) -> RateLimiter:
+    """速率足够高、暂停时间足够短的限流器，测试不会因限流等待"""
+    limiter = RateLimiter(
+        {name: (1000.0, 1000.0) for name in ("searchbiz", "appmsg", "article")},
+        **kwargs,
+    )
+    for name in ("searchbiz", "appmsg", "article"):
+        limiter.bucket(name).base_backoff = 0.001
+        limiter.bucket(name)._backoff = 0.001
+    return limiter
+
+
+def make_api(handler, **kwargs) -> AsyncWxMPAPI:
+    """使用 MockTransport 的客户端，handler 接收 httpx.Request 返回 httpx.Response"""
+    api = AsyncWxMPAPI(
+        {"slave_sid": "sid", "slave_user": "user"},
+        transport=httpx.MockTransport(handler),
+        rate_limiter=kwargs.pop("rate_limiter", None) or fast_limiter(),
+        **kwargs,
+    )
+    api.token = "123456"
+    return api
+
+
+def run(api: AsyncWxMPAPI, coro_func):
+    """在事件循环中执行请求并关闭连接池"""
+
+    async def main():
+        async with api:
+            return await coro_func(api)
+
+    return asyncio.run(main())
+
+
+class TestAsyncWxMPAPI:
+    """测试 AsyncWxMPAPI 类"""
+
+    def test_fetch_token_from_redirect(self):
+        """测试跟随重定向后从 URL 中提取 token"""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/":
+                return httpx.Response(302, headers={"Location": HOME})
+            return httpx.Response(200, text="<html></html>")
+
+        api = make_api(handler)
+        api.token = None
+
+        assert run(api, lambda api: api._fetch_token()) == "123456"
+        assert api.token == "123456"
+
+    def test_fetch_token_error(self):
+        """测试 HTTP 错误映射为 TokenError"""
+        api = make_api(lambda request: httpx.Response(500))
+
+        with pytest.raises(TokenError, match="HTTP请求失败: 500"):
+            run(api, lambda api: api._fetch_token())
+
+    def test_search_biz_request(self):
+        """测试请求参数、Cookie 和响应解析"""
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(
+                200,
+                json={"base_resp": {"ret": 0}, "arr": [account("fid")], "total": 1},
+            )
+
+        api = make_api(handler)
+        result = run(api, lambda api: api.fetch_fakeid("示例", count=3))
+
+        assert result.arr[0].fakeid == "fid"
+        request = requests[0]
+        assert request.url.path == "/cgi-bin/searchbiz"
+        assert request.url.params["action"] == "search_biz"
+        assert request.url.params["query"] == "示例"
+        assert request.url.params["count"] == "3"
+        assert request.url.params["token"] == "123456"
+        assert request.headers["Cookie"] == "slave_sid=sid; slave_user=user"
+
+    def test_search_biz_http_error(self):
+        """测试接口 HTTP 错误映射为 SearchBizError"""
+        api = make_api(lambda request: httpx.Response(502))
+
+        with pytest.raises(SearchBizError, match="HTTP请求失败: 502"):
+            run(api, lambda api: api.fetch_fakeid("示例"))
+
+    def test_article_list_invalid_json(self):
+        """测试响应不是合法 JSON 时映射为 ListExError"""
+        api = make_api(lambda request: httpx.Response(200, text="<html>"))
+
+        with pytest.raises(ListExError, match="解析JSON响应时发生错误"):
+            run(api, lambda api: api.fetch_article_list("fid"))
+
+    def test_retries_after_freq_control(self):
+        """测试频率限制返回码触发限流器降速并重试"""
+        responses = [
+            {"base_resp": {"ret": 200013, "err_msg": "freq control"}},
+            {"base_resp": {"ret": 0}, "arr": [], "total": 0},
+        ]
+        limiter = fast_limiter()
+        api = make_api(
+            lambda request: httpx.Response(200, json=responses.pop(0)),
+            rate_limiter=limiter,
+        )
+
+        result = run(api, lambda api: api.fetch_fakeid("示例"))
+
+        assert result.total == 0
+        assert responses == []
+        # 限流时减半，随后的成功响应线性增加 5%
+        assert limiter.bucket("searchbiz").rate == 550.0
+
+    @pytest.mark.parametrize("method", ["fetch_fakeid", "fetch_article_list"])
+    def test_gives_up_after_throttle_retries(self, method):
+        """测试重试次数用尽后抛出 FrequencyControlError，不被包装为接口异常"""
+        api = make_api(
+            lambda request: httpx.Response(200, json={"base_resp": {"ret": 200013}}),
+            rate_limiter=fast_limiter(max_throttle_retries=1),
+        )
+
+        with pytest.raises(FrequencyControlError):
+            run(api, lambda api: getattr(api, method)("fid"))
+
+    def test_article_content_without_cookie(self):
+        """测试文章页面请求不携带登录 Cookie"""
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, text="<html>文章</html>")
+
+        api = make_api(handler)
+        html = run(
+            api, lambda api: api.fetch_article_content("https://mp.weixin.qq.com/s/a")
+        )
+
+        assert html == "<html>文章</html>"
+        assert "Cookie" not in requests[0].headers
+
+    def test_article_bucket_ramps_up(self):
+        """测试文章页面的状态码上报给限流器，429 降速，成功后逐步提速"""
+        statuses = [429, 200, 200]
+        limiter = fast_limiter()
+        api = make_api(
+            lambda request: httpx.Response(statuses.pop(0), text="<html></html>"),
+            rate_limiter=limiter,
+        )
+
+        async def fetch(api: AsyncWxMPAPI) -> list:
+            results = []
+            for _ in range(3):
+                try:
+                    results.append(await api.fetch_article_content("https://a/s"))
+                except httpx.HTTPStatusError as e:
+                    results.append(e.response.status_code)
+            return results
+
+        assert run(api, fetch) == [429, "<html></html>", "<html></html>"]
+        assert limiter.bucket("article").rate == 600.0
+
+    def test_concurrency_limit(self):
+        """测试同时在途的请求数不超过 concurrency"""
+        active = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.005)
+            active -= 1
+            return httpx.Response(200, text="<html></html>")
+
+        api = make_api(handler, concurrency=3)
+        links = [f"https://mp.weixin.qq.com/s/{i}" for i in range(12)]
+
+        async def fetch_all(api: AsyncWxMPAPI) -> list:
+            return [item async for item in api.iter_multi_article_content(links)]
+
+        assert len(run(api, fetch_all)) == 12
+        assert peak <= 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
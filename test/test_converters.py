@@ -0,0 +1,46 @@
+"""测试 converters 模块"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加 src 到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from wxmp.tools.article_downloader import ArticleDownloader
+from wxmp.tools.converters import HTMLToMarkdownConverter
+
+# 默认转换器的输出，已保存的 Markdown 依赖于此，修改前需要在更新日志中说明
+DEFAULT_HTML = """<div id="js_content"><h2 style="x">标题 &amp; <span>副标题</span></h2>
+<section><p>第一段 <strong>加粗</strong>，&nbsp;多个   空格</p>
+<p><img data-src="https://mmbiz.qpic.cn/a.png" src="data:x"></p>
+<ul><li>一</li><li>二 <code>x</code></li></ul><p>结尾<br/>第二行</p></section></div>"""
+
+DEFAULT_EXPECTED = """## 标题 & 副标题
+
+第一段 **加粗**， 多个 空格
+
+![](https://mmbiz.qpic.cn/a.png)
+
+- 一
+- 二 `x`
+
+结尾
+第二行"""
+
+
+class TestHTMLToMarkdownConverter:
+    """测试默认的 HTMLToMarkdownConverter 输出保持不变"""
+
+    def test_downloader_default(self):
+        """测试 ArticleDownloader 默认使用 HTMLToMarkdownConverter"""
+        assert type(ArticleDownloader().converter) is HTMLToMarkdownConverter
+
+    def test_golden_output(self):
+        """测试默认转换器的输出与之前保存的文件一致"""
+        assert HTMLToMarkdownConverter().convert(DEFAULT_HTML) == DEFAULT_EXPECTED
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,106 @@
+"""测试 download_journal 模块"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加 src 到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from wxmp.tools.article_downloader import (
+    ArticleDownloader,
+    ArticleMetadata,
+    DownloadResult,
+)
+from wxmp.tools.article_pipeline import ArticleJob, ArticlePipeline
+from wxmp.tools.download_journal import DONE, FAILED, DownloadJournal
+
+
+def make_jobs(tmp_path: Path, urls: list[str]) -> list[ArticleJob]:
+    return [
+        ArticleJob(url=url, save_path=tmp_path / f"{i}.md", metadata=ArticleMetadata())
+        for i, url in enumerate(urls)
+    ]
+
+
+class TestDownloadJournal:
+    """测试 DownloadJournal 类"""
+
+    def test_record_and_reload(self, tmp_path):
+        """测试记录追加写入，重新加载时同一 URL 以最后一条为准，请求次数累计"""
+        path = tmp_path / "journal.jsonl"
+        journal = DownloadJournal(path)
+        journal.record("a", DownloadResult(False, 3, "ConnectionError: a"))
+        journal.record("b", DownloadResult(True, 1, size=100))
+        journal.record("a", DownloadResult(True, 1, size=200))
+
+        reloaded = DownloadJournal(path, compact=False)
+
+        assert len(path.read_text(encoding="utf-8").splitlines()) == 3
+        assert reloaded.get("a").status == DONE
+        assert reloaded.get("a").attempts == 4
+        assert reloaded.get("a").size == 200
+        assert reloaded.urls(DONE) == {"a", "b"}
+
+    def test_truncated_line_and_compact(self, tmp_path):
+        """测试忽略不完整的最后一行，过期记录过多时自动压缩"""
+        path = tmp_path / "journal.jsonl"
+        journal = DownloadJournal(path)
+        for _ in range(3):
+            journal.record("a", DownloadResult(False, 1, "timeout"))
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"url": "b", "sta')
+
+        reloaded = DownloadJournal(path)
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["attempts"] == 3
+        assert "b" not in reloaded
+
+    def test_pending(self, tmp_path):
+        """测试过滤已完成的任务、只重试失败任务和失效链接"""
+        journal = DownloadJournal(tmp_path / "journal.jsonl")
+        journal.record("done", DownloadResult(True, 1, size=10))
+        journal.record("failed", DownloadResult(False, 1, "timeout"))
+        journal.record("dead", DownloadResult(False, 5, "HTTPError: 404"))
+        jobs = make_jobs(tmp_path, ["done", "failed", "dead", "new"])
+
+        def urls(pending):
+            return [job.url for job in pending]
+
+        assert urls(journal.pending(jobs)) == ["failed", "dead", "new"]
+        assert urls(journal.pending(jobs, retry_failed_only=True)) == ["failed", "dead"]
+        assert urls(journal.pending(jobs, max_attempts=5)) == ["failed", "new"]
+
+    def test_pipeline_resume(self, tmp_path):
+        """测试流水线写入日志，重新运行时只处理失败的任务"""
+        calls: list[str] = []
+
+        def fetch(url: str, timeout: int) -> str:
+            calls.append(url)
+            if url.startswith("fail"):
+                raise TimeoutError(url)
+            return f'<div id="js_content"><p>{url}</p></div>'
+
+        journal = DownloadJournal(tmp_path / "journal.jsonl")
+        downloader = ArticleDownloader(max_retries=2, retry_delay=0, min_file_size="1B")
+        pipeline = ArticlePipeline(downloader, fetch, io_workers=2, journal=journal)
+        jobs = make_jobs(tmp_path, ["ok1", "fail1", "ok2"])
+
+        list(pipeline.run(journal.pending(jobs)))
+        calls.clear()
+        results = list(pipeline.run(journal.pending(jobs)))
+
+        assert calls == ["fail1", "fail1"]
+        assert [job.url for job, _ in results] == ["fail1"]
+        assert journal.get("fail1").status == FAILED
+        assert journal.get("fail1").attempts == 4
+        assert journal.get("fail1").error == "TimeoutError: fail1"
+        assert journal.get("ok1").size == (tmp_path / "0.md").stat().st_size
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,138 @@
+"""测试 fakeid_resolver 模块"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import requests
+
+# 添加 src 到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from wxmp.api import SearchBizError
+from wxmp.api.search_biz import SearchBizResponse
+from wxmp.spider.fakeid_resolver import FakeidResolver, normalize_name
+
+ACCOUNTS = {
+    "python编程": [("Python编程", "fid_py", "pythoncoding")],
+    "数据分析": [("数据分析入门", "fid_other", ""), ("数据分析", "fid_da", "")],
+}
+
+
+def account(nickname: str, fakeid: str, alias: str) -> dict:
+    return {
+        "fakeid": fakeid,
+        "nickname": nickname,
+        "alias": alias,
+        "round_head_img": "",
+        "service_type": 1,
+        "signature": "",
+        "verify_status": 0,
+    }
+
+
+class FakeAPI:
+    """按归一化的查询词返回预设的搜索结果，记录请求和最大并发数"""
+
+    def __init__(self, delay: float = 0.0):
+        self.session = requests.Session()
+        self.calls: list[str] = []
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def fetch_fakeid(self, query: str) -> SearchBizResponse:
+        with self._lock:
+            self.calls.append(query)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if query == "出错":
+                raise SearchBizError("HTTP请求失败: 500")
+            if query == "系统繁忙":
+                return SearchBizResponse(
+                    base_resp={"ret": -1, "err_msg": "system error"}, arr=[], total=0
+                )
+            arr = [account(*item) for item in ACCOUNTS.get(normalize_name(query), [])]
+            return SearchBizResponse(base_resp={"ret": 0}, arr=arr, total=len(arr))
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class TestFakeidResolver:
+    """测试 FakeidResolver 类"""
+
+    def test_normalize_name(self):
+        """测试全角、大小写和空白归一化"""
+        assert normalize_name("ＰＹＴＨＯＮ 编程") == normalize_name("python编程")
+
+    def test_resolve_and_persist(self, tmp_path):
+        """测试解析结果立即写入缓存，优先选择名称完全一致的结果"""
+        api = FakeAPI()
+        cache_file = tmp_path / "fakeids.json"
+        resolver = FakeidResolver(api, cache_file)
+
+        bizs = resolver.resolve(["Python编程", "数据分析", "不存在", "出错"])
+
+        assert bizs == {"Python编程": "fid_py", "数据分析": "fid_da"}
+        assert json.loads(cache_file.read_text(encoding="utf-8")) == bizs
+
+    def test_variants_and_negative_cache(self, tmp_path):
+        """测试名称变体、微信号命中缓存，结果为空的名称在 TTL 内不再搜索"""
+        cache_file = tmp_path / "fakeids.json"
+        FakeidResolver(FakeAPI(), cache_file).resolve(["Python编程", "不存在", "出错"])
+
+        api = FakeAPI()
+        resolver = FakeidResolver(api, cache_file)
+        bizs = resolver.resolve(["ＰＹＴＨＯＮ 编程", "PythonCoding", "不存在", "出错"])
+
+        assert bizs == {"Python编程": "fid_py"}
+        # 搜索失败不缓存，下次仍然重新搜索
+        assert api.calls == ["出错"]
+
+        expired = FakeidResolver(FakeAPI(), cache_file, negative_ttl=0)
+        assert not expired.is_known_miss("不存在")
+
+    def test_error_ret_not_cached(self, tmp_path):
+        """测试返回码不为 0 的空结果不缓存为搜索结果为空，下次仍然重新搜索"""
+        cache_file = tmp_path / "fakeids.json"
+        resolver = FakeidResolver(FakeAPI(), cache_file)
+
+        assert resolver.resolve(["系统繁忙"]) == {}
+        assert not resolver.is_known_miss("系统繁忙")
+
+        api = FakeAPI()
+        FakeidResolver(api, cache_file).resolve(["系统繁忙"])
+        assert api.calls == ["系统繁忙"]
+
+    def test_keeps_other_cached_accounts(self, tmp_path):
+        """测试只解析部分名称时，缓存中的其他公众号不会丢失"""
+        cache_file = tmp_path / "fakeids.json"
+        cache_file.write_text(json.dumps({"旧公众号": "fid_old"}), encoding="utf-8")
+
+        FakeidResolver(FakeAPI(), cache_file).resolve(["数据分析"])
+
+        assert json.loads(cache_file.read_text(encoding="utf-8")) == {
+            "旧公众号": "fid_old",
+            "数据分析": "fid_da",
+        }
+
+    def test_concurrent(self, tmp_path):
+        """测试多个名称并发搜索，同一名称的变体只搜索一次"""
+        api = FakeAPI(delay=0.05)
+        resolver = FakeidResolver(api, tmp_path / "fakeids.json", max_workers=4)
+
+        resolver.resolve(["python编程", "Python 编程", "数据分析", "a", "b", "c"])
+
+        assert len(api.calls) == 5
+        assert api.max_active > 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
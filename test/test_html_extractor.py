@@ -0,0 +1,72 @@
+"""测试 html_extractor 模块"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# 添加 src 到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from wxmp.tools.article_downloader import ArticleMetadata
+from wxmp.tools.html_extractor import ContentExtractor, extract_article
+
+PAGE_HTML = """<html><head>
+<meta property="og:title" content="标题 &amp; 副标题" />
+<meta name="author" content="作者" />
+</head><body><div class="rich_media_area">
+<div class="rich_media_content" id="js_content" style="visibility: hidden;">
+<section><div>第一段</div><div>第二段<div>嵌套</div></div></section><p>结尾</p>
+</div></div>
+<script>var ct = "1700000000"; var a = "</div>";</script>
+</body></html>"""
+
+CONTENT = """
+<section><div>第一段</div><div>第二段<div>嵌套</div></div></section><p>结尾</p>
+"""
+
+
+class TestExtractArticle:
+    """测试 extract_article 函数"""
+
+    def test_nested_div(self):
+        """测试嵌套 div 不会截断正文，并提取标题、作者和发布时间"""
+        article = extract_article(PAGE_HTML)
+
+        assert article.found
+        assert article.content == CONTENT
+        assert article.title == "标题 & 副标题"
+        assert article.author == "作者"
+        assert article.publish_time == datetime.fromtimestamp(1700000000)
+
+    def test_fallback(self):
+        """测试找不到 js_content 时使用 body 内容，没有 body 时使用整个页面"""
+        assert extract_article("<body><p>正文</p></body>").content == "<p>正文</p>"
+        assert extract_article("纯文本").content == "纯文本"
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 100])
+    def test_stream(self, chunk_size):
+        """测试分块输入的结果与一次性提取相同"""
+        parts: list[str] = []
+        extractor = ContentExtractor(parts.append)
+        for i in range(0, len(PAGE_HTML), chunk_size):
+            extractor.feed(PAGE_HTML[i : i + chunk_size])
+        article = extractor.close()
+
+        assert "".join(parts) == CONTENT
+        assert article.publish_time == datetime.fromtimestamp(1700000000)
+
+    def test_metadata_merge(self):
+        """测试元数据缺少的字段由页面信息补全"""
+        metadata = ArticleMetadata(title="已有标题").merge(extract_article(PAGE_HTML))
+
+        assert metadata.title == "已有标题"
+        assert metadata.author == "作者"
+        assert metadata.date_str == datetime.fromtimestamp(1700000000).strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
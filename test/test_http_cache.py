@@ -0,0 +1,199 @@
+"""测试 http_cache 模块"""
+
+import sys
+import zlib
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# 添加 src 到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from wxmp.api import RateLimiter, WxMPAPI
+from wxmp.spider.time_range_spider import TimeRangeSpider
+from wxmp.tools.http_cache import CacheMissError, HTMLCache
+
+URL = "http://mp.weixin.qq.com/s?__biz=MzA&mid=1&idx=2&sn=abc&chksm=xyz&scene=21#rd"
+ARTICLE = '<html><div id="js_content"><p>正文</p></div></html>'
+VERIFY = "<html><body><p>环境异常</p><p>完成验证后即可继续访问</p></body></html>"
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, text: str = "", headers: dict | None = None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = {"Content-Type": "text/html; charset=utf-8", **(headers or {})}
+        self.encoding = "utf-8"
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise ConnectionError(self.status_code)
+
+    def iter_content(self, chunk_size: int):
+        data = self.text.encode("utf-8")
+        for i in range(0, len(data), chunk_size):
+            yield data[i : i + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """替换 WxMPAPI.fetch_article_response，记录每次请求的请求头"""
+    requests: list[dict] = []
+    page = "<html>" + "文章内容" * 5000 + "</html>"
+
+    def fake_response(link, timeout=10, headers=None, stream=False, rate_limiter=None):
+        headers = headers or {}
+        requests.append(headers)
+        if headers.get("If-None-Match") == '"v1"':
+            return FakeResponse(304)
+        return FakeResponse(200, page, {"ETag": '"v1"'})
+
+    monkeypatch.setattr(WxMPAPI, "fetch_article_response", staticmethod(fake_response))
+    return requests, page
+
+
+class TestHTMLCache:
+    """测试 HTMLCache 类"""
+
+    def test_normalize_url(self):
+        """测试只保留确定文章的参数"""
+        assert HTMLCache.normalize_url(URL) == (
+            "https://mp.weixin.qq.com/s?__biz=MzA&idx=2&mid=1&sn=abc"
+        )
+        assert HTMLCache.key(URL) == HTMLCache.key(URL.replace("scene=21", "scene=7"))
+
+    @pytest.mark.parametrize("method", ["fetch", "stream"])
+    def test_hit_without_network(self, tmp_path, server, method):
+        """测试第二次获取直接读取缓存，不访问网络"""
+        requests, page = server
+        cache = HTMLCache(tmp_path)
+
+        def get() -> str:
+            result = getattr(cache, method)(URL)
+            return result if method == "fetch" else "".join(result)
+
+        assert get() == page
+        assert get() == page
+        assert len(requests) == 1
+        assert cache.size() < len(page.encode("utf-8"))
+
+    def test_revalidate(self, tmp_path, server):
+        """测试 revalidate 模式发送条件请求，304 时使用缓存"""
+        requests, page = server
+        HTMLCache(tmp_path).fetch(URL)
+
+        assert HTMLCache(tmp_path, revalidate=True).fetch(URL) == page
+        assert requests[-1] == {"If-None-Match": '"v1"'}
+
+    def test_offline_miss(self, tmp_path, server):
+        """测试离线模式未命中时抛出 CacheMissError"""
+        with pytest.raises(CacheMissError):
+            HTMLCache(tmp_path, offline=True).fetch(URL)
+        assert server[0] == []
+
+    @pytest.mark.parametrize("method", ["fetch", "stream"])
+    def test_throttle_page_not_cached(self, tmp_path, monkeypatch, method):
+        """测试访问频繁的提示页不写入缓存，下次请求重新下载"""
+        pages = [VERIFY, ARTICLE]
+        requests = []
+
+        def fake_response(link, timeout=10, headers=None, **kwargs):
+            requests.append(link)
+            return FakeResponse(200, pages.pop(0))
+
+        monkeypatch.setattr(
+            WxMPAPI, "fetch_article_response", staticmethod(fake_response)
+        )
+        cache = HTMLCache(tmp_path)
+
+        def get() -> str:
+            result = getattr(cache, method)(URL)
+            return result if method == "fetch" else "".join(result)
+
+        assert get() == VERIFY
+        assert URL not in cache
+        assert get() == ARTICLE
+        assert get() == ARTICLE
+        assert len(requests) == 2
+
+    @pytest.mark.parametrize("method", ["fetch", "stream"])
+    def test_cached_throttle_page_evicted(self, tmp_path, server, method):
+        """测试已缓存的提示页（如旧版本写入的）读取时删除并重新下载"""
+        requests, page = server
+        cache = HTMLCache(tmp_path)
+        key = cache.key(URL)
+        data = zlib.compress(VERIFY.encode("utf-8"))
+        cache._path(key).parent.mkdir(parents=True, exist_ok=True)
+        cache._path(key).write_bytes(data)
+        cache._commit(key, URL, None, None, len(data))
+
+        result = getattr(cache, method)(URL)
+
+        assert (result if method == "fetch" else "".join(result)) == page
+        assert len(requests) == 1
+        assert cache.get(URL) == page
+
+    def test_lru_eviction(self, tmp_path):
+        """测试超过大小上限时淘汰最久未访问的条目"""
+        cache = HTMLCache(tmp_path, max_size="3KB", compress_level=0)
+        for i in range(3):
+            cache.put(f"https://example.com/{i}", "x" * 800)
+        cache.get("https://example.com/0")
+        cache.put("https://example.com/3", "x" * 800)
+
+        assert "https://example.com/0" in cache
+        assert "https://example.com/1" not in cache
+        assert cache.size() <= 3 * 1024
+
+    def test_running_total(self, tmp_path, monkeypatch):
+        """测试总大小增量维护，未超过上限时写入不统计全表"""
+        cache = HTMLCache(tmp_path, max_size="3KB", compress_level=0)
+        sums = []
+        real_sum = cache._sum_size
+        monkeypatch.setattr(cache, "_sum_size", lambda: sums.append(1) or real_sum())
+        cache.put("https://example.com/0", "x" * 800)
+        cache.put("https://example.com/0", "x" * 900)
+        cache.put("https://example.com/1", "x" * 800)
+        cache.evict("https://example.com/1")
+
+        assert sums == []
+        assert cache._total == cache.size()
+
+        for i in range(2, 5):
+            cache.put(f"https://example.com/{i}", "x" * 800)
+
+        assert cache._total == cache.size() <= 3 * 1024
+        assert HTMLCache(tmp_path)._total == cache._total
+
+    def test_save_all_shares_rate_limiter(self, tmp_path, server):
+        """测试 save_all_article_content 的限流器同时用于缓存和页面检查"""
+        limiter = RateLimiter({"article": (10.0, 50.0)})
+        cache = HTMLCache(tmp_path / "cache")
+        df = pd.DataFrame(
+            {
+                "title": ["文章"],
+                "link": [URL],
+                "nickname": ["公众号"],
+                "create_time": ["2024-01-01 08:00:00"],
+                "digest": [""],
+            }
+        )
+
+        TimeRangeSpider.save_all_article_content(
+            df, tmp_path / "out", html_cache=cache, rate_limiter=limiter
+        )
+
+        assert cache.rate_limiter is limiter
+        assert limiter.bucket("article").rate == 12.5
+        assert (tmp_path / "out" / "公众号" / "文章.md").exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,211 @@
+"""测试 list_ex 响应模型"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加 src 到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from wxmp.api import fast_json
+from wxmp.api.list_ex import ArticleListItem, ListExPublishResponse
+
+
+def make_appmsgex(appmsgid: int, idx: int, link: str = "") -> dict:
+    return {
+        "aid": f"{appmsgid}_{idx}",
+        "title": f"文章{appmsgid}_{idx}",
+        "cover": "https://mmbiz.qpic.cn/cover.jpg",
+        "link": link or f"https://mp.weixin.qq.com/s?__biz=x&mid={appmsgid}&idx={idx}",
+        "digest": "摘要",
+        "update_time": 1700000000 + appmsgid,
+        "appmsgid": appmsgid,
+        "itemidx": idx,
+        "create_time": 1700000000 + appmsgid,
+        "tagid": ["1", "2"],
+    }
+
+
+def make_response(groups: list[list[dict]]) -> ListExPublishResponse:
+    """构造双重编码的 appmsgpublish 响应"""
+    publish_list = [
+        {
+            "publish_type": 101,
+            "publish_info": json.dumps(
+                {
+                    "type": 9,
+                    "msgid": i,
+                    "sent_info": {
+                        "time": 1700000000,
+                        "func_flag": 0,
+                        "is_send_all": True,
+                        "is_published": 1,
+                    },
+                    "appmsgex": items,
+                }
+            ),
+        }
+        for i, items in enumerate(groups)
+    ]
+    page = {
+        "total_count": 100,
+        "publish_count": 10,
+        "masssend_count": 90,
+        "publish_list": publish_list,
+    }
+    return ListExPublishResponse(
+        base_resp={"ret": 0, "err_msg": "ok"}, publish_page=json.dumps(page)
+    )
+
+
+def edit_publish_info(response: ListExPublishResponse, index: int, func) -> dict:
+    """修改第 index 条发布记录的 publish_info，返回重新编码后的响应 JSON"""
+    data = response.model_dump()
+    page = json.loads(data["publish_page"])
+    info = json.loads(page["publish_list"][index]["publish_info"])
+    func(info)
+    page["publish_list"][index]["publish_info"] = json.dumps(info)
+    data["publish_page"] = json.dumps(page)
+    return data
+
+
+class TestListExPublishResponse:
+    """测试 ListExPublishResponse 的文章视图"""
+
+    def test_flattened_articles(self):
+        """多图文消息展平后的数量和顺序"""
+        response = make_response(
+            [[make_appmsgex(1, 1), make_appmsgex(1, 2)], [make_appmsgex(2, 1)]]
+        )
+        assert response.app_msg_cnt == 3
+        assert [a.aid for a in response.app_msg_list] == ["1_1", "1_2", "2_1"]
+        assert [a.aid for _, a in response.get_all_articles()] == ["1_1", "1_2", "2_1"]
+        assert len(response.get_article_links()) == 3
+        assert response.total_count == 100
+
+    def test_app_msg_list_memoized(self):
+        """多次访问返回同一个列表，内容与逐项校验构造的一致"""
+        response = make_response([[make_appmsgex(1, 1)]])
+        first = response.app_msg_list
+        assert response.app_msg_list is first
+
+        expected = ArticleListItem(**make_appmsgex(1, 1))
+        assert first[0] == expected
+        assert first[0].model_dump() == expected.model_dump()
+
+    def test_lookup(self):
+        """按链接和 aid 查找文章"""
+        link = "https://mp.weixin.qq.com/s/abc"
+        response = make_response([[make_appmsgex(1, 1, link), make_appmsgex(1, 2)]])
+        assert response.get_article_by_link(link).aid == "1_1"
+        assert response.get_article_by_aid("1_2").itemidx == 2
+        assert response.get_article_by_link("https://example.com") is None
+        assert response.get_article_by_aid("9_9") is None
+
+    def test_empty_and_invalid_page(self):
+        """publish_page 为空或无法解析时没有文章"""
+        empty = ListExPublishResponse(base_resp={"ret": 0})
+        assert empty.app_msg_cnt == 0
+        assert empty.app_msg_list == []
+
+        invalid = ListExPublishResponse(base_resp={"ret": 0}, publish_page="{bad")
+        assert invalid.get_article_links() == []
+
+    def test_get_all_articles_returns_copy(self):
+        """修改 get_all_articles 的结果不影响缓存"""
+        response = make_response([[make_appmsgex(1, 1)]])
+        response.get_all_articles().clear()
+        assert response.app_msg_cnt == 1
+
+
+class TestParseLean:
+    """测试 appmsgpublish 响应的精简解析"""
+
+    def test_same_as_full_parse(self):
+        """精简解析的文章列表、数量和分页信息与完整解析一致"""
+        full = make_response(
+            [[make_appmsgex(1, 1), make_appmsgex(1, 2)], [make_appmsgex(2, 1)]]
+        )
+        lean = ListExPublishResponse.parse_lean(full.model_dump())
+        assert lean.app_msg_list == full.app_msg_list
+        assert lean.app_msg_cnt == 3
+        assert lean.get_article_links() == full.get_article_links()
+        assert len(lean.publish_list) == 2
+        assert lean.total_count == 100
+        assert lean.base_resp.ret == 0
+
+    def test_get_all_articles_parses_on_demand(self):
+        """get_all_articles 在需要时补上完整解析"""
+        full = make_response([[make_appmsgex(1, 1), make_appmsgex(1, 2)]])
+        lean = ListExPublishResponse.parse_lean(full.model_dump())
+        articles = lean.get_all_articles()
+        assert [a.aid for _, a in articles] == ["1_1", "1_2"]
+        assert articles[0][0].publish_info_parsed.msgid == 0
+
+    def test_invalid_publish_info_skipped(self):
+        """无法解析的 publish_info 被跳过，与完整解析一致"""
+        bad = make_appmsgex(2, 1)
+        del bad["link"]
+        full = make_response([[make_appmsgex(1, 1)], [bad]])
+        lean = ListExPublishResponse.parse_lean(full.model_dump())
+        assert [a.aid for a in lean.app_msg_list] == ["1_1"]
+        assert [a.aid for a in full.app_msg_list] == ["1_1"]
+        assert len(lean.publish_list) == 2
+
+    @pytest.mark.parametrize(
+        "drop", ["sent_info", "msgid", "type", "appmsg_info.itemidx"]
+    )
+    def test_missing_required_field_skipped(self, drop):
+        """缺少发布信息必填字段的记录在两种解析中都被跳过"""
+
+        def remove(info: dict) -> None:
+            if drop == "appmsg_info.itemidx":
+                info["appmsg_info"] = [{"appmsgid": 2}]
+            else:
+                del info[drop]
+
+        groups = [[make_appmsgex(1, 1)], [make_appmsgex(2, 1)]]
+        data = edit_publish_info(make_response(groups), 1, remove)
+
+        full = ListExPublishResponse(**data)
+        lean = ListExPublishResponse.parse_lean(data)
+
+        assert [a.aid for a in full.app_msg_list] == ["1_1"]
+        assert [a.aid for a in lean.app_msg_list] == ["1_1"]
+
+    def test_optional_field_type_difference(self):
+        """可选字段类型不符时只有完整解析丢弃记录（精简解析不校验跳过的字段）"""
+
+        def bad_album(info: dict) -> None:
+            info["appmsgex"][0]["album_id"] = 123
+
+        groups = [[make_appmsgex(1, 1)], [make_appmsgex(2, 1)]]
+        data = edit_publish_info(make_response(groups), 1, bad_album)
+
+        assert [a.aid for a in ListExPublishResponse(**data).app_msg_list] == ["1_1"]
+        assert [a.aid for a in ListExPublishResponse.parse_lean(data).app_msg_list] == [
+            "1_1",
+            "2_1",
+        ]
+
+    def test_empty_page(self):
+        """publish_page 为空或无法解析"""
+        assert ListExPublishResponse.parse_lean({"base_resp": {"ret": 0}}).app_msg_cnt == 0
+        lean = ListExPublishResponse.parse_lean(
+            {"base_resp": {"ret": 0}, "publish_page": "{bad"}
+        )
+        assert lean.app_msg_list == []
+        assert lean.total_count == 0
+
+    def test_fast_json_loads(self):
+        """fast_json 两种后端的结果和异常类型一致"""
+        assert fast_json.loads('{"a": [1, "中文"]}') == {"a": [1, "中文"]}
+        assert fast_json.loads(b'{"a": 1}') == {"a": 1}
+        with pytest.raises(json.JSONDecodeError):
+            fast_json.loads("{bad")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
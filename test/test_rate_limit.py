@@ -0,0 +1,200 @@
+"""测试 rate_limit 模块"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加 src 到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from wxmp.api import FrequencyControlError, RateLimiter, TokenError, WxMPAPI
+from wxmp.api import index as index_module
+from wxmp.api.rate_limit import TokenBucket
+from wxmp.tools.article_downloader import ArticleDownloader
+
+
+class FakeResponse:
+    def __init__(self, data: dict):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self) -> dict:
+        return self.data
+
+
+class FakePage:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        self.text = "<html></html>"
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeContentSession:
+    """文章页面请求，按顺序返回预设的状态码，用完后一直返回 200"""
+
+    def __init__(self, statuses: list[int] | None = None):
+        self.statuses = list(statuses or [])
+        self.calls = 0
+
+    def get(self, link, **kwargs) -> FakePage:
+        self.calls += 1
+        return FakePage(self.statuses.pop(0) if self.statuses else 200)
+
+
+class FakeSession:
+    """按顺序返回预设的 JSON 响应"""
+
+    def __init__(self, responses: list[dict]):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, **kwargs) -> FakeResponse:
+        self.calls += 1
+        return FakeResponse(self.responses.pop(0))
+
+
+class TestTokenBucket:
+    """测试 TokenBucket 类"""
+
+    def test_reserve_delay(self):
+        """测试令牌耗尽后按速率排队"""
+        bucket = TokenBucket(rate=10.0)
+
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+        assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+    def test_throttle_halves_rate_and_pauses(self):
+        """测试限流后速率减半，并暂停指数增长的时间"""
+        bucket = TokenBucket(rate=8.0, max_rate=16.0, backoff=2.0)
+
+        assert bucket.on_throttle() == 2.0
+        assert bucket.rate == 4.0
+        assert bucket.reserve() >= 1.9
+        assert bucket.on_throttle() == 4.0
+        assert bucket.rate == 2.0
+
+    def test_success_increases_rate(self):
+        """测试成功后速率线性增加且不超过 max_rate"""
+        bucket = TokenBucket(rate=1.0, max_rate=2.0)
+
+        for _ in range(100):
+            bucket.on_success()
+
+        assert bucket.rate == 2.0
+
+
+class TestRateLimiter:
+    """测试 RateLimiter 类"""
+
+    def test_independent_buckets(self):
+        """测试不同接口使用独立的令牌桶"""
+        limiter = RateLimiter()
+
+        assert limiter.bucket("appmsg") is limiter.bucket("appmsg")
+        assert limiter.bucket("appmsg") is not limiter.bucket("searchbiz")
+
+    def test_report(self):
+        """测试返回码识别"""
+        limiter = RateLimiter()
+
+        assert limiter.report("appmsg", 200013) is True
+        assert limiter.report("appmsg", 0) is False
+
+    def test_report_status(self):
+        """测试 HTTP 状态码识别：429 降速，正常响应提速，其他错误不调整"""
+        limiter = RateLimiter({"article": (10.0, 50.0)})
+        bucket = limiter.bucket("article")
+        bucket.base_backoff = bucket._backoff = 0.01
+
+        assert limiter.report_status("article", 200) is False
+        assert bucket.rate == 12.5
+        assert limiter.report_status("article", 404) is False
+        assert bucket.rate == 12.5
+        assert limiter.report_status("article", 429) is True
+        assert bucket.rate == 6.25
+
+    def test_article_bucket_ramps_up(self, monkeypatch):
+        """测试文章页面请求使用实例的限流器，429 时降速，正常页面只上报一次"""
+        session = FakeContentSession([429])
+        monkeypatch.setattr(index_module, "get_content_session", lambda: session)
+        limiter = RateLimiter({"article": (200.0, 1000.0)})
+        limiter.bucket("article").base_backoff = 0.01
+        limiter.bucket("article")._backoff = 0.01
+        api = WxMPAPI({}, rate_limiter=limiter)
+        downloader = ArticleDownloader(rate_limiter=limiter)
+
+        api.fetch_article_content("https://mp.weixin.qq.com/s/a")
+        assert limiter.bucket("article").rate == 100.0
+        # 状态码 200 不在 API 层上报，由下载器检查页面后上报
+        api.fetch_article_content("https://mp.weixin.qq.com/s/a")
+        assert limiter.bucket("article").rate == 100.0
+        downloader.fetch("https://mp.weixin.qq.com/s/a", api.fetch_article_content)
+        assert limiter.bucket("article").rate == 150.0
+        for _ in range(20):
+            downloader.fetch("https://mp.weixin.qq.com/s/a", api.fetch_article_content)
+
+        assert session.calls == 23
+        assert limiter.bucket("article").rate == 1000.0
+
+    def test_api_retries_after_throttle(self):
+        """测试 WxMPAPI 在频率限制后重试"""
+        limiter = RateLimiter({"searchbiz": (100.0, 100.0)})
+        limiter.bucket("searchbiz").base_backoff = 0.01
+        limiter.bucket("searchbiz")._backoff = 0.01
+        api = WxMPAPI({}, rate_limiter=limiter)
+        api.session = FakeSession(
+            [
+                {"base_resp": {"ret": 200013, "err_msg": "freq control"}},
+                {"base_resp": {"ret": 0}, "arr": [], "total": 0},
+            ]
+        )
+
+        data = api._get_json("searchbiz", "url", {})
+
+        assert data["total"] == 0
+        assert api.session.calls == 2
+
+    def test_api_gives_up(self):
+        """测试重试次数用尽后抛出 FrequencyControlError"""
+        limiter = RateLimiter({"appmsg": (100.0, 100.0)}, max_throttle_retries=1)
+        limiter.bucket("appmsg").max_backoff = 0.01
+        limiter.bucket("appmsg")._backoff = 0.01
+        api = WxMPAPI({}, rate_limiter=limiter)
+        api.session = FakeSession([{"base_resp": {"ret": 200013}}] * 2)
+
+        with pytest.raises(FrequencyControlError):
+            api._get_json("appmsg", "url", {})
+
+    def test_api_session_expired(self):
+        """测试登录失效返回码直接抛出 TokenError，不被包装为接口异常"""
+        api = WxMPAPI({}, rate_limiter=RateLimiter({"appmsg": (100.0, 100.0)}))
+        api.token = "123456"
+        api.session = FakeSession([{"base_resp": {"ret": 200003}}])
+
+        with pytest.raises(TokenError):
+            api.fetch_article_list("fid")
+        assert api.session.calls == 1
+
+    @pytest.mark.parametrize("method", ["fetch_fakeid", "fetch_article_list"])
+    def test_api_frequency_control_not_wrapped(self, method):
+        """测试重试后仍被限流时抛出 FrequencyControlError，不被包装为接口异常"""
+        limiter = RateLimiter(
+            {"searchbiz": (100.0, 100.0), "appmsg": (100.0, 100.0)},
+            max_throttle_retries=0,
+        )
+        api = WxMPAPI({}, rate_limiter=limiter)
+        api.token = "123456"
+        api.session = FakeSession([{"base_resp": {"ret": 200013}}])
+
+        with pytest.raises(FrequencyControlError):
+            getattr(api, method)("fid")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,198 @@
+"""测试 retry 模块"""
+
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+
+# 添加 src 到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from wxmp.tools.article_downloader import (
+    ArticleDownloader,
+    ArticleMetadata,
+    DownloadError,
+)
+from wxmp.tools.article_pipeline import ArticleJob, ArticlePipeline
+from wxmp.tools.download_journal import DEAD, DONE, SKIPPED, DownloadJournal
+from wxmp.tools.http_cache import HTMLCache
+from wxmp.tools.retry import (
+    CONNECTION,
+    OTHER,
+    PERMANENT,
+    SKIPPED as SKIPPED_KIND,
+    THROTTLE,
+    TIMEOUT,
+    CacheMissError,
+    RetryBudget,
+    RetryPolicy,
+    ThrottledError,
+    is_throttle_page,
+)
+
+
+def http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status}", response=response)
+
+
+class TestRetryPolicy:
+    """测试 RetryPolicy 类"""
+
+    @pytest.mark.parametrize(
+        "error, kind",
+        [
+            (http_error(404), PERMANENT),
+            (http_error(429), THROTTLE),
+            (http_error(503), OTHER),
+            (requests.ConnectTimeout(), TIMEOUT),
+            (TimeoutError(), TIMEOUT),
+            (ConnectionResetError(), CONNECTION),
+            (requests.ConnectionError(), CONNECTION),
+            (ThrottledError(), THROTTLE),
+            (CacheMissError(), SKIPPED_KIND),
+            (ValueError(), OTHER),
+        ],
+    )
+    def test_classify(self, error, kind):
+        """测试错误分类"""
+        assert RetryPolicy().classify(error) == kind
+
+    def test_backoff(self):
+        """测试指数退避、上限、抖动范围和访问频繁的最短等待"""
+        policy = RetryPolicy(base_delay=1, max_delay=5, jitter=False, throttle_delay=30)
+
+        assert [policy.backoff(n) for n in range(1, 5)] == [1, 2, 4, 5]
+        assert policy.backoff(1, THROTTLE) == 30
+        jittered = RetryPolicy(base_delay=1, max_delay=5)
+        assert all(0 <= jittered.backoff(3) <= 4 for _ in range(100))
+
+    def test_retry_delay(self):
+        """测试永久错误和达到最大次数时不重试"""
+        policy = RetryPolicy(max_attempts=3, jitter=False)
+
+        assert policy.retry_delay(TimeoutError(), 1) == 1
+        assert policy.retry_delay(TimeoutError(), 3) is None
+        assert policy.retry_delay(http_error(404), 1) is None
+
+    def test_budget(self):
+        """测试全局重试预算耗尽后不再重试"""
+        budget = RetryBudget(ratio=0.5, min_retries=1)
+        policy = RetryPolicy(max_attempts=10, budget=budget)
+        for _ in range(2):
+            policy.record_request()
+
+        assert budget.remaining == 2
+        assert policy.retry_delay(TimeoutError(), 1) is not None
+        assert policy.retry_delay(TimeoutError(), 1) is not None
+        assert policy.retry_delay(TimeoutError(), 1) is None
+
+
+class TestDownloaderRetry:
+    """测试 ArticleDownloader 使用重试策略"""
+
+    def test_permanent_error_not_retried(self):
+        """测试 404 只请求一次"""
+        calls = []
+
+        def fetch(url, timeout):
+            calls.append(url)
+            raise http_error(404)
+
+        downloader = ArticleDownloader(max_retries=5, retry_delay=0)
+
+        with pytest.raises(DownloadError) as exc_info:
+            downloader.fetch("u", fetch)
+
+        assert calls == ["u"]
+        assert exc_info.value.kind == PERMANENT
+
+    def test_throttle_page(self):
+        """测试访问频繁提示页被识别为限流并重试"""
+        pages = iter(["<p>访问过于频繁，请稍后再试</p>", '<div id="js_content">正文</div>'])
+        policy = RetryPolicy(base_delay=0, throttle_delay=0)
+        downloader = ArticleDownloader(retry_policy=policy)
+
+        assert is_throttle_page("<p>访问过于频繁</p>")
+        assert not is_throttle_page('<div id="js_content">访问过于频繁</div>')
+        assert downloader.fetch_counted("u", lambda url, timeout: next(pages)) == (
+            '<div id="js_content">正文</div>',
+            2,
+        )
+
+
+class TestPipelineRetry:
+    """测试 ArticlePipeline 将重试放回队列"""
+
+    def test_retry_does_not_block_worker(self, tmp_path):
+        """测试等待重试期间，唯一的下载线程继续处理其他文章"""
+        failures = {"slow": 1}
+
+        def fetch(url, timeout):
+            if failures.get(url):
+                failures[url] -= 1
+                raise ConnectionResetError(url)
+            return f'<div id="js_content"><p>{url}</p></div>'
+
+        policy = RetryPolicy(base_delay=0.3, jitter=False)
+        downloader = ArticleDownloader(min_file_size="1B", retry_policy=policy)
+        pipeline = ArticlePipeline(downloader, fetch, io_workers=1)
+        urls = ["slow", "a", "b", "c"]
+        jobs = [
+            ArticleJob(url, tmp_path / f"{url}.md", ArticleMetadata()) for url in urls
+        ]
+
+        results = list(pipeline.run(jobs))
+
+        assert [job.url for job, _ in results] == ["a", "b", "c", "slow"]
+        assert results[-1][1].ok
+        assert results[-1][1].attempts == 2
+
+    def test_dead_link_journal(self, tmp_path):
+        """测试永久错误记录为 dead，之后不再重试"""
+
+        def fetch(url, timeout):
+            raise http_error(404)
+
+        journal = DownloadJournal(tmp_path / "journal.jsonl")
+        downloader = ArticleDownloader(retry_delay=0)
+        pipeline = ArticlePipeline(downloader, fetch, journal=journal)
+        jobs = [ArticleJob("gone", tmp_path / "gone.md", ArticleMetadata())]
+
+        [(_, result)] = pipeline.run(jobs)
+
+        assert result.attempts == 1
+        assert journal.get("gone").status == DEAD
+        assert list(journal.pending(jobs)) == []
+
+    def test_offline_miss_retried_online(self, tmp_path):
+        """测试离线缓存未命中不记为 dead，联网后重新运行时下载"""
+        journal = DownloadJournal(tmp_path / "journal.jsonl")
+        downloader = ArticleDownloader(min_file_size="1B")
+        offline = HTMLCache(tmp_path / "cache", offline=True)
+        jobs = [ArticleJob("new", tmp_path / "new.md", ArticleMetadata())]
+
+        [(_, result)] = ArticlePipeline(downloader, offline.fetch, journal=journal).run(
+            jobs
+        )
+
+        assert not result
+        assert result.attempts == 1
+        assert journal.get("new").status == SKIPPED
+        assert list(journal.pending(jobs)) == jobs
+        assert list(journal.pending(jobs, retry_failed_only=True)) == []
+
+        def online(url, timeout):
+            return '<div id="js_content"><p>正文</p></div>'
+
+        pipeline = ArticlePipeline(downloader, online, journal=journal)
+        [(_, result)] = pipeline.run(journal.pending(jobs))
+
+        assert result.ok
+        assert journal.get("new").status == DONE
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,74 @@
+"""测试 session 模块"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加 src 到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from wxmp.api import session as session_module
+from wxmp.api.session import build_session, get_content_session, mount_pool
+
+
+@pytest.fixture(autouse=True)
+def fresh_content_session(monkeypatch):
+    """每个测试使用新的共享 Session，不影响其他测试"""
+    monkeypatch.setattr(session_module, "_content_session", None)
+    monkeypatch.setattr(session_module, "_content_pool_size", 0)
+
+
+def pool_maxsize(session) -> dict[str, int]:
+    """各协议挂载的连接池大小"""
+    return {
+        prefix: session.get_adapter(f"{prefix}example.com")._pool_maxsize
+        for prefix in ("https://", "http://")
+    }
+
+
+class TestSession:
+    """测试连接池 Session"""
+
+    def test_build_session_mounts_pool(self):
+        """测试 http 和 https 共用同一个指定大小的连接池"""
+        session = build_session(pool_maxsize=16)
+
+        assert pool_maxsize(session) == {"https://": 16, "http://": 16}
+        assert session.get_adapter("https://a") is session.get_adapter("http://a")
+
+    def test_mount_pool_resizes(self):
+        """测试重新挂载后使用新的连接池大小"""
+        session = build_session()
+        mount_pool(session, 32)
+
+        assert pool_maxsize(session)["https://"] == 32
+
+    def test_content_session_is_shared(self):
+        """测试文章内容请求复用同一个 Session 和连接池"""
+        session = get_content_session()
+        adapter = session.get_adapter("https://mp.weixin.qq.com")
+
+        assert get_content_session() is session
+        assert get_content_session(pool_maxsize=5) is session
+        assert session.get_adapter("https://mp.weixin.qq.com") is adapter
+        assert pool_maxsize(session)["https://"] == 10
+
+    def test_content_session_grows_pool(self):
+        """测试请求更大的连接池时重建，之后不会缩小"""
+        small = get_content_session(pool_maxsize=4)
+        large = get_content_session(pool_maxsize=24)
+
+        assert large is not small
+        assert pool_maxsize(large) == {"https://": 24, "http://": 24}
+        assert get_content_session(pool_maxsize=8) is large
+
+    def test_content_session_ignores_cookies(self):
+        """测试共享 Session 不保存响应中的 Cookie，可以在线程间共享"""
+        policy = get_content_session().cookies.get_policy()
+
+        assert policy.allowed_domains() == ()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
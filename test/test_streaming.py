@@ -0,0 +1,74 @@
+"""测试 streaming 模块"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加 src 到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from wxmp.api.streaming import iter_bounded_fetch
+
+
+class FakeFetcher:
+    """模拟获取文章内容，记录最大在途请求数"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, link: str) -> str:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.001 * (hash(link) % 5))
+        self.in_flight -= 1
+        if link == "bad":
+            raise ValueError(link)
+        return f"<html>{link}</html>"
+
+
+async def collect(*args, **kwargs) -> list:
+    return [item async for item in iter_bounded_fetch(*args, **kwargs)]
+
+
+class TestIterBoundedFetch:
+    """测试 iter_bounded_fetch 函数"""
+
+    def test_yields_all_results_with_index(self):
+        """测试所有链接都被获取，且索引与链接对应"""
+        links = [f"link{i}" for i in range(50)]
+        results = asyncio.run(collect(links, FakeFetcher(), concurrency=8))
+
+        assert len(results) == 50
+        for index, link, html in results:
+            assert link == links[index]
+            assert html == f"<html>{link}</html>"
+
+    def test_concurrency_limit(self):
+        """测试在途请求数不超过 concurrency"""
+        fetcher = FakeFetcher()
+        links = (f"link{i}" for i in range(100))
+        asyncio.run(collect(links, fetcher, concurrency=5, buffer_size=2))
+
+        assert fetcher.peak <= 5
+
+    def test_return_exceptions(self):
+        """测试 return_exceptions 为 True 时异常作为结果产出"""
+        results = asyncio.run(
+            collect(["a", "bad", "c"], FakeFetcher(), return_exceptions=True)
+        )
+        errors = [html for _, link, html in results if link == "bad"]
+
+        assert len(results) == 3
+        assert isinstance(errors[0], ValueError)
+
+    def test_raise_exceptions(self):
+        """测试默认情况下请求异常直接抛出"""
+        with pytest.raises(ValueError):
+            asyncio.run(collect(["a", "bad", "c"], FakeFetcher(), concurrency=1))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -11,7 +11,7 @@ import pytest
 # 添加 src 到路径
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from wxmp.tools.time_manager import TimeManager, TimeRange
+from wxmp.tools.time_manager import TimeCoverage, TimeManager, TimeRange
 
 
 class ChangeTracker:
@@ -167,9 +167,8 @@ class TestMatchRemainingTimeRange:
         assert result.begin == need_time.begin
         assert result.end == need_time.end
 
-        # meta 应该被更新为 need_time
-        assert manager.meta.begin == need_time.begin
-        assert manager.meta.end == need_time.end
+        # 已覆盖的 meta 保留，need_time 作为新的区间加入
+        assert manager.coverage.ranges == [meta, need_time]
 
         print(f"✅ need_time 在 meta 之后测试通过")
 
@@ -198,9 +197,8 @@ class TestMatchRemainingTimeRange:
         assert result.begin == need_time.begin
         assert result.end == need_time.end
 
-        # meta 应该被更新为 need_time
-        assert manager.meta.begin == need_time.begin
-        assert manager.meta.end == need_time.end
+        # 已覆盖的 meta 保留，need_time 作为新的区间加入
+        assert manager.coverage.ranges == [need_time, meta]
 
         print(f"✅ need_time 在 meta 之前测试通过")
 
@@ -319,7 +317,7 @@ class TestMatchRemainingTimeRange:
         """测试 meta 完全在 need_time 内部"""
         # meta: 2026-01-10 到 2026-01-15
         # need_time: 2026-01-01 到 2026-01-20
-        # 这种情况应该返回 None（因为两端都有重叠）
+        # 两端都有缺口，返回包含两个缺口的最小范围
         meta = TimeRange(begin=datetime(2026, 1, 10), end=datetime(2026, 1, 15))
         need_time = TimeRange(begin=datetime(2026, 1, 1), end=datetime(2026, 1, 20))
 
@@ -335,12 +333,96 @@ class TestMatchRemainingTimeRange:
 
         tracker.print_changes(result)
 
-        # 这种情况应该返回 None
-        assert result is None
+        assert result is not None
+        assert result.begin == datetime(2026, 1, 1)
+        assert result.end == datetime(2026, 1, 20)
+
+        # meta 应该被扩展为 need_time
+        assert manager.coverage.ranges == [need_time]
 
         print(f"✅ meta 完全在 need_time 内部测试通过")
 
 
+class TestTimeCoverage:
+    """测试 TimeCoverage 多区间覆盖"""
+
+    def test_add_merges_overlapping(self):
+        """测试重叠和相邻的区间会被合并"""
+        coverage = TimeCoverage()
+        coverage.add(TimeRange(begin=datetime(2026, 1, 10), end=datetime(2026, 1, 15)))
+        coverage.add(TimeRange(begin=datetime(2026, 1, 1), end=datetime(2026, 1, 5)))
+        coverage.add(TimeRange(begin=datetime(2026, 1, 15), end=datetime(2026, 1, 20)))
+
+        assert coverage.ranges == [
+            TimeRange(begin=datetime(2026, 1, 1), end=datetime(2026, 1, 5)),
+            TimeRange(begin=datetime(2026, 1, 10), end=datetime(2026, 1, 20)),
+        ]
+
+        coverage.add(TimeRange(begin=datetime(2026, 1, 3), end=datetime(2026, 1, 12)))
+
+        assert coverage.ranges == [
+            TimeRange(begin=datetime(2026, 1, 1), end=datetime(2026, 1, 20))
+        ]
+
+    def test_gaps(self):
+        """测试返回精确的未覆盖区间"""
+        coverage = TimeCoverage()
+        coverage.add(TimeRange(begin=datetime(2026, 1, 5), end=datetime(2026, 1, 10)))
+        coverage.add(TimeRange(begin=datetime(2026, 1, 15), end=datetime(2026, 1, 20)))
+
+        gaps = coverage.gaps(
+            TimeRange(begin=datetime(2026, 1, 1), end=datetime(2026, 1, 31))
+        )
+
+        assert gaps == [
+            TimeRange(begin=datetime(2026, 1, 1), end=datetime(2026, 1, 5)),
+            TimeRange(begin=datetime(2026, 1, 10), end=datetime(2026, 1, 15)),
+            TimeRange(begin=datetime(2026, 1, 20), end=datetime(2026, 1, 31)),
+        ]
+        assert (
+            coverage.gaps(
+                TimeRange(begin=datetime(2026, 1, 6), end=datetime(2026, 1, 9))
+            )
+            == []
+        )
+
+    def test_match_remaining_time_ranges(self):
+        """测试 match_remaining_time_ranges 返回缺口并记录覆盖"""
+        manager = TimeManager.new()
+        manager.meta = TimeRange(begin=datetime(2026, 1, 10), end=datetime(2026, 1, 15))
+        need_time = TimeRange(begin=datetime(2026, 1, 1), end=datetime(2026, 1, 20))
+
+        gaps = manager.match_remaining_time_ranges(need_time)
+
+        assert gaps == [
+            TimeRange(begin=datetime(2026, 1, 1), end=datetime(2026, 1, 10)),
+            TimeRange(begin=datetime(2026, 1, 15), end=datetime(2026, 1, 20)),
+        ]
+        assert manager.match_remaining_time_ranges(need_time) == []
+
+    def test_save_and_load(self, tmp_path):
+        """测试多区间覆盖的保存与加载，并兼容旧的单区间格式"""
+        manager = TimeManager.new()
+        manager.match_remaining_time_ranges(
+            TimeRange(begin=datetime(2026, 1, 1), end=datetime(2026, 1, 5))
+        )
+        manager.match_remaining_time_ranges(
+            TimeRange(begin=datetime(2026, 2, 1), end=datetime(2026, 2, 5))
+        )
+        manager.save_file("demo", tmp_path)
+
+        loaded = TimeManager.load_file("demo", tmp_path)
+        assert loaded.coverage == manager.coverage
+
+        (tmp_path / "demo.json").write_text(
+            json.dumps({"begin": "2026-01-01", "end": "2026-01-05"})
+        )
+        loaded = TimeManager.load_file("demo", tmp_path)
+        assert loaded.meta == TimeRange(
+            begin=datetime(2026, 1, 1), end=datetime(2026, 1, 5)
+        )
+
+
 class TestTimeManager:
     """测试 TimeManager 类"""
 
@@ -380,5 +462,91 @@ class TestTimeManager:
         print(f"✅ include_time_range 方法测试通过")
 
 
+def make_articles(ids: list[int]) -> pd.DataFrame:
+    """生成指定 appmsgid 的文章数据"""
+    return pd.DataFrame(
+        {
+            "aid": [f"{i}_1" for i in ids],
+            "appmsgid": ids,
+            "itemidx": [1] * len(ids),
+            "title": ["同名标题"] * len(ids),
+            "create_time": [datetime(2026, 1, 1) + timedelta(days=i) for i in ids],
+        }
+    )
+
+
+class TestAppendData:
+    """测试 append_data 去重"""
+
+    def test_dedup_against_existing_data(self):
+        """测试重叠的数据不会被重复追加"""
+        manager = TimeManager.new()
+
+        assert manager.append_data(make_articles([1, 2, 3])) == 3
+        assert manager.append_data(make_articles([2, 3, 4])) == 1
+        assert sorted(manager.data["aid"]) == ["1_1", "2_1", "3_1", "4_1"]
+
+    def test_dedup_inside_batch(self):
+        """测试本批数据内部去重"""
+        manager = TimeManager.new()
+
+        assert manager.append_data(make_articles([1, 1, 2])) == 2
+
+    def test_same_title_is_not_duplicate(self):
+        """测试标题相同但 aid 不同的文章不会被误删"""
+        manager = TimeManager.new()
+        manager.append_data(make_articles([1, 2]))
+
+        assert len(manager.data) == 2
+
+    def test_fallback_key_cols(self):
+        """测试没有 aid 时使用 appmsgid + itemidx"""
+        manager = TimeManager.new()
+        df = make_articles([1, 2]).drop(columns="aid")
+        manager.append_data(df)
+
+        assert manager.append_data(df) == 0
+        assert TimeManager.resolve_key_cols(df) == ["appmsgid", "itemidx"]
+
+    def test_dedup_after_reload(self, tmp_path):
+        """测试从文件重新加载后仍能与已有数据去重"""
+        manager = TimeManager.new()
+        manager.append_data(make_articles([1, 2, 3]))
+        manager.save_file("demo", tmp_path)
+
+        manager = TimeManager.load_file("demo", tmp_path)
+
+        assert manager.append_data(make_articles([3, 4])) == 1
+        assert len(manager.data) == 4
+
+    def test_dedup_float_keys_after_reload(self, tmp_path):
+        """测试整数键因缺失值从 CSV 读回为 float 时仍能去重"""
+        df = make_articles([1, 2]).drop(columns="aid")
+        df["appmsgid"] = df["appmsgid"].astype("Int64")
+        df.loc[1, "appmsgid"] = pd.NA
+        manager = TimeManager.new()
+        manager.append_data(df)
+        manager.save_file("demo", tmp_path)
+
+        manager = TimeManager.load_file("demo", tmp_path)
+        assert manager.data["appmsgid"].dtype == "float64"
+
+        assert manager.append_data(make_articles([1, 3]).drop(columns="aid")) == 1
+        assert sorted(manager.data["appmsgid"].dropna()) == [1, 3]
+
+    def test_hash_keys_normalizes_numbers(self):
+        """测试 123、123.0 和 "123" 的哈希相同，缺失值一致"""
+        ints = pd.DataFrame({"appmsgid": [123, 456]})
+        floats = pd.DataFrame({"appmsgid": [123.0, float("nan")]})
+        strings = pd.DataFrame({"appmsgid": ["123", None]})
+
+        hashed = [
+            TimeManager.hash_keys(df, ["appmsgid"]) for df in (ints, floats, strings)
+        ]
+
+        assert hashed[0][0] == hashed[1][0] == hashed[2][0]
+        assert hashed[1][1] == hashed[2][1]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-s"])
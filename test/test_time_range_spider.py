@@ -0,0 +1,226 @@
+"""测试 time_range_spider 模块"""
+
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# 添加 src 到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from wxmp.api import ListExError, ListExResponse, TokenError
+from wxmp.spider.time_range_spider import TimeRangeSpider
+from wxmp.tools.time_manager import TimeRange
+
+TIME_RANGE = TimeRange(begin=datetime(2024, 1, 1), end=datetime(2024, 3, 1))
+START = int(datetime(2024, 2, 20).timestamp())
+
+
+def article(fakeid: str, i: int) -> dict:
+    """由近到远排列的第 i 篇文章，每天一篇"""
+    timestamp = START - i * 86400
+    return {
+        "aid": f"{fakeid}_{i}",
+        "appmsgid": 1000 + i,
+        "cover": "",
+        "create_time": timestamp,
+        "digest": "",
+        "itemidx": 1,
+        "link": f"https://mp.weixin.qq.com/s/{fakeid}_{i}",
+        "title": f"文章{i}",
+        "update_time": timestamp,
+    }
+
+
+class FakeSpider(TimeRangeSpider):
+    """
+    不访问网络的 TimeRangeSpider
+
+    每个公众号有 total 篇文章（totals 中可单独指定），接口最多返回 max_count 条/页；
+    errors 中的 fakeid 请求时抛出对应的异常；count 大于 reject_above 时请求失败。
+    """
+
+    def __init__(
+        self,
+        total: int = 30,
+        max_count: int = 10,
+        errors=None,
+        delay=0.0,
+        reject_above: int | None = None,
+        totals: dict[str, int] | None = None,
+    ):
+        self.total = total
+        self.totals = totals or {}
+        self.max_count = max_count
+        self.reject_above = reject_above
+        self.errors = errors or {}
+        self.delay = delay
+        self.calls: list[tuple[str, int, int]] = []
+        self._calls_lock = threading.Lock()
+        super().__init__({})
+
+    def _fetch_token(self):
+        self.token = "123456"
+        return self.token
+
+    def fetch_article_list(
+        self, fakeid, begin=0, count=5, is_publish=False, lean=False
+    ) -> ListExResponse:
+        with self._calls_lock:
+            self.calls.append((fakeid, begin, count))
+        time.sleep(self.delay)
+        if fakeid in self.errors:
+            raise self.errors[fakeid]
+        if self.reject_above is not None and count > self.reject_above:
+            raise ListExError("解析JSON响应时发生错误: invalid args")
+        count = min(count, self.max_count)
+        total = self.totals.get(fakeid, self.total)
+        items = [article(fakeid, i) for i in range(total)][begin : begin + count]
+        return ListExResponse(base_resp={"ret": 0}, app_msg_cnt=total, app_msg_list=items)
+
+    def probes(self) -> list[tuple[str, int, int]]:
+        """分页大小探测请求（begin=0 且 count 为最大候选值）"""
+        return [call for call in self.calls if call[1] == 0 and call[2] == 20]
+
+
+BIZS = {f"公众号{i}": f"fid{i}" for i in range(6)}
+
+
+class TestSearchArticlesContent:
+    """测试 search_articles_content 方法"""
+
+    def test_parallel_crawl(self, tmp_path):
+        """测试并发获取所有公众号，分页大小只探测一次"""
+        spider = FakeSpider(delay=0.002)
+
+        df = spider.search_articles_content(
+            BIZS, TIME_RANGE, save_dir=tmp_path, max_workers=4
+        )
+
+        assert len(df) == 6 * 30
+        assert set(df["nickname"]) == set(BIZS)
+        assert len(spider.probes()) == 1
+        assert spider._page_sizes == {"appmsg": 10}
+
+    def test_parallel_matches_sequential(self, tmp_path):
+        """测试并发与顺序获取的结果相同"""
+        sequential = FakeSpider().search_articles_content(
+            BIZS, TIME_RANGE, save_dir=tmp_path / "seq"
+        )
+        parallel = FakeSpider().search_articles_content(
+            BIZS, TIME_RANGE, save_dir=tmp_path / "par", max_workers=3
+        )
+
+        key = ["nickname", "aid"]
+        assert sorted(map(tuple, parallel[key].values)) == sorted(
+            map(tuple, sequential[key].values)
+        )
+
+    def test_parallel_logs_account_error(self, tmp_path):
+        """测试并发时单个公众号失败不影响其他公众号"""
+        spider = FakeSpider(errors={"fid2": ListExError("HTTP请求失败: 500")})
+
+        df = spider.search_articles_content(
+            BIZS, TIME_RANGE, save_dir=tmp_path, max_workers=3
+        )
+
+        assert set(df["nickname"]) == set(BIZS) - {"公众号2"}
+
+    def test_parallel_raises_token_error(self, tmp_path):
+        """测试并发时登录失效直接抛出"""
+        spider = FakeSpider(errors={"fid3": TokenError("登录状态已失效")})
+
+        with pytest.raises(TokenError):
+            spider.search_articles_content(
+                BIZS, TIME_RANGE, save_dir=tmp_path, max_workers=3
+            )
+
+    def test_sequential_raises(self, tmp_path):
+        """测试顺序获取时任何错误都直接抛出"""
+        spider = FakeSpider(errors={"fid1": ListExError("HTTP请求失败: 500")})
+
+        with pytest.raises(ListExError):
+            spider.search_articles_content(BIZS, TIME_RANGE, save_dir=tmp_path)
+
+
+class TestPageSize:
+    """测试分页大小探测与预取"""
+
+    def test_probe_page_reused(self):
+        """测试探测成功的响应作为第一页，不重复请求"""
+        spider = FakeSpider(max_count=20)
+
+        articles = spider.search_articles("fid", "公众号")
+
+        assert len(articles) == 30
+        assert spider._page_sizes == {"appmsg": 20}
+        assert spider.calls == [("fid", 0, 20), ("fid", 20, 20), ("fid", 30, 20)]
+
+    def test_detect_smaller_page(self):
+        """测试接口只返回 10 条时使用 10，探测请求只多一次"""
+        spider = FakeSpider(max_count=10)
+
+        articles = spider.search_articles("fid", "公众号")
+
+        assert len(articles) == 30
+        assert spider.calls[:3] == [("fid", 0, 20), ("fid", 0, 10), ("fid", 10, 10)]
+        assert spider.calls.count(("fid", 0, 10)) == 1
+
+    def test_detect_cached_per_endpoint(self):
+        """测试分页大小按接口缓存，其他公众号不再探测"""
+        spider = FakeSpider(max_count=10)
+        spider.search_articles("fid0", "公众号0")
+        spider.search_articles("fid1", "公众号1")
+
+        assert len(spider.probes()) == 1
+        assert spider.calls.count(("fid1", 0, 10)) == 1
+
+    def test_small_account_not_cached(self):
+        """测试文章数少于候选值的公众号不能确定分页大小，不缓存，之后的公众号不漏文章"""
+        spider = FakeSpider(max_count=10, totals={"small": 8})
+
+        small = spider.search_articles("small", "小公众号")
+        large = spider.search_articles("fid", "公众号")
+
+        assert len(small) == 8
+        assert spider._page_sizes == {"appmsg": 10}
+        assert [a.aid for a in large] == [f"fid_{i}" for i in range(30)]
+
+    def test_advance_by_returned_count(self):
+        """测试按实际返回的数量翻页，指定的 page_size 超过接口上限时不跳过文章"""
+        spider = FakeSpider(max_count=10)
+
+        articles = spider.search_articles("fid", "公众号", page_size=20)
+
+        assert [a.aid for a in articles] == [f"fid_{i}" for i in range(30)]
+        assert [call[1] for call in spider.calls] == [0, 10, 20, 30]
+
+    @pytest.mark.parametrize(
+        "kwargs", [{"max_count": 3}, {"max_count": 20, "reject_above": 5}]
+    )
+    def test_fallback_to_default(self, kwargs):
+        """测试所有候选值都不满足或请求失败时使用默认分页大小"""
+        spider = FakeSpider(**kwargs)
+
+        assert spider.detect_page_size("fid") == 5
+
+    def test_prefetch_same_result(self):
+        """测试预取下一页的结果与逐页获取相同，时间范围截止时最多多一次请求"""
+        time_range = TimeRange(begin=datetime.fromtimestamp(START - 12 * 86400))
+        plain = FakeSpider()
+        prefetched = FakeSpider(delay=0.002)
+
+        expected = plain.search_articles("fid", "公众号", time_range=time_range)
+        articles = prefetched.search_articles(
+            "fid", "公众号", time_range=time_range, prefetch=True
+        )
+
+        assert [a.aid for a in articles] == [a.aid for a in expected]
+        assert len(prefetched.calls) == len(plain.calls) + 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
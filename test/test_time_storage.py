@@ -0,0 +1,187 @@
+"""测试 time_storage 模块"""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# 添加 src 到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from wxmp.tools.time_manager import TimeManager, TimeRange
+from wxmp.tools.time_storage import CSVStorage, ParquetStorage, SQLiteStorage
+
+
+def make_articles(days: list[int]) -> pd.DataFrame:
+    """生成 2026 年 1 月指定日期的文章数据"""
+    return pd.DataFrame(
+        {
+            "aid": [f"100{day}_1" for day in days],
+            "title": [f"文章{day}" for day in days],
+            "create_time": [f"2026-01-{day:02d} 08:00:00" for day in days],
+        }
+    )
+
+
+def storages() -> list:
+    backends = [CSVStorage(), SQLiteStorage()]
+    try:
+        backends.append(ParquetStorage(max_parts=2))
+    except ImportError:
+        pass
+    return backends
+
+
+@pytest.mark.parametrize("storage", storages(), ids=lambda s: type(s).__name__)
+class TestTimeStorage:
+    """测试各存储后端"""
+
+    def test_round_trip_keeps_datetime(self, storage, tmp_path):
+        """测试保存后重新加载，时间列为 datetime 类型"""
+        manager = TimeManager.new(storage)
+        manager.meta = TimeRange(begin=datetime(2026, 1, 1), end=datetime(2026, 1, 31))
+        manager.append_data(make_articles([1, 2, 3]))
+        manager.save_file("demo", tmp_path)
+
+        loaded = TimeManager.load_file("demo", tmp_path, storage)
+
+        assert len(loaded.data) == 3
+        assert pd.api.types.is_datetime64_any_dtype(loaded.data["create_time"])
+        assert loaded.meta.end == datetime(2026, 1, 31)
+
+    def test_append_and_time_range_filter(self, storage, tmp_path):
+        """测试多次追加保存，并按时间范围加载"""
+        manager = TimeManager.new(storage)
+        manager.append_data(make_articles([1, 2, 3]))
+        manager.save_file("demo", tmp_path)
+
+        manager = TimeManager.load_file("demo", tmp_path, storage)
+        manager.append_data(make_articles([10, 11]))
+        manager.save_file("demo", tmp_path)
+
+        manager = TimeManager.load_file("demo", tmp_path, storage)
+        manager.append_data(make_articles([20]))
+        manager.save_file("demo", tmp_path)
+
+        time_range = TimeRange(begin=datetime(2026, 1, 2), end=datetime(2026, 1, 15))
+        loaded = TimeManager.load_file("demo", tmp_path, storage, time_range)
+
+        assert len(TimeManager.load_file("demo", tmp_path, storage).data) == 6
+        assert sorted(loaded.data["title"]) == ["文章10", "文章11", "文章2", "文章3"]
+
+    def test_missing_file(self, storage, tmp_path):
+        """测试文件不存在时抛出 FileNotFoundError"""
+        with pytest.raises(FileNotFoundError):
+            TimeManager.load_file("missing", tmp_path, storage)
+
+
+def test_sqlite_load_many(tmp_path):
+    """测试 SQLiteStorage 一次查询多个公众号，并按 (account, aid) 去重"""
+    storage = SQLiteStorage()
+    for name, days in {"A": [1, 5], "B": [3, 20]}.items():
+        manager = TimeManager.new(storage)
+        manager.append_data(make_articles(days))
+        manager.save_file(name, tmp_path)
+
+    manager = TimeManager.load_file("A", tmp_path, storage)
+    manager.append_data(make_articles([5, 6]))
+    manager.save_file("A", tmp_path)
+
+    time_range = TimeRange(begin=datetime(2026, 1, 1), end=datetime(2026, 1, 15))
+    df = storage.load_many({"A": "公众号A", "B": "公众号B", "C": "公众号C"}, tmp_path, time_range)
+
+    assert sorted(df["title"]) == ["文章1", "文章3", "文章5", "文章6"]
+    assert set(df["nickname"]) == {"公众号A", "公众号B"}
+
+
+def test_sqlite_skips_missing_aid(tmp_path):
+    """测试缺少 aid 的行被显式跳过并记录警告，其余行正常保存"""
+    from loguru import logger
+
+    messages: list[str] = []
+    handler_id = logger.add(messages.append, level="WARNING")
+    storage = SQLiteStorage()
+    articles = make_articles([1, 2, 3])
+    articles.loc[1, "aid"] = None
+    try:
+        storage.save_data(articles, articles, "demo", tmp_path)
+    finally:
+        logger.remove(handler_id)
+
+    df = storage.load_columns("demo", tmp_path, ["aid"])
+    assert sorted(df["aid"]) == ["1001_1", "1003_1"]
+    assert len(messages) == 1 and "1 篇文章缺少 aid" in messages[0]
+
+
+def test_parquet_interrupted_compaction(tmp_path, monkeypatch):
+    """测试合并后、删除旧 part 前中断时读取不重复，下次保存时完成删除"""
+    pytest.importorskip("pyarrow")
+    storage = ParquetStorage(max_parts=2)
+    for days in ([1], [2], [3]):
+        manager = (
+            TimeManager.load_file("demo", tmp_path, storage)
+            if storage.exists("demo", tmp_path)
+            else TimeManager.new(storage)
+        )
+        manager.append_data(make_articles(days))
+        if days == [3]:
+            # 模拟合并文件写入后进程退出
+            monkeypatch.setattr(ParquetStorage, "_finish_compaction", lambda *a: None)
+        manager.save_file("demo", tmp_path)
+    monkeypatch.undo()
+
+    data_dir = storage.data_path("demo", tmp_path)
+    assert len(list(data_dir.glob("part-*.parquet"))) == 4
+    assert len(TimeManager.load_file("demo", tmp_path, storage).data) == 3
+
+    manager = TimeManager.load_file("demo", tmp_path, storage)
+    manager.save_file("demo", tmp_path)
+
+    assert len(list(data_dir.glob("part-*.parquet"))) == 1
+    assert not (data_dir / ParquetStorage.COMPACTION_FILE).exists()
+    assert len(TimeManager.load_file("demo", tmp_path, storage).data) == 3
+
+
+def test_parquet_abandoned_compaction(tmp_path):
+    """测试合并文件未写完时中断，读取旧 part，下次保存时放弃本次合并"""
+    pytest.importorskip("pyarrow")
+    storage = ParquetStorage()
+    manager = TimeManager.new(storage)
+    manager.append_data(make_articles([1, 2]))
+    manager.save_file("demo", tmp_path)
+
+    data_dir = storage.data_path("demo", tmp_path)
+    parts = [part.name for part in data_dir.glob("part-*.parquet")]
+    merged = "part-99999999999999999999-deadbeef.parquet"
+    (data_dir / f".{merged}.tmp").write_bytes(b"partial")
+    (data_dir / ParquetStorage.COMPACTION_FILE).write_text(
+        json.dumps({"merged": merged, "replaced": parts})
+    )
+
+    assert len(TimeManager.load_file("demo", tmp_path, storage).data) == 2
+
+    TimeManager.load_file("demo", tmp_path, storage).save_file("demo", tmp_path)
+
+    assert [part.name for part in data_dir.glob("part-*.parquet")] == parts
+    assert not (data_dir / f".{merged}.tmp").exists()
+    assert not (data_dir / ParquetStorage.COMPACTION_FILE).exists()
+
+
+def test_partial_csv_cannot_be_saved(tmp_path):
+    """测试按时间范围加载的 CSV 数据不能覆盖保存"""
+    manager = TimeManager.new()
+    manager.append_data(make_articles([1, 2, 3]))
+    manager.save_file("demo", tmp_path)
+
+    time_range = TimeRange(begin=datetime(2026, 1, 2), end=datetime(2026, 1, 15))
+    partial = TimeManager.load_file("demo", tmp_path, time_range=time_range)
+
+    with pytest.raises(ValueError):
+        partial.save_file("demo", tmp_path)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])